@@ -0,0 +1,191 @@
+"""Score large message files in parallel, streaming them in chunks.
+
+Reads JSONL or CSV, scores messages with SentimentAnalyzer across a process
+pool and writes one analyze_message result per input record as JSONL, in
+input order. Only a bounded number of chunks are in flight at once, so
+memory stays flat however large the input is.
+
+After every chunk written, a checkpoint records how many records are done
+and the output size. Re-running the same command after a crash resumes
+from there; the checkpoint is removed once a run completes.
+
+Usage:
+    python batch_score.py messages.jsonl scores.jsonl [--text-field text]
+    python batch_score.py messages.csv scores.jsonl --format csv --workers 8
+"""
+
+import argparse
+import collections
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from src import workers
+from config import SENTIMENT_METHOD, BATCH_CHUNK_SIZE, BATCH_WORKERS
+
+
+def read_texts(path, input_format, text_field):
+    """
+    Stream message texts from a JSONL or CSV file.
+
+    Args:
+        path (str): Input file
+        input_format (str): 'jsonl' or 'csv'
+        text_field (str): Field holding the message text
+
+    Yields:
+        str: One message text per record; records with no string text,
+        such as JSONL values that are not strings or objects or text
+        fields holding lists or numbers, yield '' so the output stays
+        aligned with the input
+    """
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if input_format == 'csv':
+            for row in csv.DictReader(f):
+                yield row.get(text_field) or ''
+            return
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            # Records may be bare strings or objects with a text field
+            if isinstance(record, dict):
+                record = record.get(text_field)
+            yield record if isinstance(record, str) else ''
+
+
+def chunked(iterable, size):
+    """Yield lists of up to size items."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def load_checkpoint(path):
+    """Read a checkpoint, or start from the beginning."""
+    if not os.path.exists(path):
+        return {'records': 0, 'output_bytes': 0}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_checkpoint(path, records, output_bytes):
+    """Atomically record progress."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'records': records, 'output_bytes': output_bytes}, f)
+    os.replace(tmp_path, path)
+
+
+def score_file(input_path, output_path, input_format='jsonl', text_field='text',
+               chunk_size=BATCH_CHUNK_SIZE, workers_count=BATCH_WORKERS,
+               method=SENTIMENT_METHOD, checkpoint_path=None, report=sys.stderr):
+    """
+    Score every record of a file and write results in input order.
+
+    Args:
+        input_path (str): JSONL or CSV input
+        output_path (str): JSONL output, appended to when resuming
+        input_format (str): 'jsonl' or 'csv'
+        text_field (str): Field holding the message text
+        chunk_size (int): Records per worker task
+        workers_count (int, optional): Worker processes, defaults to the CPU count
+        method (str): Sentiment method
+        checkpoint_path (str, optional): Defaults to output_path + '.checkpoint'
+        report (file, optional): Stream for progress lines, None for silence
+
+    Returns:
+        dict: Records scored in this run, elapsed seconds and throughput
+    """
+    checkpoint_path = checkpoint_path or output_path + '.checkpoint'
+    checkpoint = load_checkpoint(checkpoint_path)
+    done = checkpoint['records']
+    if done and not (os.path.exists(output_path) and os.path.getsize(output_path) >= checkpoint['output_bytes']):
+        # The checkpointed results are gone; score everything again
+        os.remove(checkpoint_path)
+        done = 0
+
+    # Drop anything written after the last checkpoint before appending
+    mode = 'r+b' if done else 'wb'
+    output = open(output_path, mode)
+    output.seek(checkpoint['output_bytes'] if done else 0)
+    output.truncate()
+
+    texts = itertools.islice(read_texts(input_path, input_format, text_field), done, None)
+    max_in_flight = (workers_count or os.cpu_count() or 1) * 2
+    pending = collections.deque()
+    scored = 0
+    start = time.perf_counter()
+
+    def write_oldest():
+        nonlocal done, scored
+        results = pending.popleft().result()
+        output.write(''.join(json.dumps(result) + '\n' for result in results).encode('utf-8'))
+        output.flush()
+        done += len(results)
+        scored += len(results)
+        save_checkpoint(checkpoint_path, done, output.tell())
+        if report is not None:
+            elapsed = time.perf_counter() - start
+            print(f"{done} records ({scored / elapsed:.0f} records/s)", file=report)
+
+    try:
+        with workers.create_executor('process', workers_count) as executor:
+            for chunk in chunked(texts, chunk_size):
+                pending.append(executor.submit(workers.analyze_batch, chunk, method=method))
+                if len(pending) >= max_in_flight:
+                    write_oldest()
+            while pending:
+                write_oldest()
+    finally:
+        output.close()
+    # A finished run needs no checkpoint; the next run starts fresh
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'records': scored,
+        'total_records': done,
+        'elapsed_seconds': elapsed,
+        'records_per_second': scored / elapsed if elapsed else 0.0
+    }
+
+
+def main():
+    """Run the batch scoring CLI."""
+    parser = argparse.ArgumentParser(description="Score large message files in parallel.")
+    parser.add_argument('input', help='JSONL or CSV file of messages')
+    parser.add_argument('output', help='JSONL file of sentiment results')
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default=None,
+                        help='input format, guessed from the extension by default')
+    parser.add_argument('--text-field', default='text')
+    parser.add_argument('--chunk-size', type=int, default=BATCH_CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, default=BATCH_WORKERS)
+    parser.add_argument('--method', choices=['vader', 'textblob'], default=SENTIMENT_METHOD)
+    parser.add_argument('--checkpoint', default=None, help='defaults to OUTPUT.checkpoint')
+    parser.add_argument('--quiet', action='store_true', help='only print the final summary')
+    args = parser.parse_args()
+
+    input_format = args.format or ('csv' if args.input.lower().endswith('.csv') else 'jsonl')
+    stats = score_file(
+        args.input, args.output,
+        input_format=input_format,
+        text_field=args.text_field,
+        chunk_size=args.chunk_size,
+        workers_count=args.workers,
+        method=args.method,
+        checkpoint_path=args.checkpoint,
+        report=None if args.quiet else sys.stderr
+    )
+    print(f"Scored {stats['records']} records in {stats['elapsed_seconds']:.1f}s "
+          f"({stats['records_per_second']:.0f} records/s), {stats['total_records']} total")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Synthetic message corpus for benchmarks.
+
+Messages vary in length, punctuation, casing and emoji, and a share of
+them repeat verbatim the way canned replies do in real traffic.
+"""
+
+import random
+
+_WORDS = {
+    'positive': ['great', 'love', 'amazing', 'excellent', 'happy', 'thanks', 'wonderful', 'fine'],
+    'negative': ['terrible', 'awful', 'hate', 'worst', 'broken', 'disappointed', 'slow', 'bad'],
+    'neutral': ['order', 'delivery', 'account', 'service', 'the', 'is', 'my', 'it', 'was', 'today',
+                'support', 'package', 'refund', 'app', 'number', 'and', 'but', 'not', 'very', 'really'],
+}
+_PUNCTUATION = ['', '.', '!', '!!!', '?', '...', '?!']
+_EMOJI = ['', '', '', ' :)', ' :(', ' 😀', ' 😡', ' 👍', ' 💔']
+_CANNED = ['thanks', 'ok', 'hi', 'bye', 'ok send it', '12345', 'This is terrible and awful',
+           'I love this service!', 'Where is my order?', 'hello there']
+
+
+def generate_message(rng, min_words=1, max_words=40):
+    """Generate one synthetic message."""
+    length = rng.choice([rng.randint(min_words, 4), rng.randint(min_words, max_words)])
+    words = []
+    for _ in range(length):
+        kind = rng.choices(['positive', 'negative', 'neutral'], weights=[2, 2, 6])[0]
+        word = rng.choice(_WORDS[kind])
+        if rng.random() < 0.05:
+            word = word.upper()
+        words.append(word)
+    if rng.random() < 0.1:
+        words.append(str(rng.randint(1000, 99999)))
+    text = ' '.join(words)
+    return text[:1].upper() + text[1:] + rng.choice(_PUNCTUATION) + rng.choice(_EMOJI)
+
+
+def generate_corpus(size, seed=42, repeat_share=0.3, max_words=40):
+    """
+    Generate a reproducible list of messages.
+
+    Args:
+        size (int): Number of messages
+        seed (int): Random seed
+        repeat_share (float): Share of messages drawn from canned replies
+        max_words (int): Longest generated message in words
+
+    Returns:
+        list: Messages
+    """
+    rng = random.Random(seed)
+    return [
+        rng.choice(_CANNED) if rng.random() < repeat_share else generate_message(rng, max_words=max_words)
+        for _ in range(size)
+    ]
@@ -0,0 +1,95 @@
+"""Scaling benchmark for the TF-IDF intent index.
+
+Builds indexes over synthetic intent files of increasing size and reports
+build time and per-message search latency, against a brute-force cosine
+scan over every pattern vector for reference.
+
+Usage:
+    python -m benchmarks.intent_index [--patterns 1000 10000 50000]
+"""
+
+import argparse
+import math
+import random
+import time
+from benchmarks.corpus import generate_corpus
+from src.intent_index import IntentIndex
+from src.matcher import tokenize
+
+
+def synthetic_intents(patterns, per_intent=50, seed=42):
+    """Intent dicts with generated patterns, per_intent patterns per tag."""
+    rng = random.Random(seed)
+    corpus = generate_corpus(patterns, seed=seed, repeat_share=0.0, max_words=8)
+    # Give each intent a few words of its own, as real intents have
+    intents = []
+    for start in range(0, patterns, per_intent):
+        marker = f"topic{start // per_intent}"
+        intents.append({
+            'tag': marker,
+            'patterns': [f"{text} {marker}" if rng.random() < 0.5 else text
+                         for text in corpus[start:start + per_intent]],
+            'responses': []
+        })
+    return intents
+
+
+def brute_force(index, vectors, text):
+    """Best cosine per intent by scanning every pattern vector."""
+    query = {}
+    for term in tokenize(text):
+        query[term] = query.get(term, 0.0) + index.idf.get(term, index.unknown_idf)
+    length = math.sqrt(sum(weight * weight for weight in query.values())) or 1.0
+    best = {}
+    for tag, vector in vectors:
+        score = sum(weight * vector.get(term, 0.0) for term, weight in query.items()) / length
+        if score > best.get(tag, 0.0):
+            best[tag] = score
+    return max(best.items(), key=lambda item: item[1]) if best else None
+
+
+def pattern_vectors(index, intents):
+    """Normalized tf-idf vector of every pattern, for the brute-force scan."""
+    vectors = []
+    for intent in intents:
+        for pattern in intent['patterns']:
+            weights = {}
+            for term in tokenize(pattern):
+                weights[term] = weights.get(term, 0.0) + index.idf[term]
+            length = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+            vectors.append((intent['tag'], {term: weight / length for term, weight in weights.items()}))
+    return vectors
+
+
+def per_message(func, messages):
+    """Mean seconds per message."""
+    start = time.perf_counter()
+    for message in messages:
+        func(message)
+    return (time.perf_counter() - start) / len(messages)
+
+
+def main():
+    """Run the intent index benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--patterns', type=int, nargs='+', default=[1000, 10000, 50000])
+    parser.add_argument('--messages', type=int, default=500)
+    args = parser.parse_args()
+
+    messages = generate_corpus(args.messages, seed=7)
+    print(f"{'patterns':>10}{'build ms':>12}{'index us/msg':>15}{'scan us/msg':>15}")
+    print("-" * 52)
+    for size in args.patterns:
+        intents = synthetic_intents(size)
+        start = time.perf_counter()
+        index = IntentIndex(intents)
+        build = time.perf_counter() - start
+        search = per_message(index.search, messages)
+        vectors = pattern_vectors(index, intents)
+        # The scan is slow at scale; time a sample
+        scan = per_message(lambda text: brute_force(index, vectors, text), messages[:50])
+        print(f"{size:>10}{build * 1000:>12.1f}{search * 1e6:>15.1f}{scan * 1e6:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
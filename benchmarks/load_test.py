@@ -0,0 +1,214 @@
+"""End-to-end load test that replays saved conversations.
+
+Each simulated session replays the user turns of one transcript (a file
+written by ConversationManager.save_to_file) through the full turn
+pipeline: sentiment scoring, response generation and conversation
+storage. Sessions run concurrently on a thread pool, either as fast as
+possible or at the transcript's own inter-message pacing divided by a
+speed factor, and the run reports throughput, turn latency percentiles
+and peak RSS.
+
+Usage:
+    python -m benchmarks.load_test --sessions 200
+    python -m benchmarks.load_test data/sessions/*.json --speed 10 --concurrency 100
+    python -m benchmarks.load_test --synthetic 50 --pipeline get_response
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import json
+import random
+import sys
+import threading
+import time
+import chatbot
+from benchmarks.corpus import generate_corpus
+from src.chatbot import Chatbot
+from src.conversation_manager import ConversationManager
+from src.preprocess import PreprocessedMessage
+from src.sentiment_analyzer import SentimentAnalyzer
+from src.cache import get_shared_cache
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+def load_transcript(path):
+    """
+    Read the user turns of a saved conversation.
+
+    Returns:
+        list: (seconds since the previous user turn, text) pairs
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        conversation = json.load(f)
+    turns, previous = [], None
+    for message in conversation.get('messages', []):
+        if message.get('sender') != 'user' or not message.get('text'):
+            continue
+        timestamp = datetime.fromisoformat(message['timestamp']).timestamp()
+        turns.append((max(timestamp - previous, 0.0) if previous is not None else 0.0, message['text']))
+        previous = timestamp
+    return turns
+
+
+def synthetic_transcripts(count, turns=10, gap=2.0, seed=42):
+    """Build transcripts from the benchmark corpus, gap seconds apart."""
+    corpus = generate_corpus(count * turns, seed=seed)
+    return [[(gap if i else 0.0, text) for i, text in enumerate(corpus[start:start + turns])]
+            for start in range(0, count * turns, turns)]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def peak_rss_bytes():
+    """Peak resident set size of this process, or None where unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class LoadTest:
+    """Replays transcripts as concurrent sessions and records turn latencies."""
+
+    def __init__(self, pipeline='turn', speed=0.0, cache=True):
+        """
+        Initialize the shared pipeline components.
+
+        Args:
+            pipeline (str): 'turn' runs the main.py turn (SentimentAnalyzer,
+                Chatbot.generate_response, ConversationManager); 'get_response'
+                calls chatbot.get_response and stores both messages
+            speed (float): Pacing speed-up over the transcripts' own gaps,
+                0 to replay as fast as possible
+            cache (bool): Share the process-wide sentiment cache; replayed
+                transcripts repeat, so most turns are cache hits with it
+        """
+        self.pipeline = pipeline
+        self.speed = speed
+        self.analyzer = SentimentAnalyzer(cache=get_shared_cache() if cache else None)
+        self.chatbot = Chatbot()
+        self.latencies = []
+        self._lock = threading.Lock()
+
+    def warmup(self):
+        """Load every resource a turn needs, so the first turns are not outliers."""
+        self.analyzer.warmup()
+        self.chatbot.warmup()
+        if self.pipeline == 'get_response':
+            chatbot.warmup()
+
+    def run_session(self, session_id, transcript):
+        """Replay one transcript as one session."""
+        conversation = ConversationManager()
+        latencies = []
+        for gap, text in transcript:
+            if self.speed and gap:
+                time.sleep(gap / self.speed)
+            start = time.perf_counter()
+            if self.pipeline == 'get_response':
+                response = chatbot.get_response(text, session=session_id)
+                conversation.add_message('user', text)
+            else:
+                message = PreprocessedMessage(text)
+                sentiment = self.analyzer.analyze_message(message)
+                conversation.add_message('user', text, sentiment)
+                response = self.chatbot.generate_response(message, sentiment['label'])
+            conversation.add_message('bot', response)
+            latencies.append(time.perf_counter() - start)
+        with self._lock:
+            self.latencies.extend(latencies)
+
+    def run(self, transcripts, sessions, concurrency):
+        """
+        Replay sessions transcripts, cycling through them, concurrently.
+
+        Args:
+            transcripts (list): Transcripts from load_transcript or
+                synthetic_transcripts
+            sessions (int): Simulated sessions
+            concurrency (int): Sessions in flight at once
+
+        Returns:
+            dict: sessions, turns, elapsed_seconds, turns_per_second,
+            p50/p95/p99/max latency in ms and peak_rss_mb
+        """
+        self.latencies = []
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='session') as executor:
+            futures = [executor.submit(self.run_session, f"load-{i}", transcripts[i % len(transcripts)])
+                       for i in range(sessions)]
+            for future in futures:
+                future.result()
+        elapsed = time.perf_counter() - start
+
+        latencies = sorted(self.latencies)
+        peak_rss = peak_rss_bytes()
+        return {
+            'sessions': sessions,
+            'turns': len(latencies),
+            'elapsed_seconds': elapsed,
+            'turns_per_second': len(latencies) / elapsed if elapsed else 0.0,
+            'p50_ms': percentile(latencies, 0.50) * 1000,
+            'p95_ms': percentile(latencies, 0.95) * 1000,
+            'p99_ms': percentile(latencies, 0.99) * 1000,
+            'max_ms': (latencies[-1] if latencies else 0.0) * 1000,
+            'peak_rss_mb': peak_rss / (1024 * 1024) if peak_rss is not None else None
+        }
+
+
+def main():
+    """Run the load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('transcripts', nargs='*', default=['data/conversation_history.json'],
+                        help='saved conversations to replay')
+    parser.add_argument('--synthetic', type=int, default=0,
+                        help='replay N generated transcripts instead of files')
+    parser.add_argument('--sessions', type=int, default=100)
+    parser.add_argument('--concurrency', type=int, default=None,
+                        help='sessions in flight at once, defaults to all of them up to 256')
+    parser.add_argument('--speed', type=float, default=0.0,
+                        help='replay at original pacing sped up N times; 0 replays as fast as possible')
+    parser.add_argument('--pipeline', choices=['turn', 'get_response'], default='turn')
+    parser.add_argument('--no-cache', action='store_true',
+                        help="score every turn in full ('turn' pipeline only)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        transcripts = synthetic_transcripts(args.synthetic, seed=args.seed)
+    else:
+        transcripts = [turns for turns in map(load_transcript, args.transcripts) if turns]
+    if not transcripts:
+        parser.error("no user turns to replay; pass transcripts or --synthetic N")
+    random.Random(args.seed).shuffle(transcripts)
+
+    load_test = LoadTest(pipeline=args.pipeline, speed=args.speed, cache=not args.no_cache)
+    load_test.warmup()
+    report = load_test.run(transcripts, args.sessions, args.concurrency or min(args.sessions, 256))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    pacing = f"{args.speed:g}x pacing" if args.speed else "as fast as possible"
+    print(f"{report['sessions']} sessions, {report['turns']} turns, {pacing}, pipeline '{args.pipeline}'")
+    print(f"Throughput: {report['turns_per_second']:.0f} turns/s over {report['elapsed_seconds']:.2f}s")
+    print(f"Turn latency: p50 {report['p50_ms']:.2f} ms, p95 {report['p95_ms']:.2f} ms, "
+          f"p99 {report['p99_ms']:.2f} ms, max {report['max_ms']:.2f} ms")
+    if report['peak_rss_mb'] is not None:
+        print(f"Peak RSS: {report['peak_rss_mb']:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
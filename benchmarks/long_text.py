@@ -0,0 +1,64 @@
+"""Latency benchmark for long-text (sentence-chunked parallel) scoring.
+
+Builds long messages from the synthetic corpus and reports the latency of
+one whole-string analyze_message call against sentence-chunked scoring on
+process pools of increasing size.
+
+Usage:
+    python -m benchmarks.long_text [--sentences N] [--workers 1 2 4]
+"""
+
+import argparse
+import os
+import time
+from benchmarks.corpus import generate_corpus
+from src import workers
+from src.sentiment_analyzer import SentimentAnalyzer
+
+
+def best_latency(func, text, rounds):
+    """Best-of-rounds seconds for one call."""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    """Run the long-text benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sentences', type=int, default=400)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--method', choices=['vader', 'textblob'], default='vader')
+    parser.add_argument('--workers', type=int, nargs='+', default=None,
+                        help='pool sizes to try, defaults to 1, 2, 4 ... up to the CPU count')
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    sizes = args.workers or sorted({min(2 ** i, cpus) for i in range(cpus.bit_length() + 1)})
+    sentences = [text if text.endswith(('.', '!', '?')) else text + '.'
+                 for text in generate_corpus(args.sentences, repeat_share=0.0)]
+    text = ' '.join(sentences)
+
+    analyzer = SentimentAnalyzer(method=args.method, long_text=False)
+    analyzer.warmup()
+    print(f"{len(text)} characters, {len(sentences)} sentences, {cpus} CPUs")
+    print(f"{'mode':<20}{'ms':>10}")
+    print("-" * 30)
+    whole = best_latency(analyzer.analyze_message, text, args.rounds)
+    print(f"{'whole string':<20}{whole * 1e3:>10.1f}")
+    local = best_latency(lambda t: analyzer.analyze_long_text(t, chunks=1), text, args.rounds)
+    print(f"{'sentences, inline':<20}{local * 1e3:>10.1f}")
+    for size in sizes:
+        with workers.create_executor('process', size) as executor:
+            # Start the workers and load their analyzers before timing
+            list(executor.map(workers.analyze_batch, [['warmup']] * size, [args.method] * size))
+            latency = best_latency(lambda t: analyzer.analyze_long_text(t, executor=executor, chunks=size), text, args.rounds)
+        print(f"{f'{size} workers':<20}{latency * 1e3:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Memory-per-message benchmark for ConversationManager storage modes.
+
+Fills a conversation with alternating scored user messages and bot replies
+and reports the bytes allocated per message, measured with tracemalloc, for
+the dict layout and the compact columnar layout.
+
+Usage:
+    python -m benchmarks.memory [--messages N]
+"""
+
+import argparse
+import gc
+import tracemalloc
+from src.conversation_manager import ConversationManager
+from src.sentiment_analyzer import SentimentAnalyzer
+
+USER_TEXTS = [
+    "Hi there",
+    "This is a terrible experience, my order never arrived.",
+    "Thanks, that fixed it!",
+    "ok",
+    "Can you check order 12345 for me?",
+]
+BOT_TEXT = "I see. Tell me more about that."
+
+
+def measure(compact, messages, scored):
+    """
+    Measure allocated bytes per message for one storage mode.
+
+    Args:
+        compact (bool): Use compact storage
+        messages (int): Messages to add
+        scored (list): Precomputed (text, sentiment) pairs for user turns
+
+    Returns:
+        float: Bytes per message
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    conversation = ConversationManager(compact=compact)
+    for i in range(messages // 2):
+        text, sentiment = scored[i % len(scored)]
+        # Copy the sentiment dict as a fresh analysis would produce one
+        sentiment = dict(sentiment, detailed_scores=dict(sentiment['detailed_scores']))
+        conversation.add_message('user', text, sentiment)
+        conversation.add_message('bot', BOT_TEXT)
+
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / max(len(conversation.messages), 1)
+
+
+def main():
+    """Run the memory benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=20000)
+    args = parser.parse_args()
+
+    analyzer = SentimentAnalyzer()
+    scored = [(text, analyzer.analyze_message(text)) for text in USER_TEXTS]
+
+    dict_bytes = measure(False, args.messages, scored)
+    compact_bytes = measure(True, args.messages, scored)
+    print(f"{'layout':<12}{'bytes/message':>16}")
+    print("-" * 28)
+    print(f"{'dict':<12}{dict_bytes:>16.1f}")
+    print(f"{'compact':<12}{compact_bytes:>16.1f}")
+    print(f"Compact layout uses {compact_bytes / dict_bytes:.0%} of the dict layout's memory")
+
+
+if __name__ == "__main__":
+    main()
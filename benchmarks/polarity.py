@@ -0,0 +1,58 @@
+"""Speedup and parity benchmark for the 'textblob' sentiment method.
+
+Scores a synthetic corpus with TextBlob objects and with the pattern
+lexicon scorer (TEXTBLOB_FAST_SCORER), reports time per message for each
+and the largest polarity/subjectivity difference between them.
+
+Usage:
+    python -m benchmarks.polarity [--corpus-size N]
+"""
+
+import argparse
+import time
+from benchmarks.corpus import generate_corpus
+from src.sentiment_analyzer import SentimentAnalyzer
+
+
+def time_per_message(analyzer, corpus, rounds):
+    """Best-of-rounds seconds per message for analyze_message over the corpus."""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for text in corpus:
+            analyzer.analyze_message(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(corpus)
+
+
+def main():
+    """Run the polarity benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus-size', type=int, default=2000)
+    parser.add_argument('--rounds', type=int, default=3)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.corpus_size)
+    blob = SentimentAnalyzer(method='textblob', fast_textblob=False)
+    fast = SentimentAnalyzer(method='textblob', fast_textblob=True)
+    blob.warmup()
+    fast.warmup()
+
+    max_diff = 0.0
+    for text in corpus:
+        expected = blob.analyze_message(text)['detailed_scores']
+        actual = fast.analyze_message(text)['detailed_scores']
+        max_diff = max(max_diff, *(abs(expected[key] - actual[key]) for key in expected))
+
+    blob_time = time_per_message(blob, corpus, args.rounds)
+    fast_time = time_per_message(fast, corpus, args.rounds)
+    print(f"{'scorer':<12}{'us/message':>14}")
+    print("-" * 26)
+    print(f"{'TextBlob':<12}{blob_time * 1e6:>14.1f}")
+    print(f"{'lexicon':<12}{fast_time * 1e6:>14.1f}")
+    print(f"Speedup {blob_time / fast_time:.1f}x, largest score difference {max_diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
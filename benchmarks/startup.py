@@ -0,0 +1,66 @@
+"""Startup-time benchmark reporting the cost of each import and warmup.
+
+Every measurement runs in a fresh interpreter so module caches from one
+import never hide the cost of another.
+
+Usage:
+    python -m benchmarks.startup [--repeat N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (name, setup statement, timed statement)
+CASES = [
+    ('import config', '', 'import config'),
+    ('import src.sentiment_analyzer', '', 'import src.sentiment_analyzer'),
+    ('import src.conversation_manager', '', 'import src.conversation_manager'),
+    ('import src.chatbot', '', 'import src.chatbot'),
+    ('import sentiment', '', 'import sentiment'),
+    ('import chatbot', '', 'import chatbot'),
+    ('import main', '', 'import main'),
+    ('sentiment.warmup()', 'import sentiment', 'sentiment.warmup()'),
+    ('chatbot.warmup()', 'import chatbot', 'chatbot.warmup()'),
+    ('first get_sentiment()', 'import sentiment', "sentiment.get_sentiment('hello there')"),
+    ('first get_response()', 'import chatbot', "chatbot.get_response('hello there')"),
+]
+
+_TIMER = """
+import time
+{setup}
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+
+def measure(setup, statement):
+    """Run one statement in a fresh interpreter and return its duration in seconds."""
+    code = _TIMER.format(setup=setup, statement=statement)
+    output = subprocess.run(
+        [sys.executable, '-c', code],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main():
+    """Run the startup benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='fresh interpreters per case')
+    args = parser.parse_args()
+
+    print(f"{'case':<36}{'median ms':>12}{'min ms':>12}")
+    print("-" * 60)
+    for name, setup, statement in CASES:
+        timings = [measure(setup, statement) * 1000 for _ in range(args.repeat)]
+        print(f"{name:<36}{statistics.median(timings):>12.2f}{min(timings):>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
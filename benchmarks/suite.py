@@ -0,0 +1,244 @@
+"""Micro-benchmarks for every hot path, with regression checks.
+
+Each case reports ops/sec and p50/p99 latency over a synthetic corpus.
+Results can be stored as a baseline; later runs fail (exit status 1) when
+a case's throughput drops more than the tolerance below its baseline.
+
+Usage:
+    python -m benchmarks.suite --save-baseline        # record a baseline
+    python -m benchmarks.suite                        # compare against it
+    python -m benchmarks.suite --tolerance 0.1 --only sentiment
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import chatbot
+from benchmarks.corpus import generate_corpus
+from src.aggregates import SentimentRollup
+from src.chatbot import Chatbot
+from src.conversation_manager import ConversationManager
+from src.intent_index import IntentIndex
+from src.intent_model import MappedIntentModel, write_model
+from src.matcher import tokenize
+from src.sentiment_analyzer import SentimentAnalyzer
+from config import INTENTS_FILE, BENCHMARK_TOLERANCE
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def measure(func, inputs, min_time=0.5, max_ops=20000):
+    """
+    Time func over inputs, cycling through them.
+
+    Args:
+        func (callable): Called with one input per operation
+        inputs (list): Inputs to cycle through
+        min_time (float): Keep going until this many seconds have passed
+        max_ops (int): Stop after this many operations
+
+    Returns:
+        dict: ops_per_sec, p50_us, p99_us and ops
+    """
+    timings = []
+    elapsed = 0.0
+    clock = time.perf_counter
+    while elapsed < min_time and len(timings) < max_ops:
+        for item in inputs:
+            start = clock()
+            func(item)
+            timings.append(clock() - start)
+            if len(timings) >= max_ops:
+                break
+        elapsed = sum(timings)
+
+    timings.sort()
+    return {
+        'ops': len(timings),
+        'ops_per_sec': len(timings) / elapsed if elapsed else 0.0,
+        'p50_us': statistics.median(timings) * 1e6,
+        'p99_us': timings[min(len(timings) - 1, int(len(timings) * 0.99))] * 1e6
+    }
+
+
+def _synthetic_model(path):
+    """
+    Write a bag-of-words intent model over the intents.json patterns.
+
+    The weights are crude, but prediction walks the same mapped-model code
+    as a trained model of the same vocabulary size.
+    """
+    with open(INTENTS_FILE, 'r') as f:
+        intents = json.load(f)['intents']
+    terms = {}
+    for intent in intents:
+        for pattern in intent['patterns']:
+            for word in tokenize(pattern):
+                terms.setdefault(word, len(terms))
+    rows = []
+    for intent in intents:
+        row = [0.0] * len(terms)
+        for pattern in intent['patterns']:
+            for word in tokenize(pattern):
+                row[terms[word]] += 1.0
+        rows.append(row)
+    settings = {
+        'lowercase': True, 'token_pattern': r"(?u)\b\w\w+\b", 'ngram_range': [1, 1],
+        'stop_words': [], 'binary': False, 'sublinear_tf': False, 'norm': 'l2', 'use_idf': False
+    }
+    write_model(path, settings, [intent['tag'] for intent in intents], terms, rows, [0.0] * len(rows))
+    return intents
+
+
+def build_cases(corpus, workdir):
+    """
+    Build the benchmark cases.
+
+    Returns:
+        list: (name, func, inputs) triples
+    """
+    vader = SentimentAnalyzer(method='vader')
+    vader_full = SentimentAnalyzer(method='vader', neutral_prefilter=False)
+    textblob = SentimentAnalyzer(method='textblob')
+    textblob_objects = SentimentAnalyzer(method='textblob', fast_textblob=False)
+    bot = Chatbot()
+    bot.warmup()
+    vader.warmup()
+    vader_full.warmup()
+    textblob.warmup()
+    textblob_objects.warmup()
+    labels = [vader.analyze_message(text)['label'] for text in corpus]
+    labelled = list(zip(corpus, labels))
+
+    cases = [
+        ('sentiment.vader', vader.analyze_message, corpus),
+        ('sentiment.vader.no_prefilter', vader_full.analyze_message, corpus),
+        ('sentiment.textblob', textblob.analyze_message, corpus),
+        ('sentiment.textblob.objects', textblob_objects.analyze_message, corpus),
+    ]
+    for size in (10, 100, 1000):
+        histories = [[corpus[(offset + i) % len(corpus)] for i in range(size)] for offset in range(0, 35, 7)]
+        cases.append((f'conversation.vader.{size}', vader.analyze_conversation, histories))
+
+    rollup = SentimentRollup()
+    scores = [vader.analyze_message(text)['score'] for text in corpus]
+    cases.append(('rollup.add', rollup.add, scores))
+    cases.append(('rollup.snapshot', lambda window: rollup.snapshot(window), [300, None]))
+
+    cases.append(('chatbot.generate_response', lambda pair: bot.generate_response(*pair), labelled))
+
+    chatbot.warmup()
+    index = chatbot._intent_index or IntentIndex.from_file(INTENTS_FILE)
+    index_responses = chatbot._responses
+
+    def without_model(text):
+        chatbot._mapped_model = None
+        chatbot._intent_index = None
+        return chatbot.get_response(text)
+
+    def with_index(text):
+        chatbot._mapped_model = None
+        chatbot._intent_index = index
+        chatbot._responses = index_responses
+        return chatbot.get_response(text)
+
+    model_path = os.path.join(workdir, 'intent_model.bin')
+    responses = chatbot._responses_by_tag({'intents': _synthetic_model(model_path)})
+    mapped = MappedIntentModel(model_path)
+
+    def with_model(text):
+        chatbot._mapped_model = mapped
+        chatbot._responses = responses
+        return chatbot.get_response(text)
+
+    cases.append(('get_response.rules', without_model, corpus))
+    cases.append(('get_response.index', with_index, corpus))
+    cases.append(('get_response.model', with_model, corpus))
+
+    for size in (10, 100, 1000):
+        conversation = ConversationManager()
+        for text, label in labelled[:size // 2]:
+            conversation.add_message('user', text, vader.analyze_message(text))
+            conversation.add_message('bot', "I see. Tell me more about that.")
+        path = os.path.join(workdir, f'history_{size}.json')
+        cases.append((f'save_to_file.{size}', lambda filename, c=conversation: c.save_to_file(filename), [path]))
+    return cases
+
+
+def compare(results, baseline, tolerance):
+    """
+    Find cases whose throughput fell more than tolerance below baseline.
+
+    Returns:
+        list: (name, baseline ops/sec, current ops/sec) for each regression
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference and result['ops_per_sec'] < reference['ops_per_sec'] * (1 - tolerance):
+            regressions.append((name, reference['ops_per_sec'], result['ops_per_sec']))
+    return regressions
+
+
+def main():
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--corpus-size', type=int, default=500)
+    parser.add_argument('--min-time', type=float, default=0.5, help='seconds per case')
+    parser.add_argument('--only', default=None, help='run cases whose name starts with this')
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=BENCHMARK_TOLERANCE,
+                        help='allowed fractional drop in ops/sec before failing')
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.corpus_size)
+    workdir = tempfile.mkdtemp(prefix='chatbot-bench-')
+    results = {}
+    try:
+        print(f"{'case':<28}{'ops/sec':>12}{'p50 us':>12}{'p99 us':>12}")
+        print("-" * 64)
+        for name, func, inputs in build_cases(corpus, workdir):
+            if args.only and not name.startswith(args.only):
+                continue
+            result = measure(func, inputs, min_time=args.min_time)
+            results[name] = result
+            print(f"{name:<28}{result['ops_per_sec']:>12.1f}{result['p50_us']:>12.1f}{result['p99_us']:>12.1f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r') as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("\nNo baseline yet; run with --save-baseline to record one.")
+        return 0
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if not regressions:
+        print(f"\nNo regressions beyond {args.tolerance:.0%} of baseline.")
+        return 0
+
+    print(f"\nRegressions beyond {args.tolerance:.0%} of baseline:")
+    for name, before, after in regressions:
+        print(f"  {name}: {before:.1f} -> {after:.1f} ops/sec ({after / before - 1:+.0%})")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,59 +1,304 @@
-"""Chatbot wrapper for test compatibility."""
+"""Chatbot wrapper for test compatibility.
+
+The chatbot, sentiment analyzer and optional ML model are loaded on the
+first call to get_response(); call warmup() to load them up front. Without
+a trained model, intents are retrieved from the intents.json patterns by
+TF-IDF similarity before falling back to the keyword rules.
+
+With TURN_LATENCY_BUDGET_MS set, each turn runs against that budget:
+stages projected to overrun it are replaced by cheaper ones.
+get_response_detailed() reports which path served the response and what
+fell back.
+"""
 
 import os
 import json
+import logging
 import pickle
+import random
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from src.batcher import MicroBatcher
 from src.chatbot import Chatbot
 from src.sentiment_analyzer import SentimentAnalyzer
+from src.cache import get_shared_cache
+from src.intent_index import IntentIndex
+from src.intent_model import MappedIntentModel
+from src.preprocess import as_message
+from src.metrics import get_metrics
+from src.event_log import StageTimings, log_turn
+from src.deadline import LatencyBudget
+from config import (
+    INTENTS_FILE,
+    INTENT_MODEL_FILE,
+    INTENT_BATCHING_ENABLED,
+    INTENT_INDEX_ENABLED,
+    SENTIMENT_METHOD,
+    LONG_TEXT_THRESHOLD
+)
 
-# Initialize chatbot and sentiment analyzer
-_chatbot = Chatbot()
-_sentiment_analyzer = SentimentAnalyzer()
+_chatbot = None
+_sentiment_analyzer = None
+# VADER analyzer that stands in for a slower configured method under deadline pressure
+_fallback_analyzer = None
+# Stage cost estimates and fallback counters for the per-turn latency budget
+_budget = LatencyBudget()
 
-# Load ML model if available
+# ML model, loaded on first use if available. A mapped model file is
+# preferred because it is shared between worker processes.
+_mapped_model = None
 _model = None
 _vectorizer = None
-_intents = None
+_responses = None
+# Pattern similarity index, used when no model file exists
+_intent_index = None
+_model_loaded = False
+_load_lock = threading.Lock()
+# Coalesces concurrent predictions when INTENT_BATCHING_ENABLED
+_batcher = None
+
+logger = logging.getLogger(__name__)
+
+
+def _get_chatbot():
+    """Get the rule-based chatbot, creating it on first use."""
+    global _chatbot
+    if _chatbot is None:
+        _chatbot = Chatbot()
+    return _chatbot
+
+
+def _get_sentiment_analyzer():
+    """Get the sentiment analyzer, creating it on first use."""
+    global _sentiment_analyzer
+    if _sentiment_analyzer is None:
+        _sentiment_analyzer = SentimentAnalyzer(method=SENTIMENT_METHOD, cache=get_shared_cache())
+    return _sentiment_analyzer
+
+
+def _get_fallback_analyzer():
+    """Get the VADER analyzer used when the configured method would overrun."""
+    global _fallback_analyzer
+    if _fallback_analyzer is None:
+        _fallback_analyzer = SentimentAnalyzer(method='vader', cache=get_shared_cache())
+    return _fallback_analyzer
+
+
+def _responses_by_tag(intents):
+    """Index intent responses by tag."""
+    return {intent['tag']: intent['responses'] for intent in intents['intents']}
+
+
+def _load_model():
+    """Load the ML model, vectorizer or intent index and the intents once if the files exist."""
+    global _mapped_model, _model, _vectorizer, _responses, _intent_index, _batcher, _model_loaded
+    if _model_loaded:
+        return
+    with _load_lock:
+        if _model_loaded:
+            return
+        intents = None
+        if os.path.exists(INTENTS_FILE):
+            with open(INTENTS_FILE, 'r') as f:
+                intents = json.load(f)
+        has_pickles = os.path.exists('chatbot_model.pkl') and os.path.exists('vectorizer.pkl')
+        if os.path.exists(INTENT_MODEL_FILE):
+            _mapped_model = MappedIntentModel(INTENT_MODEL_FILE)
+        elif has_pickles:
+            with open('chatbot_model.pkl', 'rb') as f:
+                _model = pickle.load(f)
+            with open('vectorizer.pkl', 'rb') as f:
+                _vectorizer = pickle.load(f)
+        elif INTENT_INDEX_ENABLED and intents:
+            _intent_index = IntentIndex(intents['intents'])
+        if intents and (_mapped_model or has_pickles or _intent_index):
+            _responses = _responses_by_tag(intents)
+        if (_mapped_model or has_pickles) and INTENT_BATCHING_ENABLED:
+            _batcher = MicroBatcher(_predict_tags, name='intent-batcher')
+        _model_loaded = True
+
+
+def _predict_tags(messages):
+    """Predict intent tags for a batch of PreprocessedMessages in one model call."""
+    if _mapped_model is not None:
+        return _mapped_model.predict(messages)
+    return list(_model.predict(_vectorizer.transform([message.lower for message in messages])))
+
+
+def _predict_within(message, deadline):
+    """
+    Predict the intent tag, giving up on a batched prediction at the deadline.
+    
+    A direct model call cannot be interrupted. Either way the stage estimate
+    gets the prediction's full duration, even if it finishes after the
+    caller gave up.
+    
+    Raises:
+        concurrent.futures.TimeoutError: If the batch is not done in time
+    """
+    start = time.perf_counter()
+    if _batcher is None:
+        tag = _predict_tags([message])[0]
+        _budget.observe('intent_predict', time.perf_counter() - start)
+        return tag
+    future = _batcher.submit(message)
+    future.add_done_callback(lambda _: _budget.observe('intent_predict', time.perf_counter() - start))
+    return future.result(deadline.timeout())
+
+
+def batching_stats():
+    """
+    Get intent batching statistics.
+    
+    Returns:
+        dict or None: Batch size and wait time stats, or None when
+        batching is off or no model is loaded
+    """
+    return _batcher.stats() if _batcher is not None else None
+
+
+def deadline_stats():
+    """
+    Get latency budget statistics.
+    
+    Returns:
+        dict: Turns, budget overruns, and fallback counts and rates per stage
+    """
+    return _budget.stats()
 
-if os.path.exists('chatbot_model.pkl') and os.path.exists('vectorizer.pkl'):
-    with open('chatbot_model.pkl', 'rb') as f:
-        _model = pickle.load(f)
-    with open('vectorizer.pkl', 'rb') as f:
-        _vectorizer = pickle.load(f)
-    if os.path.exists('intents.json'):
-        with open('intents.json', 'r') as f:
-            _intents = json.load(f)
 
-def get_response(text):
+def warmup():
+    """Load every resource get_response needs instead of on the first call."""
+    _load_model()
+    _get_chatbot().warmup()
+    _get_sentiment_analyzer().warmup()
+
+
+def _analyze_within(message, deadline, fallbacks):
+    """
+    Score sentiment with the cheapest path that fits the deadline.
+    
+    The configured method is replaced by VADER if it is projected to
+    overrun, and a long message is scored on its first LONG_TEXT_THRESHOLD
+    characters if even VADER would.
+    
+    Returns:
+        tuple: (sentiment result, method used)
+    """
+    analyzer = _get_sentiment_analyzer()
+    size = len(message) or 1
+    if analyzer.method != 'vader' and not _budget.fits(deadline, f'sentiment.{analyzer.method}', size):
+        fallbacks.append(analyzer.method)
+        analyzer = _get_fallback_analyzer()
+    text = message
+    if len(message) > LONG_TEXT_THRESHOLD and not _budget.fits(deadline, f'sentiment.{analyzer.method}', size):
+        fallbacks.append('truncated')
+        text = message.raw[:LONG_TEXT_THRESHOLD]
+        size = LONG_TEXT_THRESHOLD
+    start = time.perf_counter()
+    result = analyzer.analyze_message(text)
+    _budget.observe(f'sentiment.{analyzer.method}', time.perf_counter() - start, size)
+    return result, analyzer.method
+
+
+def get_response_detailed(text, session=None):
+    """
+    Get chatbot response for given text, with how it was produced.
+    
+    Args:
+        text (str): User input text
+        session (str, optional): Session identifier for the turn event log
+        
+    Returns:
+        dict: 'response'; 'path' that served it ('model', 'index', 'rules'
+        or 'empty'); predicted 'intent'; 'sentiment' result and
+        'sentiment_method' when the rules answered; 'fallbacks', the
+        stages that took a cheaper path to stay within
+        TURN_LATENCY_BUDGET_MS; 'elapsed_ms' and 'deadline_exceeded'
+    """
+    result = {
+        'response': "I'm listening. Please go on.",
+        'path': 'empty',
+        'intent': None,
+        'sentiment': None,
+        'sentiment_method': None,
+        'fallbacks': [],
+        'elapsed_ms': 0.0,
+        'deadline_exceeded': False
+    }
+    if not text:
+        return result
+    
+    message = as_message(text)
+    metrics = get_metrics()
+    timings = StageTimings()
+    deadline = _budget.start()
+    fallbacks = result['fallbacks']
+    response = None
+    with metrics.timer('get_response'):
+        _load_model()
+        
+        # Use ML model if available and projected to answer in time
+        if (_mapped_model or (_model and _vectorizer)) and _responses:
+            if _budget.fits(deadline, 'intent_predict'):
+                try:
+                    # Predict intent using ML model
+                    with metrics.timer('intent_predict'), timings.stage('intent_predict'):
+                        result['intent'] = _predict_within(message, deadline)
+                    
+                    responses = _responses.get(result['intent'])
+                    if responses:
+                        response = random.choice(responses)
+                        result['path'] = 'model'
+                except FutureTimeoutError:
+                    fallbacks.append('model')
+                except Exception:
+                    logger.exception("Intent prediction failed, falling back to rules")
+            else:
+                fallbacks.append('model')
+        
+        # Otherwise answer from the most similar intent pattern, if close enough
+        elif _intent_index is not None and _responses:
+            if _budget.fits(deadline, 'intent_search'):
+                with metrics.timer('intent_search'), timings.stage('intent_search'):
+                    match = _intent_index.match(message)
+                _budget.observe('intent_search', timings.ms['intent_search'] / 1000)
+                if match is not None:
+                    result['intent'] = match[0]
+                    responses = _responses.get(result['intent'])
+                    if responses:
+                        response = random.choice(responses)
+                        result['path'] = 'index'
+            else:
+                fallbacks.append('index')
+        
+        # Fallback to rule-based system
+        if response is None:
+            with metrics.timer('sentiment'), timings.stage('sentiment'):
+                result['sentiment'], result['sentiment_method'] = _analyze_within(message, deadline, fallbacks)
+            with metrics.timer('rule_fallback'), timings.stage('rule_fallback'):
+                response = _get_chatbot().generate_response(message, result['sentiment']['label'])
+            result['path'] = 'rules'
+    
+    result['response'] = response
+    result['elapsed_ms'] = deadline.elapsed() * 1000
+    result['deadline_exceeded'] = deadline.exceeded()
+    _budget.record(fallbacks, result['deadline_exceeded'])
+    log_turn(session, timings, sentiment=result['sentiment'], intent=result['intent'], path=result['path'],
+             fallbacks=fallbacks)
+    return result
+
+
+def get_response(text, session=None):
     """
     Get chatbot response for given text.
     
     Args:
         text (str): User input text
+        session (str, optional): Session identifier for the turn event log
         
     Returns:
         str: Chatbot response
     """
-    if not text:
-        return "I'm listening. Please go on."
-    
-    # Use ML model if available
-    if _model and _vectorizer and _intents:
-        try:
-            # Predict intent using ML model
-            X = _vectorizer.transform([text.lower()])
-            predicted_tag = _model.predict(X)[0]
-            
-            # Find responses for predicted intent
-            for intent in _intents['intents']:
-                if intent['tag'] == predicted_tag:
-                    import random
-                    return random.choice(intent['responses'])
-        except:
-            pass
-    
-    # Fallback to rule-based system
-    sentiment_result = _sentiment_analyzer.analyze_message(text)
-    sentiment_label = sentiment_result['label']
-    response = _chatbot.generate_response(text, sentiment_label)
-    return response
\ No newline at end of file
+    return get_response_detailed(text, session)['response']
@@ -6,16 +6,109 @@ import logging
 LOG_LEVEL = logging.INFO
 LOG_FILE = "chatbot.log"
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Structured turn events and errors, queued and written by a background thread
+LOG_ENABLED = False
+LOG_QUEUE_SIZE = 10000  # events buffered before new ones are dropped
+LOG_BATCH_SIZE = 256  # most events per file write
+LOG_MAX_BYTES = 10 * 1024 * 1024  # rotate past this size
+LOG_BACKUP_COUNT = 3
+
+
+# Per-stage latency metrics, written by main.py at the end of a session
+METRICS_ENABLED = False
+METRICS_PROMETHEUS_FILE = 'data/metrics.prom'
+METRICS_JSON_FILE = 'data/metrics.json'
 
 
 # Sentiment thresholds
 POSITIVE_THRESHOLD = 0.3
 NEGATIVE_THRESHOLD = -0.3
 SENTIMENT_METHOD = 'vader'
+# Answer messages with no VADER lexicon hit as neutral without a full VADER pass
+NEUTRAL_PREFILTER_ENABLED = True
+# Score the 'textblob' method with the built-in pattern lexicon scorer instead of TextBlob objects
+TEXTBLOB_FAST_SCORER = True
+
+# Long-text mode: messages longer than the threshold (characters) are split into
+# sentences and scored in parallel chunks on a process pool
+LONG_TEXT_ENABLED = False
+LONG_TEXT_THRESHOLD = 2000
+LONG_TEXT_WORKERS = None  # None = one per CPU
+LONG_TEXT_MIN_CHUNK = 500  # fewest characters sent to one worker
+
+# Latency budget per chatbot.get_response turn; stages projected to overrun it take
+# cheaper paths (rules instead of the intent model, VADER instead of TextBlob,
+# long messages truncated to LONG_TEXT_THRESHOLD). None disables deadlines, so
+# every turn takes the full path; e.g. 200 to enable.
+TURN_LATENCY_BUDGET_MS = None
+DEADLINE_EWMA_ALPHA = 0.2  # decay of stage cost estimates towards faster observations
+
+# Sentiment result cache (shared by the sentiment and chatbot wrappers)
+SENTIMENT_CACHE_ENABLED = False
+SENTIMENT_CACHE_SIZE = 1024
+
+# Cross-session sentiment rollup fed by every scored user message
+ROLLUP_ENABLED = False
+ROLLUP_BUCKET_SECONDS = 10
+ROLLUP_BUCKETS = 360  # 1 hour of 10-second buckets
+ROLLUP_FAST_ALPHA = 0.2
+ROLLUP_SLOW_ALPHA = 0.02
+ROLLUP_ALERT_DELTA = 0.3  # fast/slow EWMA gap that raises a change-point alert
+ROLLUP_ALERT_MIN_MESSAGES = 20
 
 # Chatbot settings
 BOT_NAME = "SentimentBot"
 EXIT_COMMANDS = ['quit', 'exit', 'bye', 'goodbye']
+INTENTS_FILE = 'intents.json'
+
+# Intent model exported by src.intent_model; preferred over the pickle files
+INTENT_MODEL_FILE = 'intent_model.bin'
+# Hash buckets per intent for models built by train_model.py
+INTENT_HASH_FEATURES = 4096
+# TF-IDF pattern index chatbot.get_response uses when no trained model exists
+INTENT_INDEX_ENABLED = True
+INTENT_INDEX_THRESHOLD = 0.5  # lowest cosine similarity answered from intents.json
+INTENT_INDEX_TOP_K = 3
+INTENT_INDEX_MAX_POSTINGS = 1000  # heaviest postings kept per term
+INTENT_HISTORY_THRESHOLD = 0.6  # lowest similarity for labeling saved messages in train_model.py --history
+# Coalesce concurrent ML intent predictions into batches of up to N messages or T ms
+INTENT_BATCHING_ENABLED = False
+INTENT_BATCH_SIZE = 32
+INTENT_BATCH_WAIT_MS = 2
+
+# Store conversation messages in typed columns instead of dicts
+CONVERSATION_COMPACT_STORAGE = False
+
+# Where main.py saves finished conversations: 'json' or 'sqlite'
+STORAGE_BACKEND = 'json'
+SQLITE_DB_FILE = 'data/conversations.db'
+
+# Append-only conversation journal
+JOURNAL_ENABLED = False
+JOURNAL_DIR = 'data/journals'
+JOURNAL_FLUSH_EVERY = 1  # records per flush to the OS, 0 flushes only on close
+JOURNAL_FSYNC_EVERY = 0  # records per fsync, 0 never fsyncs
+
+# Server settings (server.py)
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8765
+SERVER_EXECUTOR = 'thread'  # 'thread' or 'process' pool for sentiment scoring
+SERVER_WORKERS = 4
+SESSION_DIR = 'data/sessions'
+SERVER_MAX_LINE_BYTES = 64 * 1024  # Longer messages end the session with an error reply
+
+# Session registry: resident budget, idle eviction and spill location
+SESSION_MAX_RESIDENT = 1000
+SESSION_MAX_MESSAGES = None  # total resident messages, None for no limit
+SESSION_IDLE_TTL = 1800  # seconds
+SESSION_SPILL_DIR = 'data/sessions/spill'
+
+# Batch scoring settings (batch_score.py)
+BATCH_CHUNK_SIZE = 1000
+BATCH_WORKERS = None  # None uses one worker process per CPU
+
+# Allowed fractional drop in ops/sec before benchmarks.suite reports a regression
+BENCHMARK_TOLERANCE = 0.25
 
 # Color codes for terminal output
 class Colors:
@@ -1,28 +1,53 @@
 """Main entry point for the sentiment analysis chatbot."""
 
 import os
+from datetime import datetime
 from src.chatbot import Chatbot
 from src.sentiment_analyzer import SentimentAnalyzer
 from src.conversation_manager import ConversationManager
+from src.preprocess import PreprocessedMessage
+from src.cache import get_shared_cache
+from src.journal import ConversationJournal
+from src.sqlite_store import SQLiteConversationStore
+from src.metrics import get_metrics
+from src.event_log import StageTimings, get_event_log, log_turn
 from src.utils import (
     print_colored, 
     format_sentiment_output,
     display_conversation_summary,
     display_tier2_message_analysis
 )
-from config import Colors, EXIT_COMMANDS
+from config import (
+    Colors,
+    EXIT_COMMANDS,
+    JOURNAL_ENABLED,
+    JOURNAL_DIR,
+    STORAGE_BACKEND,
+    SQLITE_DB_FILE,
+    METRICS_ENABLED,
+    METRICS_PROMETHEUS_FILE,
+    METRICS_JSON_FILE
+)
 
 
 def main():
     """Run the chatbot application."""
     # Initialize components
     chatbot = Chatbot()
-    sentiment_analyzer = SentimentAnalyzer(method='vader')
-    conversation = ConversationManager()
+    sentiment_analyzer = SentimentAnalyzer(method='vader', cache=get_shared_cache())
     
     # Create data directory if it doesn't exist
     os.makedirs('data', exist_ok=True)
     
+    # Journal each message as it arrives so a crash loses nothing
+    journal = None
+    if JOURNAL_ENABLED:
+        journal = ConversationJournal(os.path.join(JOURNAL_DIR, f"{datetime.now():%Y%m%d-%H%M%S}.jsonl"))
+    conversation = ConversationManager(journal=journal)
+    session = conversation.start_time.isoformat()
+    metrics = get_metrics()
+    event_log = get_event_log()
+    
     # Display welcome message
     print(chatbot.get_welcome_message())
     
@@ -34,42 +59,66 @@ def main():
         if not user_input:
             continue
         
+        # Preprocess once; every stage below reads this message
+        message = PreprocessedMessage(user_input)
+        
         # Check for exit commands
-        if user_input.lower() in EXIT_COMMANDS:
+        if message.lower in EXIT_COMMANDS:
             print_colored(f"\n{chatbot.name}: Thank you for chatting! Analyzing conversation...\n", 
                          Colors.OKGREEN)
             break
         
-        # TIER 2: Analyze sentiment of user message
-        sentiment = sentiment_analyzer.analyze_message(user_input)
-        
-        # Store user message with sentiment
-        conversation.add_message('user', user_input, sentiment)
-        
-        # TIER 2: Display sentiment for this message
-        print(format_sentiment_output(user_input, sentiment))
-        
-        # Generate and display bot response
-        bot_response = chatbot.generate_response(user_input, sentiment['label'])
-        print_colored(f"{chatbot.name}: {bot_response}\n", Colors.OKGREEN)
-        
-        # Store bot response
-        conversation.add_message('bot', bot_response)
+        timings = StageTimings()
+        with metrics.timer('turn'):
+            # TIER 2: Analyze sentiment of user message
+            with metrics.timer('sentiment'), timings.stage('sentiment'):
+                sentiment = sentiment_analyzer.analyze_message(message)
+            
+            # Store user message with sentiment
+            with metrics.timer('persistence'), timings.stage('persistence'):
+                conversation.add_message('user', user_input, sentiment)
+            
+            # TIER 2: Display sentiment for this message
+            print(format_sentiment_output(user_input, sentiment))
+            
+            # Generate and display bot response
+            with metrics.timer('response'), timings.stage('response'):
+                bot_response = chatbot.generate_response(message, sentiment['label'])
+            print_colored(f"{chatbot.name}: {bot_response}\n", Colors.OKGREEN)
+            
+            # Store bot response
+            with metrics.timer('persistence'), timings.stage('persistence'):
+                conversation.add_message('bot', bot_response)
+        log_turn(session, timings, sentiment=sentiment, path='rules')
+    
+    if journal is not None:
+        journal.close()
     
     # TIER 2: Display all message-level sentiments
     display_tier2_message_analysis(conversation.get_all_messages())
     
-    # TIER 1: Analyze overall conversation sentiment
-    user_messages = conversation.get_user_messages()
-    conversation_sentiment = sentiment_analyzer.analyze_conversation(user_messages)
+    # TIER 1: Overall conversation sentiment, aggregated as messages arrived
+    conversation_sentiment = conversation.get_sentiment_summary()
     
     # Display conversation summary
     duration = conversation.get_conversation_duration()
     display_conversation_summary(conversation_sentiment, duration)
     
     # Save conversation to file
-    if conversation.save_to_file():
-        print_colored("✓ Conversation saved to data/conversation_history.json", Colors.OKGREEN)
+    with metrics.timer('save'):
+        if STORAGE_BACKEND == 'sqlite':
+            with SQLiteConversationStore(SQLITE_DB_FILE) as store:
+                store.save_conversation(conversation, session_id=conversation.start_time.isoformat())
+            saved_to = SQLITE_DB_FILE
+        else:
+            saved_to = 'data/conversation_history.json' if conversation.save_to_file() else None
+    if saved_to:
+        print_colored(f"✓ Conversation saved to {saved_to}", Colors.OKGREEN)
+    
+    if METRICS_ENABLED:
+        metrics.write(METRICS_PROMETHEUS_FILE, METRICS_JSON_FILE)
+    if event_log is not None:
+        event_log.close()
     
     print_colored(f"Final Output: Overall conversation sentiment: {conversation_sentiment['label']} – {conversation_sentiment['description']}", 
                  Colors.BOLD)
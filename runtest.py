@@ -1,8 +1,36 @@
 """Test file for chatbot - testing both sentiment analysis and chatbot responses."""
 
+import asyncio
+import json
+import logging
 import os
+import tempfile
+import threading
+import time
 import sentiment
 import chatbot
+from src.aggregates import SentimentRollup
+from src.batcher import MicroBatcher
+from src.cache import SentimentCache
+from src.deadline import LatencyBudget
+from src.event_log import EventLog, EventLogHandler, StageTimings
+from src.intent_index import IntentIndex
+from src.intent_model import MappedIntentModel, export_model
+from src.intent_training import IntentTrainer, intent_examples, history_examples
+from src.metrics import MetricsRegistry
+from src.sentiment_analyzer import SentimentAnalyzer
+from src.conversation_manager import ConversationManager
+from src.chatbot import Chatbot
+from src.preprocess import PreprocessedMessage
+from src.journal import ConversationJournal, load_conversation
+from src.session_registry import SessionRegistry
+from src.sqlite_store import SQLiteConversationStore
+from src import workers
+from src.workers import create_executor
+from benchmarks.corpus import generate_corpus
+from batch_score import score_file
+from server import ChatServer
+from config import SENTIMENT_METHOD, INTENTS_FILE
 
 
 def test_sentiment_analysis():
@@ -144,6 +172,961 @@ def test_sentiment_edge_cases():
     return passed, failed
 
 
+def test_batch_analysis():
+    """Test batch sentiment matches per-message results"""
+    print("\n" + "="*60)
+    print("TESTING BATCH ANALYSIS")
+    print("="*60)
+    
+    texts = [
+        "I love this service!",
+        "",
+        "This is terrible and awful",
+        "I love this service!",
+        "The service is okay"
+    ]
+    
+    results1 = sentiment.get_sentiment_batch(texts)
+    test1 = results1 == [sentiment.get_sentiment(text) for text in texts]
+    print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Batch labels match single calls")
+    
+    conversations = [
+        ["I'm very happy!", "Great service!"],
+        [],
+        ["This is bad", "Terrible experience"]
+    ]
+    results2 = sentiment.analyze_conversation_batch(conversations)
+    test2 = results2 == [sentiment.analyze_conversation(msgs) for msgs in conversations]
+    print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: Batch conversations match single calls")
+    
+    passed = sum([test1, test2])
+    failed = 2 - passed
+    
+    print(f"\nBatch Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_sentiment_cache():
+    """Test cached analysis counters and eviction"""
+    print("\n" + "="*60)
+    print("TESTING SENTIMENT CACHE")
+    print("="*60)
+    
+    cache = SentimentCache(capacity=2)
+    analyzer = SentimentAnalyzer(cache=cache)
+    
+    first = analyzer.analyze_message("thanks")
+    second = analyzer.analyze_message("  thanks ")
+    test1 = first == second and cache.hits == 1 and cache.misses == 1
+    print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Repeated message served from cache")
+    
+    analyzer.analyze_message("ok")
+    analyzer.analyze_message("hi")
+    test2 = cache.evictions == 1 and cache.stats()['size'] == 2
+    print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: Least recently used entry evicted")
+    
+    analyzer.analyze_message("hi")['label'] = 'Changed'
+    test3 = analyzer.analyze_message("hi")['label'] != 'Changed'
+    print(f"[{'PASS' if test3 else 'FAIL'}] Test 3: Cached results are isolated copies")
+    
+    shared = SentimentCache()
+    plain = SentimentAnalyzer(cache=shared, neutral_prefilter=False, long_text=False)
+    plain.analyze_message("thanks")
+    SentimentAnalyzer(cache=shared, neutral_prefilter=True, long_text=False).analyze_message("thanks")
+    SentimentAnalyzer(cache=shared, neutral_prefilter=False, long_text=True).analyze_message("thanks")
+    plain.analyze_message("thanks")
+    test4 = shared.misses == 3 and shared.hits == 1
+    print(f"[{'PASS' if test4 else 'FAIL'}] Test 4: Analyzers with different settings keep separate entries")
+    
+    shared.put(plain.cache_key, "long", {'score': 0.5, 'label': 'Positive', 'sentences': [{'label': 'Positive'}]})
+    served = shared.get(plain.cache_key, "long")
+    served['sentences'][0]['label'] = 'Changed'
+    served['sentences'].append({'label': 'Negative'})
+    test5 = shared.get(plain.cache_key, "long")['sentences'] == [{'label': 'Positive'}]
+    print(f"[{'PASS' if test5 else 'FAIL'}] Test 5: Nested sentence results are copied too")
+    
+    passed = sum([test1, test2, test3, test4, test5])
+    failed = 5 - passed
+    
+    print(f"\nCache Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_running_summary():
+    """Test incremental conversation summary matches full re-analysis"""
+    print("\n" + "="*60)
+    print("TESTING RUNNING SUMMARY")
+    print("="*60)
+    
+    analyzer = SentimentAnalyzer()
+    conversation = ConversationManager()
+    messages = ["This is bad", "Not satisfied", "It works fine", "Great service!", "Excellent work!"]
+    
+    test1 = conversation.get_sentiment_summary() == analyzer.analyze_conversation([])
+    print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Empty summary")
+    
+    test2 = True
+    for i, text in enumerate(messages, 1):
+        conversation.add_message('user', text, analyzer.analyze_message(text))
+        conversation.add_message('bot', "I see.")
+        running = conversation.get_sentiment_summary()
+        full = analyzer.analyze_conversation(messages[:i])
+        test2 = test2 and abs(running.pop('score') - full.pop('score')) < 1e-9 and running == full
+    print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: Summary matches re-analysis after every turn")
+    
+    passed = sum([test1, test2])
+    failed = 2 - passed
+    
+    print(f"\nRunning Summary Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_keyword_rules():
+    """Test keyword rule priority and word boundaries"""
+    print("\n" + "="*60)
+    print("TESTING KEYWORD RULES")
+    print("="*60)
+    
+    bot = Chatbot()
+    test_cases = [
+        ("Goodbye and bye", "Neutral", "See you later! Feel free to come back anytime."),
+        ("bye for now", "Neutral", "Goodbye! Have a great day!"),
+        ("Hey there, see you", "Neutral", "See you later! Feel free to come back anytime."),
+        ("Hi!", "Neutral", "Hi there! What's on your mind?"),
+        ("This is nothing special", "Neutral", "I see. Tell me more about that."),
+        ("Thanks a lot", "Positive", "You're welcome!")
+    ]
+    
+    passed = 0
+    failed = 0
+    
+    for i, (text, label, expected) in enumerate(test_cases, 1):
+        actual = bot.generate_response(text, label)
+        if actual == expected:
+            print(f"[PASS] Test {i}: '{text}' -> '{actual}'")
+            passed += 1
+        else:
+            print(f"[FAIL] Test {i}: '{text}' -> Expected: '{expected}', Got: '{actual}'")
+            failed += 1
+    
+    print(f"\nKeyword Rule Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_conversation_journal():
+    """Test journaled conversations rebuild exactly"""
+    print("\n" + "="*60)
+    print("TESTING CONVERSATION JOURNAL")
+    print("="*60)
+    
+    analyzer = SentimentAnalyzer()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'session.jsonl')
+        with ConversationJournal(path) as journal:
+            conversation = ConversationManager(journal=journal)
+            conversation.add_message('user', "This is bad", analyzer.analyze_message("This is bad"))
+            conversation.clear()
+            for text in ["Great service!", "Not satisfied"]:
+                conversation.add_message('user', text, analyzer.analyze_message(text))
+                conversation.add_message('bot', "I see.")
+        
+        with open(path, 'a') as f:
+            f.write('{"type": "message", "mess')
+        restored = load_conversation(path)
+        
+        # Resume after the crash: new records must not merge into the torn line
+        with ConversationJournal(path) as journal:
+            resumed = load_conversation(path, journal=journal)
+            resumed.add_message('user', "Back again", analyzer.analyze_message("Back again"))
+            resumed.add_message('bot', "Welcome back.")
+        reloaded = load_conversation(path)
+    
+    test1 = restored.get_all_messages() == conversation.get_all_messages()
+    print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Messages restored after clear and torn write")
+    
+    test2 = (restored.start_time == conversation.start_time and
+             restored.get_sentiment_summary() == conversation.get_sentiment_summary())
+    print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: Start time and running summary restored")
+    
+    test3 = reloaded.get_all_messages() == resumed.get_all_messages() and len(reloaded.get_all_messages()) == 6
+    print(f"[{'PASS' if test3 else 'FAIL'}] Test 3: Records appended after a torn write survive a reload")
+    
+    passed = sum([test1, test2, test3])
+    failed = 3 - passed
+    
+    print(f"\nJournal Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_compact_storage():
+    """Test compact message storage materializes the same messages"""
+    print("\n" + "="*60)
+    print("TESTING COMPACT STORAGE")
+    print("="*60)
+    
+    analyzer = SentimentAnalyzer()
+    regular = ConversationManager()
+    compact = ConversationManager(compact=True)
+    for text in ["Hello there", "This is terrible", "12345"]:
+        sentiment = analyzer.analyze_message(text)
+        for conversation in (regular, compact):
+            conversation.add_message('user', text, sentiment)
+            conversation.add_message('bot', "I see.")
+    
+    for message in regular.get_all_messages():
+        message.pop('timestamp')
+    compact_messages = compact.get_all_messages()
+    test1 = all('timestamp' in message for message in compact_messages)
+    for message in compact_messages:
+        message.pop('timestamp')
+    test1 = test1 and compact_messages == regular.get_all_messages()
+    print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Materialized messages match dict storage")
+    
+    test2 = (compact.get_user_messages() == regular.get_user_messages() and
+             compact.get_sentiment_summary() == regular.get_sentiment_summary())
+    print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: User messages and summary match")
+    
+    passed = sum([test1, test2])
+    failed = 2 - passed
+    
+    print(f"\nCompact Storage Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_session_registry():
+    """Test sessions spill to disk and restore transparently"""
+    print("\n" + "="*60)
+    print("TESTING SESSION REGISTRY")
+    print("="*60)
+    
+    analyzer = SentimentAnalyzer()
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = SessionRegistry(spill_dir=tmp, max_sessions=2, idle_ttl=None)
+        for session_id in ['alice', 'bob', 'carol']:
+            text = f"Hello, I am {session_id}"
+            registry.add_message(session_id, 'user', text, analyzer.analyze_message(text))
+        
+        test1 = len(registry) == 2 and registry.stats()['evictions'] == 1
+        print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Least recently used session spilled")
+        
+        restored = registry.get('alice')
+        test2 = (restored.get_user_messages() == ["Hello, I am alice"] and
+                 registry.stats()['restores'] == 1 and len(registry) == 2)
+        print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: Spilled session restored on next access")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = SessionRegistry(spill_dir=tmp, max_sessions=None, max_messages=3, idle_ttl=60)
+        for session_id in ['alice', 'alice', 'bob', 'bob', 'carol']:
+            registry.add_message(session_id, 'user', "Hi", None)
+        resident = sum(len(conversation.messages) for conversation, _ in registry._sessions.values())
+        test3 = ('alice' not in registry._sessions and registry.stats()['resident_messages'] == resident == 3)
+        print(f"[{'PASS' if test3 else 'FAIL'}] Test 3: Message budget tracked by a running count")
+        
+        # Saving 'bob' fails while a directory sits at its spill path
+        os.makedirs(registry._spill_path('bob'))
+        last_access = registry._sessions['bob'][1]
+        logging.disable(logging.ERROR)
+        try:
+            first = registry.evict_idle(last_access + 120)
+            kept = 'bob' in registry._sessions and registry._sessions['bob'][1] == last_access
+        finally:
+            logging.disable(logging.NOTSET)
+        os.rmdir(registry._spill_path('bob'))
+        test4 = first == 1 and kept and registry.evict_idle(last_access + 120) == 1 and len(registry) == 0
+        print(f"[{'PASS' if test4 else 'FAIL'}] Test 4: Failed spill keeps the session's age, so it is evicted later")
+    
+    passed = sum([test1, test2, test3, test4])
+    failed = 4 - passed
+    
+    print(f"\nSession Registry Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_sqlite_store():
+    """Test SQLite saves incrementally and answers label queries"""
+    print("\n" + "="*60)
+    print("TESTING SQLITE STORE")
+    print("="*60)
+    
+    analyzer = SentimentAnalyzer()
+    conversation = ConversationManager()
+    with tempfile.TemporaryDirectory() as tmp:
+        with SQLiteConversationStore(os.path.join(tmp, 'conversations.db')) as store:
+            inserted = 0
+            for text in ["I love this service!", "This is terrible and awful", "The service is okay"]:
+                conversation.add_message('user', text, analyzer.analyze_message(text))
+                conversation.add_message('bot', "I see.")
+                inserted += store.save_conversation(conversation, 'session-1')
+            
+            test1 = inserted == 6
+            print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Repeated saves insert only new messages")
+            
+            test2 = store.label_counts() == {'Positive': 1, 'Negative': 1, 'Neutral': 1}
+            print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: Label counts -> {store.label_counts()}")
+            
+            restored = store.load_conversation('session-1')
+            test3 = restored.get_all_messages() == conversation.get_all_messages()
+            print(f"[{'PASS' if test3 else 'FAIL'}] Test 3: Conversation round trip")
+    
+    passed = sum([test1, test2, test3])
+    failed = 3 - passed
+    
+    print(f"\nSQLite Store Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_textblob_scorer():
+    """Test the pattern lexicon scorer matches TextBlob objects"""
+    print("\n" + "="*60)
+    print("TESTING TEXTBLOB LEXICON SCORER")
+    print("="*60)
+    
+    blob = SentimentAnalyzer(method='textblob', fast_textblob=False)
+    fast = SentimentAnalyzer(method='textblob', fast_textblob=True)
+    corpus = generate_corpus(300) + [
+        "I'm not very happy :(",
+        "This isn't good (!)",
+        "Really not good, terribly slow...",
+        "very very good!!",
+        "Mr. Smith said \"awesome\" :-)",
+        ""
+    ]
+    
+    worst = 0.0
+    for text in corpus:
+        expected = blob.analyze_message(text)
+        actual = fast.analyze_message(text)
+        worst = max(worst, abs(expected['score'] - actual['score']),
+                    abs(expected['detailed_scores']['subjectivity'] - actual['detailed_scores']['subjectivity']))
+    test1 = worst < 1e-9
+    print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Matches TextBlob over {len(corpus)} messages (max diff {worst:.1e})")
+    
+    results = fast.analyze_batch(["not bad", "not bad", "awful"])
+    test2 = results[0] == fast.analyze_message("not bad") and results[2]['label'] == 'Negative'
+    print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: Batch scoring uses the lexicon scorer")
+    
+    passed = sum([test1, test2])
+    failed = 2 - passed
+    
+    print(f"\nTextBlob Scorer Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_neutral_prefilter():
+    """Test the neutral pre-filter skips VADER without changing results"""
+    print("\n" + "="*60)
+    print("TESTING NEUTRAL PRE-FILTER")
+    print("="*60)
+    
+    filtered = SentimentAnalyzer(neutral_prefilter=True)
+    full = SentimentAnalyzer(neutral_prefilter=False)
+    corpus = generate_corpus(300) + ["12345", "order 99812 ...", "", "ok!", "not", "😀", "kind of"]
+    
+    mismatches = [text for text in corpus if filtered.analyze_message(text) != full.analyze_message(text)]
+    test1 = not mismatches
+    print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Same results as a full VADER pass ({len(mismatches)} mismatches)")
+    
+    stats = filtered.prefilter.stats()
+    test2 = stats['skipped'] > 0 and stats['skipped'] + stats['passed'] == len(corpus)
+    print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: Counters -> {stats['skipped']} skipped, {stats['passed']} passed")
+    
+    before = filtered.prefilter.stats()['skipped']
+    result = filtered.analyze_message("12345")
+    test3 = filtered.prefilter.stats()['skipped'] == before + 1 and result['label'] == 'Neutral'
+    print(f"[{'PASS' if test3 else 'FAIL'}] Test 3: Order number short-circuits to Neutral")
+    
+    passed = sum([test1, test2, test3])
+    failed = 3 - passed
+    
+    print(f"\nPre-filter Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_long_text():
+    """Test sentence-chunked scoring of long messages"""
+    print("\n" + "="*60)
+    print("TESTING LONG-TEXT MODE")
+    print("="*60)
+    
+    analyzer = SentimentAnalyzer(long_text=True)
+    text = ("I love this service! " * 20) + "\n" + ("This is terrible and awful. " * 20)
+    with create_executor('thread', 2) as executor:
+        result = analyzer.analyze_long_text(text, executor=executor, chunks=2)
+    
+    test1 = len(result['sentences']) == 40 and result['sentences'][0]['label'] == 'Positive' \
+        and result['sentences'][-1]['label'] == 'Negative'
+    print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Per-sentence scores in order ({len(result['sentences'])} sentences)")
+    
+    inline = analyzer.analyze_long_text(text, chunks=1)
+    test2 = abs(result['score'] - inline['score']) < 1e-12 and set(result) >= {'score', 'label', 'detailed_scores'}
+    print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: Parallel and inline aggregates agree -> {result['label']}")
+    
+    test3 = 'sentences' not in analyzer.analyze_message("I love this service!")
+    print(f"[{'PASS' if test3 else 'FAIL'}] Test 3: Short messages keep the plain result")
+    
+    # One unpunctuated sentence over the threshold: scored inline, not split again
+    run_on = "I love this service " * 130
+    single = analyzer.analyze_message(run_on)
+    batched = analyzer.analyze_batch([run_on, "I love this service!"])
+    summary = analyzer.analyze_conversation([run_on])
+    test4 = ('sentences' in single and batched[0] == single and 'sentences' not in batched[1]
+             and summary['score'] == single['score'])
+    print(f"[{'PASS' if test4 else 'FAIL'}] Test 4: Batch and conversation take the same long-text path")
+    
+    slow = SentimentAnalyzer(method='textblob', fast_textblob=False, long_text=True)
+    doubled = text + "\n" + text
+    with create_executor('thread', 2) as executor:
+        pooled = slow.analyze_long_text(doubled, executor=executor, chunks=2)
+    worker = workers._worker_analyzers.get(('textblob', False, slow.neutral_prefilter))
+    test5 = (worker is not None and not worker.fast_textblob
+             and abs(pooled['score'] - slow.analyze_long_text(doubled, chunks=1)['score']) < 1e-12)
+    print(f"[{'PASS' if test5 else 'FAIL'}] Test 5: Workers score with the caller's scorer settings")
+    
+    passed = sum([test1, test2, test3, test4, test5])
+    failed = 5 - passed
+    
+    print(f"\nLong-Text Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_sentiment_rollup():
+    """Test the cross-session sliding-window rollup"""
+    print("\n" + "="*60)
+    print("TESTING SENTIMENT ROLLUP")
+    print("="*60)
+    
+    alerts = []
+    rollup = SentimentRollup(bucket_seconds=60, buckets=10, alert_min_messages=5, on_alert=alerts.append)
+    analyzer = SentimentAnalyzer()
+    for session in range(3):
+        conversation = ConversationManager(rollup=rollup)
+        for text in ["I love this service!", "Thanks, that fixed it!"]:
+            conversation.add_message('user', text, analyzer.analyze_message(text))
+            conversation.add_message('bot', "Glad to hear it.")
+    
+    snapshot = rollup.snapshot(window_seconds=300)
+    test1 = snapshot['messages'] == 6 and snapshot['shares']['Positive'] == 1.0
+    print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Messages from every session counted -> {snapshot['counts']}")
+    
+    now = time.time()
+    for offset in range(20):
+        rollup.add(-0.8, timestamp=now + offset)
+    test2 = bool(alerts) and alerts[0]['direction'] == 'declining' and rollup.snapshot()['trend'] == 'declining'
+    print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: Change-point alert on a negative swing")
+    
+    later = rollup.snapshot(window_seconds=60, now=now + 3600)
+    test3 = later['messages'] == 0
+    print(f"[{'PASS' if test3 else 'FAIL'}] Test 3: Old buckets fall out of the window")
+    
+    seen = []
+    
+    def read_back(alert):
+        seen.append(reentrant.snapshot()['trend'])
+        reentrant.add(-0.8, timestamp=alert['since'])
+    
+    reentrant = SentimentRollup(bucket_seconds=60, buckets=10, alert_min_messages=5, on_alert=read_back)
+    feeder = threading.Thread(target=lambda: [reentrant.add(0.8 if offset < 10 else -0.8, timestamp=now + offset)
+                                              for offset in range(30)],
+                              daemon=True)
+    feeder.start()
+    feeder.join(5)
+    test4 = not feeder.is_alive() and seen == ['declining']
+    print(f"[{'PASS' if test4 else 'FAIL'}] Test 4: Alert callback can read and feed the rollup")
+    
+    passed = sum([test1, test2, test3, test4])
+    failed = 4 - passed
+    
+    print(f"\nRollup Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_micro_batcher():
+    """Test concurrent calls are coalesced into batches"""
+    print("\n" + "="*60)
+    print("TESTING MICRO-BATCHER")
+    print("="*60)
+    
+    batch_sizes = []
+    
+    def double_all(items):
+        batch_sizes.append(len(items))
+        return [item * 2 for item in items]
+    
+    batcher = MicroBatcher(double_all, max_batch=8, max_wait=0.05)
+    with create_executor('thread', 16) as executor:
+        results = list(executor.map(batcher, range(32)))
+    stats = batcher.stats()
+    
+    test1 = results == [i * 2 for i in range(32)]
+    print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Results fanned back to the right callers")
+    
+    test2 = max(batch_sizes) <= 8 and stats['batches'] < 32 and stats['items'] == 32
+    print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: {stats['items']} calls in {stats['batches']} batches "
+          f"(mean {stats['mean_batch_size']:.1f}, wait {stats['mean_wait_ms']:.1f} ms)")
+    batcher.close()
+    
+    failing = MicroBatcher(lambda items: 1 / 0, max_wait=0.001)
+    try:
+        failing('x')
+        test3 = False
+    except ZeroDivisionError:
+        test3 = True
+    failing.close()
+    print(f"[{'PASS' if test3 else 'FAIL'}] Test 3: Batch errors reach every caller")
+    
+    passed = sum([test1, test2, test3])
+    failed = 3 - passed
+    
+    print(f"\nMicro-Batcher Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_preprocessed_message():
+    """Test one preprocessed message feeds every stage"""
+    print("\n" + "="*60)
+    print("TESTING PREPROCESSED MESSAGE")
+    print("="*60)
+    
+    message = PreprocessedMessage("  Hello   there, I LOVE it!  ")
+    test1 = (message.normalized == "Hello there, I LOVE it!" and message.tokens == ['hello', 'there', 'i', 'love', 'it']
+             and message.digest == PreprocessedMessage("Hello there, I LOVE it!").digest)
+    print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Normalized text, tokens and stable content hash")
+    
+    cache = SentimentCache()
+    analyzer = SentimentAnalyzer(cache=cache)
+    first = analyzer.analyze_message(message)
+    second = analyzer.analyze_message("Hello there, I LOVE it!")
+    test2 = first == second and cache.hits == 1
+    print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: Message and plain text share a cache entry")
+    
+    bot = Chatbot()
+    test3 = all(bot.generate_response(PreprocessedMessage(text), 'Neutral') == bot.generate_response(text, 'Neutral')
+                for text in ["hello there", "goodbye!", "this is fine"])
+    print(f"[{'PASS' if test3 else 'FAIL'}] Test 3: Chatbot responses match for messages and plain text")
+    
+    passed = sum([test1, test2, test3])
+    failed = 3 - passed
+    
+    print(f"\nPreprocessed Message Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_intent_training():
+    """Test hashed intent training and incremental updates"""
+    print("\n" + "="*60)
+    print("TESTING INTENT TRAINING")
+    print("="*60)
+    
+    examples = intent_examples('intents.json')
+    with tempfile.TemporaryDirectory() as tmp:
+        full_path = os.path.join(tmp, 'full.bin')
+        trainer = IntentTrainer()
+        trainer.partial_fit(examples)
+        size = trainer.save(full_path)
+        model = MappedIntentModel(full_path)
+        test1 = all(model.predict_one(text) == tag for text, tag in examples)
+        test2 = model.n_features == trainer.n_features and model.header['n_terms'] == 0 and size > 0
+        model.close()
+        print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Trained model predicts every intent pattern")
+        print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: Model stores hashed features, no vocabulary")
+        
+        update_path = os.path.join(tmp, 'update.bin')
+        first = IntentTrainer()
+        first.partial_fit(examples[:10])
+        first.save(update_path)
+        resumed = IntentTrainer.load(update_path)
+        resumed.partial_fit(examples[10:])
+        resumed.save(update_path)
+        with open(full_path, 'rb') as f, open(update_path, 'rb') as g:
+            test3 = f.read() == g.read()
+        print(f"[{'PASS' if test3 else 'FAIL'}] Test 3: Incremental update equals a full retrain")
+        
+        history_path = os.path.join(tmp, 'history.json')
+        positive = {'score': 0.6, 'label': 'Positive', 'detailed_scores': {}}
+        with open(history_path, 'w') as f:
+            json.dump({'messages': [
+                {'sender': 'user', 'text': 'hi there', 'timestamp': '', 'sentiment': positive},
+                {'sender': 'user', 'text': 'thanks a bunch', 'timestamp': '', 'sentiment': positive, 'intent': 'thanks'},
+                {'sender': 'bot', 'text': 'You are welcome', 'timestamp': '', 'sentiment': None, 'intent': 'thanks'}
+            ]}, f)
+        test4 = history_examples(history_path, {tag for _, tag in examples}) == [('thanks a bunch', 'thanks')]
+        print(f"[{'PASS' if test4 else 'FAIL'}] Test 4: History uses explicit intent labels only, never sentiment")
+        
+        # A conversation saved the way main.py saves it, with no intent fields
+        analyzer = SentimentAnalyzer()
+        conversation = ConversationManager()
+        for text in ["Hello!", "I love this service", "thank you", "my refund is late"]:
+            conversation.add_message('user', text, analyzer.analyze_message(text))
+            conversation.add_message('bot', "Thank you for sharing.")
+        saved_path = os.path.join(tmp, 'conversation_history.json')
+        conversation.save_to_file(saved_path)
+        tags = {tag for _, tag in examples}
+        labeled = history_examples(saved_path, tags, IntentIndex.from_file(INTENTS_FILE))
+        history_trainer = IntentTrainer()
+        history_trainer.partial_fit(examples + labeled)
+        test5 = (labeled == [("Hello!", 'greeting'), ("thank you", 'thanks')]
+                 and history_trainer.examples == len(examples) + 2)
+        print(f"[{'PASS' if test5 else 'FAIL'}] Test 5: Saved conversations labeled by pattern similarity -> {labeled}")
+    
+    passed = sum([test1, test2, test3, test4, test5])
+    failed = 5 - passed
+    
+    print(f"\nIntent Training Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_intent_model_export():
+    """Test mapped models predict exactly as the scikit-learn models they came from"""
+    print("\n" + "="*60)
+    print("TESTING INTENT MODEL EXPORT")
+    print("="*60)
+    
+    try:
+        from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+        from sklearn.linear_model import LogisticRegression
+        from sklearn.naive_bayes import MultinomialNB
+    except ImportError:
+        print("[SKIP] scikit-learn is not installed")
+        return 0, 0
+    
+    examples = intent_examples(INTENTS_FILE)
+    texts = [text for text, _ in examples]
+    tags = [tag for _, tag in examples]
+    queries = texts + ["hello, is my refund through yet?", "THANKS so much!!", "zzz qqq", "",
+                       "what can you do for me", "see you later, bye"]
+    pairs = [
+        ("TF-IDF + logistic regression", TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True),
+         LogisticRegression(max_iter=1000)),
+        ("Counts + Naive Bayes", CountVectorizer(stop_words='english'), MultinomialNB())
+    ]
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for number, (name, vectorizer, classifier) in enumerate(pairs, 1):
+            classifier.fit(vectorizer.fit_transform(texts), tags)
+            path = os.path.join(tmp, f'model{number}.bin')
+            export_model(classifier, vectorizer, path)
+            mapped = MappedIntentModel(path)
+            try:
+                expected = classifier.predict(vectorizer.transform(queries)).tolist()
+                matrix = vectorizer.transform(queries)
+                if hasattr(classifier, 'decision_function'):
+                    reference = classifier.decision_function(matrix)
+                else:
+                    reference = matrix @ classifier.feature_log_prob_.T + classifier.class_log_prior_
+                close = all(abs(a - b) < 1e-9 for query, row in zip(queries, reference.tolist())
+                            for a, b in zip(mapped.decision_function(query), row))
+                test = mapped.predict(queries) == expected and close
+            finally:
+                mapped.close()
+            results.append(test)
+            print(f"[{'PASS' if test else 'FAIL'}] Test {number}: {name} scores and predictions match")
+    
+    passed = sum(results)
+    failed = len(results) - passed
+    
+    print(f"\nIntent Model Export Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_metrics():
+    """Test latency histograms, counters and their exports"""
+    print("\n" + "="*60)
+    print("TESTING METRICS")
+    print("="*60)
+    
+    metrics = MetricsRegistry(enabled=True, buckets=(0.001, 0.01, 0.1), prefix='test')
+    for seconds in (0.0005, 0.001, 0.005, 0.5):
+        metrics.observe('sentiment', seconds)
+    with metrics.timer('response'):
+        pass
+    metrics.increment('turns')
+    metrics.increment('turns', 2)
+    snapshot = metrics.snapshot()
+    stage = snapshot['stages']['sentiment']
+    test1 = (stage['buckets'] == [[0.001, 2], [0.01, 3], [0.1, 3], ['+Inf', 4]] and stage['count'] == 4
+             and abs(stage['sum_seconds'] - 0.5065) < 1e-12 and abs(stage['mean_seconds'] - 0.5065 / 4) < 1e-12)
+    print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Cumulative buckets, bounds inclusive, with sum and mean")
+    
+    test2 = (snapshot['stages']['response']['count'] == 1 and snapshot['counters'] == {'turns': 3}
+             and json.loads(metrics.to_json()) == snapshot)
+    print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: Timer and counters recorded, JSON export round-trips")
+    
+    prometheus = metrics.to_prometheus().splitlines()
+    test3 = ('# TYPE test_stage_latency_seconds histogram' in prometheus
+             and 'test_stage_latency_seconds_bucket{stage="sentiment",le="0.001"} 2' in prometheus
+             and 'test_stage_latency_seconds_bucket{stage="sentiment",le="+Inf"} 4' in prometheus
+             and 'test_stage_latency_seconds_count{stage="sentiment"} 4' in prometheus
+             and prometheus[-2:] == ['# TYPE test_turns_total counter', 'test_turns_total 3'])
+    print(f"[{'PASS' if test3 else 'FAIL'}] Test 3: Prometheus exposition lines")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        prometheus_file, json_file = os.path.join(tmp, 'metrics.prom'), os.path.join(tmp, 'metrics.json')
+        metrics.write(prometheus_file, json_file)
+        with open(prometheus_file) as f, open(json_file) as g:
+            written = f.read() == metrics.to_prometheus() and g.read() == metrics.to_json()
+    metrics.reset()
+    disabled = MetricsRegistry(enabled=False)
+    with disabled.timer('sentiment'):
+        disabled.increment('turns')
+    test4 = (written and metrics.snapshot() == {'stages': {}, 'counters': {}}
+             and disabled.snapshot() == {'stages': {}, 'counters': {}})
+    print(f"[{'PASS' if test4 else 'FAIL'}] Test 4: Files written, reset clears, disabled registry records nothing")
+    
+    passed = sum([test1, test2, test3, test4])
+    failed = 4 - passed
+    
+    print(f"\nMetrics Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_event_log():
+    """Test the queued structured event log"""
+    print("\n" + "="*60)
+    print("TESTING EVENT LOG")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'chatbot.log')
+        event_log = EventLog(path, fmt='%(levelname)s %(message)s')
+        timings = StageTimings()
+        with timings.stage('sentiment'):
+            pass
+        event_log.event('turn', session='s1', sentiment='Positive', timings_ms=timings.ms)
+        logger = logging.getLogger('runtest.event_log')
+        logger.propagate = False
+        logger.addHandler(EventLogHandler(event_log))
+        logger.error("save failed: %s", "disk full")
+        event_log.close()
+        with open(path) as f:
+            lines = f.read().splitlines()
+        turn = json.loads(lines[0].split(' ', 1)[1])
+        test1 = (turn['event'] == 'turn' and turn['session'] == 's1' and 'sentiment' in turn['timings_ms']
+                 and lines[1] == "ERROR save failed: disk full")
+        print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Events and log records written as formatted lines")
+        
+        path = os.path.join(tmp, 'rotating.log')
+        event_log = EventLog(path, batch_size=4, max_bytes=500, backup_count=2)
+        for i in range(100):
+            event_log.event('turn', index=i)
+        event_log.close()
+        test2 = (os.path.exists(path + '.1') and os.path.exists(path + '.2') and not os.path.exists(path + '.3')
+                 and os.path.getsize(path) <= 500 and event_log.stats()['rotations'] > 0)
+        print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: Log rotates by size and keeps backup_count files")
+        
+        event_log = EventLog(os.path.join(tmp, 'small.log'), queue_size=1)
+        queued = sum(event_log.event('turn', index=i) for i in range(5000))
+        event_log.close()
+        stats = event_log.stats()
+        test3 = stats['dropped'] > 0 and stats['written'] == queued and queued + stats['dropped'] == 5000
+        print(f"[{'PASS' if test3 else 'FAIL'}] Test 3: Full queue drops and counts events instead of blocking")
+        
+        path = os.path.join(tmp, 'prepared.log')
+        event_log = EventLog(path, fmt='%(message)s')
+        handler = EventLogHandler(event_log)
+        logger.handlers = [handler]
+        items = ['first']
+        logger.error("items: %s", items)
+        items.append('later')
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logger.exception("scoring failed")
+        event_log.close()
+        with open(path) as f:
+            text = f.read()
+        test4 = text.startswith("items: ['first']\nscoring failed\nTraceback") and 'ZeroDivisionError' in text
+        print(f"[{'PASS' if test4 else 'FAIL'}] Test 4: Records are formatted when logged, tracebacks as text")
+    
+    passed = sum([test1, test2, test3, test4])
+    failed = 4 - passed
+    
+    print(f"\nEvent Log Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_intent_index():
+    """Test TF-IDF intent retrieval over intents.json patterns"""
+    print("\n" + "="*60)
+    print("TESTING INTENT INDEX")
+    print("="*60)
+    
+    index = IntentIndex.from_file('intents.json')
+    test1 = (index.search("Who are you?")[0][0] == 'identity' and index.match("see you later")[0] == 'goodbye'
+             and index.match("Thank you so much")[0] == 'thanks')
+    print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Messages retrieve their intent")
+    
+    ranked = index.search("Thanks for your help", k=2)
+    test2 = (len(ranked) == 2 and ranked[0][1] >= ranked[1][1] and index.match("what is the weather") is None
+             and index.search("zzz qqq") == [])
+    print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: Top-k ranking and threshold fallback")
+    
+    test3 = True
+    if not (os.path.exists('intent_model.bin') or os.path.exists('chatbot_model.pkl')):
+        response = chatbot.get_response("Who are you?")
+        test3 = chatbot._intent_index is not None and response in chatbot._responses['identity']
+    print(f"[{'PASS' if test3 else 'FAIL'}] Test 3: get_response answers from the index without a model")
+    
+    passed = sum([test1, test2, test3])
+    failed = 3 - passed
+    
+    print(f"\nIntent Index Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_latency_budget():
+    """Test deadline-aware degradation of the turn pipeline"""
+    print("\n" + "="*60)
+    print("TESTING LATENCY BUDGET")
+    print("="*60)
+    
+    budget = LatencyBudget(budget_ms=50)
+    budget.observe('stage', 10.0)
+    warm = budget.project('stage') == 0.0
+    budget.observe('stage', 0.01)
+    budget.observe('stage', 0.1)
+    budget.observe('stage', 0.0)
+    deadline = budget.start()
+    test1 = (warm and abs(budget.project('stage') - 0.08) < 1e-9 and not budget.fits(deadline, 'stage')
+             and abs(budget.project('stage') - 0.064) < 1e-9 and budget.fits(deadline, 'stage', size=0))
+    print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Stage estimates rise on slow runs and decay when skipped")
+    
+    detailed = chatbot.get_response_detailed("Who are you?")
+    test2 = (detailed['response'] and detailed['path'] in ('model', 'index', 'rules') and detailed['fallbacks'] == []
+             and not detailed['deadline_exceeded'])
+    print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: Detailed response records the path that served it")
+    
+    saved = chatbot._budget, chatbot._sentiment_analyzer
+    try:
+        chatbot._budget = LatencyBudget(budget_ms=50)
+        chatbot._sentiment_analyzer = SentimentAnalyzer(method='textblob')
+        for stage in ('intent_predict', 'intent_search', 'sentiment.textblob'):
+            chatbot._budget.observe(stage, 1.0)
+            chatbot._budget.observe(stage, 1.0)
+        detailed = chatbot.get_response_detailed("Who are you?")
+        stats = chatbot.deadline_stats()
+        test3 = (detailed['path'] == 'rules' and detailed['sentiment_method'] == 'vader'
+                 and 'textblob' in detailed['fallbacks'] and len(detailed['fallbacks']) == 2
+                 and stats['turns'] == 1 and stats['fallback_rates']['textblob'] == 1.0)
+    finally:
+        chatbot._budget, chatbot._sentiment_analyzer = saved
+    print(f"[{'PASS' if test3 else 'FAIL'}] Test 3: Slow stages fall back to rules and VADER, and are counted")
+    
+    saved = chatbot._budget, chatbot._sentiment_analyzer
+    try:
+        chatbot._budget = LatencyBudget()
+        chatbot._sentiment_analyzer = SentimentAnalyzer(method='textblob')
+        for stage in ('intent_predict', 'intent_search', 'sentiment.textblob'):
+            chatbot._budget.observe(stage, 1.0)
+            chatbot._budget.observe(stage, 1.0)
+        detailed = chatbot.get_response_detailed("Who are you?")
+        test4 = (chatbot._budget.budget is None and detailed['fallbacks'] == []
+                 and detailed['path'] in ('model', 'index')
+                 and chatbot._budget.fits(chatbot._budget.start(), 'sentiment.textblob', size=10 ** 6))
+    finally:
+        chatbot._budget, chatbot._sentiment_analyzer = saved
+    print(f"[{'PASS' if test4 else 'FAIL'}] Test 4: No budget by default, so slow stages never fall back")
+    
+    passed = sum([test1, test2, test3, test4])
+    failed = 4 - passed
+    
+    print(f"\nLatency Budget Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+def test_batch_score():
+    """Test ordered batch scoring and checkpoint resume"""
+    print("\n" + "="*60)
+    print("TESTING BATCH SCORING")
+    print("="*60)
+    
+    texts = ["I love this!", "This is awful.", "It is a table."] * 3
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, 'messages.jsonl')
+        output_path = os.path.join(tmp, 'scores.jsonl')
+        with open(input_path, 'w') as f:
+            for index, text in enumerate(texts):
+                f.write(json.dumps({'text': text} if index % 2 else text) + '\n')
+            f.write('null\n42\n{"text": ["a"]}\n{"text": 42}\n')
+        
+        def run():
+            score_file(input_path, output_path, chunk_size=2, workers_count=1, report=None)
+            with open(output_path, 'rb') as f:
+                return f.read()
+        
+        expected = SentimentAnalyzer(method=SENTIMENT_METHOD).analyze_batch(texts + [''] * 4)
+        full = run()
+        results = [json.loads(line) for line in full.decode('utf-8').splitlines()]
+        test1 = results == expected and not os.path.exists(output_path + '.checkpoint')
+        print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: One result per record in input order, bad records scored as empty")
+        
+        # Crash after four records with a partial chunk written past the checkpoint
+        lines = full.splitlines(keepends=True)
+        head = b''.join(lines[:4])
+        with open(output_path, 'wb') as f:
+            f.write(head + lines[4][:10])
+        with open(output_path + '.checkpoint', 'w') as f:
+            json.dump({'records': 4, 'output_bytes': len(head)}, f)
+        test2 = run() == full
+        print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: Resume from a checkpoint matches a clean run")
+        
+        os.remove(output_path)
+        with open(output_path + '.checkpoint', 'w') as f:
+            json.dump({'records': 4, 'output_bytes': len(head)}, f)
+        test3 = run() == full
+        print(f"[{'PASS' if test3 else 'FAIL'}] Test 3: Missing output restarts instead of skipping records")
+    
+    passed = sum([test1, test2, test3])
+    failed = 3 - passed
+    
+    print(f"\nBatch Scoring Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
+async def _server_session(chat_server, lines):
+    """Send lines to a server on a free port and read replies until it hangs up."""
+    server = await chat_server.start('127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(b''.join(lines))
+        await writer.drain()
+        replies = []
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            replies.append(json.loads(line))
+        writer.close()
+        await writer.wait_closed()
+    return replies
+
+
+def test_chat_server():
+    """Test sessions over TCP end to end"""
+    print("\n" + "="*60)
+    print("TESTING CHAT SERVER")
+    print("="*60)
+    
+    with tempfile.TemporaryDirectory() as tmp, create_executor('thread', 2) as executor:
+        chat_server = ChatServer(executor, session_dir=tmp, max_line_bytes=1024)
+        replies = asyncio.run(_server_session(chat_server, [b"I love this!\n", b"\n", b"bye\n"]))
+        test1 = (len(replies) == 3 and 'session' in replies[0] and replies[1]['sentiment']['label'] == 'Positive'
+                 and replies[2]['saved'] == os.path.join(tmp, f"{replies[0]['session']}.json")
+                 and os.path.exists(replies[2]['saved']))
+        print(f"[{'PASS' if test1 else 'FAIL'}] Test 1: Turns answered and the session saved on exit")
+        
+        replies = asyncio.run(_server_session(chat_server, [b"Great help\n", b"x" * 1500 + b"\n"]))
+        test2 = (len(replies) == 3 and 'error' in replies[2] and replies[2]['saved']
+                 and os.path.exists(replies[2]['saved']) and chat_server.active_sessions == 0)
+        print(f"[{'PASS' if test2 else 'FAIL'}] Test 2: Oversized line gets an error reply and the session is saved")
+    
+    passed = sum([test1, test2])
+    failed = 2 - passed
+    
+    print(f"\nChat Server Tests: {passed} passed, {failed} failed")
+    return passed, failed
+
+
 def main():
     """Run all tests"""
     print("\n" + "="*70)
@@ -169,6 +1152,94 @@ def main():
     total_passed += p4
     total_failed += f4
     
+    p5, f5 = test_batch_analysis()
+    total_passed += p5
+    total_failed += f5
+    
+    p6, f6 = test_sentiment_cache()
+    total_passed += p6
+    total_failed += f6
+    
+    p7, f7 = test_running_summary()
+    total_passed += p7
+    total_failed += f7
+    
+    p8, f8 = test_keyword_rules()
+    total_passed += p8
+    total_failed += f8
+    
+    p9, f9 = test_conversation_journal()
+    total_passed += p9
+    total_failed += f9
+    
+    p10, f10 = test_compact_storage()
+    total_passed += p10
+    total_failed += f10
+    
+    p11, f11 = test_session_registry()
+    total_passed += p11
+    total_failed += f11
+    
+    p12, f12 = test_sqlite_store()
+    total_passed += p12
+    total_failed += f12
+    
+    p13, f13 = test_textblob_scorer()
+    total_passed += p13
+    total_failed += f13
+    
+    p14, f14 = test_neutral_prefilter()
+    total_passed += p14
+    total_failed += f14
+    
+    p15, f15 = test_long_text()
+    total_passed += p15
+    total_failed += f15
+    
+    p16, f16 = test_sentiment_rollup()
+    total_passed += p16
+    total_failed += f16
+    
+    p17, f17 = test_micro_batcher()
+    total_passed += p17
+    total_failed += f17
+    
+    p18, f18 = test_preprocessed_message()
+    total_passed += p18
+    total_failed += f18
+    
+    p19, f19 = test_intent_training()
+    total_passed += p19
+    total_failed += f19
+    
+    p20, f20 = test_event_log()
+    total_passed += p20
+    total_failed += f20
+    
+    p21, f21 = test_intent_index()
+    total_passed += p21
+    total_failed += f21
+    
+    p22, f22 = test_latency_budget()
+    total_passed += p22
+    total_failed += f22
+    
+    p23, f23 = test_chat_server()
+    total_passed += p23
+    total_failed += f23
+    
+    p24, f24 = test_batch_score()
+    total_passed += p24
+    total_failed += f24
+    
+    p25, f25 = test_intent_model_export()
+    total_passed += p25
+    total_failed += f25
+    
+    p26, f26 = test_metrics()
+    total_passed += p26
+    total_failed += f26
+    
    
     
     print("\n" + "="*70)
@@ -1,9 +1,27 @@
-"""Sentiment analysis wrapper for test compatibility."""
+"""Sentiment analysis wrapper for test compatibility.
 
-from src.sentiment_analyzer import SentimentAnalyzer
+The analyzer is created on first use; call warmup() to load it up front.
+"""
+
+from src.sentiment_analyzer import SentimentAnalyzer, label_for_score
+from src.cache import get_shared_cache
+from src.metrics import get_metrics
+
+_analyzer = None
+
+
+def _get_analyzer():
+    """Get the sentiment analyzer, creating it on first use."""
+    global _analyzer
+    if _analyzer is None:
+        _analyzer = SentimentAnalyzer(cache=get_shared_cache())
+    return _analyzer
+
+
+def warmup():
+    """Load the sentiment backend now instead of on the first call."""
+    _get_analyzer().warmup()
 
-# Initialize the sentiment analyzer
-_analyzer = SentimentAnalyzer()
 
 def get_sentiment(text):
     """
@@ -18,9 +36,27 @@ def get_sentiment(text):
     if not text:
         return {'sentiment': 'Neutral'}
     
-    result = _analyzer.analyze_message(text)
+    with get_metrics().timer('sentiment'):
+        result = _get_analyzer().analyze_message(text)
     return {'sentiment': result['label']}
 
+def get_sentiment_batch(texts):
+    """
+    Get sentiment analysis for many texts in one call.
+    
+    Args:
+        texts (list): Texts to analyze
+        
+    Returns:
+        list: One dict with 'sentiment' key per text, in input order
+    """
+    texts = list(texts)
+    non_empty = [text for text in texts if text]
+    with get_metrics().timer('sentiment_batch'):
+        results = _get_analyzer().analyze_batch(non_empty)
+    labels = iter([result['label'] for result in results])
+    return [{'sentiment': next(labels) if text else 'Neutral'} for text in texts]
+
 def analyze_conversation(messages):
     """
     Analyze overall conversation sentiment.
@@ -34,5 +70,34 @@ def analyze_conversation(messages):
     if not messages:
         return None
     
-    result = _analyzer.analyze_conversation(messages)
-    return {'sentiment': result['label']}
\ No newline at end of file
+    with get_metrics().timer('conversation'):
+        result = _get_analyzer().analyze_conversation(messages)
+    return {'sentiment': result['label']}
+
+def analyze_conversation_batch(conversations):
+    """
+    Analyze overall sentiment of many conversations in one call.
+    
+    All messages across the conversations are scored as a single batch.
+    
+    Args:
+        conversations (list): List of message lists
+        
+    Returns:
+        list: One result per conversation, None for empty ones
+    """
+    conversations = [list(messages) for messages in conversations]
+    all_messages = [msg for messages in conversations for msg in messages]
+    with get_metrics().timer('conversation_batch'):
+        results = _get_analyzer().analyze_batch(all_messages)
+    scores = iter([result['score'] for result in results])
+    
+    results = []
+    for messages in conversations:
+        if not messages:
+            results.append(None)
+            continue
+        conversation_scores = [next(scores) for _ in messages]
+        avg_score = sum(conversation_scores) / len(conversation_scores)
+        results.append({'sentiment': label_for_score(avg_score)})
+    return results
@@ -0,0 +1,194 @@
+"""Asyncio server that hosts many concurrent chatbot sessions.
+
+Protocol (line-delimited JSON over TCP):
+    - Each connection is one session. On connect the server sends
+      {"session": "<id>", "message": "<welcome text>"}.
+    - The client sends one UTF-8 message per line. Each is answered with
+      {"sentiment": {...}, "response": "..."}.
+    - An exit command (or closing the connection) ends the session. The
+      server replies with {"summary": {...}, "saved": "<path>"} and closes.
+    - A line longer than SERVER_MAX_LINE_BYTES also ends the session; the
+      reply carries an extra "error" field.
+
+Sentiment scoring runs on a thread or process pool so the event loop
+never blocks on it.
+
+Usage:
+    python server.py [--host HOST] [--port PORT] [--executor thread|process] [--workers N]
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import os
+import uuid
+from src.chatbot import Chatbot
+from src.conversation_manager import ConversationManager
+from src.preprocess import PreprocessedMessage
+from src.event_log import StageTimings, log_turn
+from src import workers
+from config import (
+    EXIT_COMMANDS,
+    SENTIMENT_METHOD,
+    SERVER_HOST,
+    SERVER_PORT,
+    SERVER_EXECUTOR,
+    SERVER_WORKERS,
+    SERVER_MAX_LINE_BYTES,
+    SESSION_DIR
+)
+
+
+class ChatServer:
+    """Serves chatbot sessions over line-delimited TCP."""
+
+    def __init__(self, executor, method=SENTIMENT_METHOD, session_dir=SESSION_DIR,
+                 max_line_bytes=SERVER_MAX_LINE_BYTES):
+        """
+        Initialize the server.
+
+        Args:
+            executor (Executor): Pool that runs sentiment scoring
+            method (str): Sentiment method, 'vader' or 'textblob'
+            session_dir (str): Directory for saved session histories
+            max_line_bytes (int): Longest message line accepted
+        """
+        self.executor = executor
+        self.method = method
+        self.session_dir = session_dir
+        self.max_line_bytes = max_line_bytes
+        self.chatbot = Chatbot()
+        self.active_sessions = 0
+        self.completed_sessions = 0
+
+    async def _score(self, func, *args):
+        """Run a sentiment function on the executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, method=self.method))
+
+    async def _send(self, writer, payload):
+        """Write one JSON line to the client."""
+        writer.write(json.dumps(payload).encode('utf-8') + b'\n')
+        await writer.drain()
+
+    async def handle_turn(self, conversation, user_input, session_id=None):
+        """
+        Run one turn of the sentiment -> response pipeline.
+
+        Args:
+            conversation (ConversationManager): The session's history
+            user_input (str): User message
+            session_id (str, optional): Session identifier for the turn event log
+
+        Returns:
+            dict: Sentiment result and bot response
+        """
+        timings = StageTimings()
+        message = PreprocessedMessage(user_input)
+        with timings.stage('sentiment'):
+            sentiment = await self._score(workers.analyze_message, user_input)
+        with timings.stage('persistence'):
+            conversation.add_message('user', user_input, sentiment)
+
+        with timings.stage('response'):
+            bot_response = self.chatbot.generate_response(message, sentiment['label'])
+        with timings.stage('persistence'):
+            conversation.add_message('bot', bot_response)
+        log_turn(session_id, timings, sentiment=sentiment, path='rules')
+        return {'sentiment': sentiment, 'response': bot_response}
+
+    async def end_session(self, session_id, conversation):
+        """
+        Summarize and save a finished session.
+
+        Returns:
+            dict: Conversation summary and the saved file path, or None
+        """
+        if not conversation.get_all_messages():
+            return {'summary': None, 'saved': None}
+
+        summary = await self._score(workers.analyze_conversation, conversation.get_user_messages())
+        filename = os.path.join(self.session_dir, f"{session_id}.json")
+        loop = asyncio.get_running_loop()
+        saved = await loop.run_in_executor(None, conversation.save_to_file, filename)
+        return {'summary': summary, 'saved': filename if saved else None}
+
+    async def handle_client(self, reader, writer):
+        """Serve one session for the lifetime of a connection."""
+        session_id = uuid.uuid4().hex
+        conversation = ConversationManager()
+        self.active_sessions += 1
+        try:
+            await self._send(writer, {'session': session_id, 'message': self.chatbot.get_welcome_message()})
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # The line outgrew the stream limit; its rest can't be framed
+                    reply = await self.end_session(session_id, conversation)
+                    reply['error'] = f"Message longer than {self.max_line_bytes} bytes"
+                    await self._send(writer, reply)
+                    break
+                if not line:
+                    await self.end_session(session_id, conversation)
+                    break
+
+                user_input = line.decode('utf-8', errors='replace').strip()
+                if not user_input:
+                    continue
+
+                if user_input.lower() in EXIT_COMMANDS:
+                    await self._send(writer, await self.end_session(session_id, conversation))
+                    break
+
+                await self._send(writer, await self.handle_turn(conversation, user_input, session_id))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.active_sessions -= 1
+            self.completed_sessions += 1
+            writer.close()
+
+    async def start(self, host=SERVER_HOST, port=SERVER_PORT):
+        """
+        Start listening without blocking.
+
+        Args:
+            host (str): Address to bind
+            port (int): Port to bind, 0 for any free port
+
+        Returns:
+            asyncio.Server: The listening server
+        """
+        os.makedirs(self.session_dir, exist_ok=True)
+        return await asyncio.start_server(self.handle_client, host, port, limit=self.max_line_bytes)
+
+    async def serve(self, host=SERVER_HOST, port=SERVER_PORT):
+        """Accept connections until cancelled."""
+        server = await self.start(host, port)
+        addresses = ', '.join(str(sock.getsockname()) for sock in server.sockets)
+        print(f"Serving chatbot sessions on {addresses}")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    """Run the chatbot server."""
+    parser = argparse.ArgumentParser(description="Serve chatbot sessions over TCP.")
+    parser.add_argument('--host', default=SERVER_HOST)
+    parser.add_argument('--port', type=int, default=SERVER_PORT)
+    parser.add_argument('--executor', choices=['thread', 'process'], default=SERVER_EXECUTOR)
+    parser.add_argument('--workers', type=int, default=SERVER_WORKERS)
+    args = parser.parse_args()
+
+    with workers.create_executor(args.executor, args.workers) as executor:
+        chat_server = ChatServer(executor)
+        try:
+            asyncio.run(chat_server.serve(args.host, args.port))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
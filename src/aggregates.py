@@ -0,0 +1,244 @@
+"""Incremental sentiment aggregates."""
+
+from array import array
+import threading
+import time
+from src.sentiment_analyzer import label_for_score, summarize_conversation, trend_from_halves
+from config import (
+    ROLLUP_ENABLED, ROLLUP_BUCKET_SECONDS, ROLLUP_BUCKETS, ROLLUP_FAST_ALPHA, ROLLUP_SLOW_ALPHA,
+    ROLLUP_ALERT_DELTA, ROLLUP_ALERT_MIN_MESSAGES
+)
+
+LABELS = ('Positive', 'Negative', 'Neutral')
+
+
+class RunningSentiment:
+    """Running conversation sentiment that updates per message in O(1)."""
+    
+    def __init__(self):
+        """Initialize an empty aggregate."""
+        # Prefix sums let any first-half/second-half split be read in O(1)
+        self._prefix_sums = [0.0]
+    
+    @property
+    def count(self):
+        """Number of scores added."""
+        return len(self._prefix_sums) - 1
+    
+    def add(self, score):
+        """
+        Add one message score to the aggregate.
+        
+        Args:
+            score (float): Sentiment score of the message
+        """
+        self._prefix_sums.append(self._prefix_sums[-1] + score)
+    
+    def trend(self):
+        """Get first-half vs second-half trend, as _calculate_trend computes it."""
+        count = self.count
+        if count < 2:
+            return 'stable'
+        
+        mid = count // 2
+        total = self._prefix_sums[-1]
+        first_half_avg = self._prefix_sums[mid] / mid
+        second_half_avg = (total - self._prefix_sums[mid]) / (count - mid)
+        return trend_from_halves(first_half_avg, second_half_avg)
+    
+    def summary(self):
+        """
+        Get the overall sentiment so far.
+        
+        Returns:
+            dict: Same shape as SentimentAnalyzer.analyze_conversation
+        """
+        count = self.count
+        if not count:
+            return {'score': 0, 'label': 'Neutral', 'message_count': 0, 'description': 'No messages', 'trend': 'stable'}
+        return summarize_conversation(self._prefix_sums[-1] / count, count, self.trend())
+    
+    def reset(self):
+        """Drop all scores."""
+        self._prefix_sums = [0.0]
+
+
+class SentimentRollup:
+    """Live sentiment across all sessions over a sliding time window.
+    
+    Scores land in a ring of fixed-width time buckets holding per-label
+    counts and score sums, so memory is fixed and a snapshot reads each
+    bucket once. A fast and a slow EWMA of the scores give the trend; when
+    they drift apart by more than alert_delta a change-point alert is
+    raised.
+    """
+    
+    def __init__(self, bucket_seconds=ROLLUP_BUCKET_SECONDS, buckets=ROLLUP_BUCKETS,
+                 fast_alpha=ROLLUP_FAST_ALPHA, slow_alpha=ROLLUP_SLOW_ALPHA,
+                 alert_delta=ROLLUP_ALERT_DELTA, alert_min_messages=ROLLUP_ALERT_MIN_MESSAGES,
+                 on_alert=None):
+        """
+        Initialize an empty rollup.
+        
+        Args:
+            bucket_seconds (float): Width of one time bucket
+            buckets (int): Buckets kept; the window is buckets * bucket_seconds
+            fast_alpha (float): Smoothing factor of the fast EWMA
+            slow_alpha (float): Smoothing factor of the slow EWMA
+            alert_delta (float): EWMA gap that raises a change-point alert
+            alert_min_messages (int): Messages needed before alerting
+            on_alert (callable, optional): Called with the alert dict
+        """
+        self.bucket_seconds = bucket_seconds
+        self.buckets = buckets
+        self.fast_alpha = fast_alpha
+        self.slow_alpha = slow_alpha
+        self.alert_delta = alert_delta
+        self.alert_min_messages = alert_min_messages
+        self.on_alert = on_alert
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        """Drop all scores."""
+        width = len(LABELS)
+        # Absolute bucket number held by each ring slot, -1 when empty
+        self._bucket_ids = array('q', [-1]) * self.buckets
+        self._counts = array('q', [0]) * (self.buckets * width)
+        self._score_sums = array('d', [0.0]) * (self.buckets * width)
+        self.total = 0
+        self.fast = None
+        self.slow = None
+        self.alert = None
+    
+    def add(self, score, label=None, timestamp=None):
+        """
+        Feed one scored message.
+        
+        Args:
+            score (float): Sentiment score
+            label (str, optional): Sentiment label, derived from the score if omitted
+            timestamp (float, optional): Epoch seconds, defaults to now
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        label_index = LABELS.index(label or label_for_score(score))
+        bucket = int(timestamp // self.bucket_seconds)
+        slot = bucket % self.buckets
+        index = slot * len(LABELS) + label_index
+        
+        with self._lock:
+            held = self._bucket_ids[slot]
+            if held != bucket:
+                if held > bucket:
+                    # Older than anything the ring still holds
+                    return
+                self._clear_slot(slot, bucket)
+            self._counts[index] += 1
+            self._score_sums[index] += score
+            self.total += 1
+            raised = self._update_trend(score, timestamp)
+        # Outside the lock, so the callback may read or feed the rollup
+        if raised is not None and self.on_alert is not None:
+            self.on_alert(raised)
+    
+    def _clear_slot(self, slot, bucket):
+        """Reuse a ring slot for a new bucket."""
+        self._bucket_ids[slot] = bucket
+        start = slot * len(LABELS)
+        for index in range(start, start + len(LABELS)):
+            self._counts[index] = 0
+            self._score_sums[index] = 0.0
+    
+    def _update_trend(self, score, timestamp):
+        """
+        Update both EWMAs and raise or clear the change-point alert.
+        
+        Called with the lock held.
+        
+        Returns:
+            dict or None: A copy of the alert if this score raised it
+        """
+        if self.fast is None:
+            self.fast = self.slow = score
+            return None
+        self.fast += self.fast_alpha * (score - self.fast)
+        self.slow += self.slow_alpha * (score - self.slow)
+        gap = self.fast - self.slow
+        if abs(gap) <= self.alert_delta or self.total < self.alert_min_messages:
+            self.alert = None
+            return None
+        if self.alert is None:
+            self.alert = {
+                'direction': 'improving' if gap > 0 else 'declining',
+                'since': timestamp,
+                'fast': self.fast,
+                'slow': self.slow
+            }
+            return dict(self.alert)
+        return None
+    
+    def snapshot(self, window_seconds=None, now=None):
+        """
+        Summarize the recent window in O(buckets).
+        
+        Args:
+            window_seconds (float, optional): How far back to look,
+                defaults to the whole ring
+            now (float, optional): Epoch seconds the window ends at
+            
+        Returns:
+            dict: Message counts, label shares and average score over the
+            window, plus the EWMA trend and any active alert
+        """
+        if now is None:
+            now = time.time()
+        newest = int(now // self.bucket_seconds)
+        span = self.buckets if window_seconds is None else max(1, int(-(-window_seconds // self.bucket_seconds)))
+        oldest = newest - min(span, self.buckets) + 1
+        
+        counts = [0] * len(LABELS)
+        score_sum = 0.0
+        with self._lock:
+            for slot, bucket in enumerate(self._bucket_ids):
+                if oldest <= bucket <= newest:
+                    start = slot * len(LABELS)
+                    for label_index in range(len(LABELS)):
+                        counts[label_index] += self._counts[start + label_index]
+                        score_sum += self._score_sums[start + label_index]
+            fast, slow = self.fast, self.slow
+            alert = dict(self.alert) if self.alert else None
+        
+        messages = sum(counts)
+        return {
+            'window_seconds': (newest - oldest + 1) * self.bucket_seconds,
+            'messages': messages,
+            'counts': dict(zip(LABELS, counts)),
+            'shares': {label: count / messages if messages else 0.0 for label, count in zip(LABELS, counts)},
+            'average_score': score_sum / messages if messages else 0.0,
+            'ewma': {'fast': fast, 'slow': slow},
+            'trend': trend_from_halves(slow, fast) if fast is not None else 'stable',
+            'alert': alert
+        }
+
+
+_rollup = None
+_rollup_lock = threading.Lock()
+
+
+def get_rollup():
+    """
+    Get the process-wide rollup every conversation feeds.
+    
+    Returns:
+        SentimentRollup or None: The shared rollup, or None when rollups
+        are disabled in config
+    """
+    global _rollup
+    if not ROLLUP_ENABLED:
+        return None
+    if _rollup is None:
+        with _rollup_lock:
+            if _rollup is None:
+                _rollup = SentimentRollup()
+    return _rollup
@@ -0,0 +1,133 @@
+"""Micro-batching coalescer for per-message model calls.
+
+Concurrent callers submit single items; a background thread gathers them
+for up to max_batch items or max_wait seconds after the first one arrives,
+runs the batch function once and hands each caller its own result. Models
+with a fixed per-call cost (vectorizer setup, sparse matrix construction,
+numpy dispatch) then pay it once per batch instead of once per message.
+"""
+
+from concurrent.futures import Future
+import queue
+import threading
+import time
+from config import INTENT_BATCH_SIZE, INTENT_BATCH_WAIT_MS
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-item calls into batched calls."""
+
+    def __init__(self, batch_func, max_batch=INTENT_BATCH_SIZE, max_wait=INTENT_BATCH_WAIT_MS / 1000.0,
+                 name='batcher'):
+        """
+        Initialize the batcher and start its worker thread.
+
+        Args:
+            batch_func (callable): Takes a list of items, returns a list of
+                results in the same order
+            max_batch (int): Most items per batch
+            max_wait (float): Longest a batch stays open, in seconds
+            name (str): Worker thread name
+        """
+        self.batch_func = batch_func
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._largest_batch = 0
+        self._total_wait = 0.0
+        self._longest_wait = 0.0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item):
+        """
+        Queue one item for the next batch.
+
+        Returns:
+            Future: Resolves to the item's result
+        """
+        if self._closed:
+            raise RuntimeError("MicroBatcher is closed")
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def __call__(self, item, timeout=None):
+        """Submit one item and wait for its result."""
+        return self.submit(item).result(timeout)
+
+    def _collect(self):
+        """Block for the first item, then gather more until the batch is full or due."""
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is None:
+                # Finish this batch, then stop
+                self._queue.put(None)
+                break
+            batch.append(entry)
+        return batch
+
+    def _run(self):
+        """Worker loop: collect, run and fan out batches until closed."""
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            started = time.perf_counter()
+            items = [item for item, _, _ in batch]
+            try:
+                results = self.batch_func(items)
+                if len(results) != len(items):
+                    raise ValueError(f"batch function returned {len(results)} results for {len(items)} items")
+            except Exception as exc:
+                for _, future, _ in batch:
+                    future.set_exception(exc)
+            else:
+                for (_, future, _), result in zip(batch, results):
+                    future.set_result(result)
+
+            waits = [started - queued for _, _, queued in batch]
+            with self._lock:
+                self._batches += 1
+                self._items += len(batch)
+                self._largest_batch = max(self._largest_batch, len(batch))
+                self._total_wait += sum(waits)
+                self._longest_wait = max(self._longest_wait, max(waits))
+
+    def stats(self):
+        """
+        Get batching statistics.
+
+        Returns:
+            dict: Batches run, items served, mean and largest batch size,
+            and mean and longest queueing wait in milliseconds
+        """
+        with self._lock:
+            return {
+                'batches': self._batches,
+                'items': self._items,
+                'mean_batch_size': self._items / self._batches if self._batches else 0.0,
+                'max_batch_size': self._largest_batch,
+                'mean_wait_ms': self._total_wait / self._items * 1000 if self._items else 0.0,
+                'max_wait_ms': self._longest_wait * 1000
+            }
+
+    def close(self):
+        """Serve queued items, then stop the worker thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
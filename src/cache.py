@@ -0,0 +1,114 @@
+"""Bounded LRU cache for sentiment analysis results."""
+
+from collections import OrderedDict
+import threading
+from src.preprocess import as_message
+from config import SENTIMENT_CACHE_ENABLED, SENTIMENT_CACHE_SIZE
+
+
+def copy_result(result):
+    """
+    Copy a result so callers cannot mutate the cached entry.
+
+    Nested dicts and lists, such as detailed_scores and a long-text
+    result's per-sentence 'sentences', are copied too.
+    """
+    if isinstance(result, dict):
+        return {key: copy_result(value) for key, value in result.items()}
+    if isinstance(result, list):
+        return [copy_result(item) for item in result]
+    return result
+
+
+class SentimentCache:
+    """Thread-safe LRU cache of sentiment results keyed on analyzer settings and text."""
+
+    def __init__(self, capacity=SENTIMENT_CACHE_SIZE):
+        """
+        Initialize the cache.
+
+        Args:
+            capacity (int): Maximum number of results kept
+        """
+        self.capacity = capacity
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, settings, text):
+        """
+        Return a cached result or None.
+
+        Args:
+            settings (hashable): The analyzer's SentimentAnalyzer.cache_key,
+                so analyzers configured differently never share entries
+            text (str or PreprocessedMessage): Message; entries are keyed
+                on the hash of its whitespace-normalized text. Case and
+                punctuation are kept because VADER treats capitals and
+                exclamation marks as intensifiers.
+        """
+        key = (settings, as_message(text).digest)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy_result(result)
+
+    def put(self, settings, text, result):
+        """Store a result, evicting the least recently used entry if full."""
+        if self.capacity <= 0:
+            return
+        key = (settings, as_message(text).digest)
+        with self._lock:
+            self._entries[key] = copy_result(result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        """Get hit, miss and eviction counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'capacity': self.capacity,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def clear(self):
+        """Drop all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """
+    Get the process-wide sentiment cache.
+
+    Returns:
+        SentimentCache or None: The shared cache, or None when caching is
+        disabled in config
+    """
+    global _shared_cache
+    if not SENTIMENT_CACHE_ENABLED:
+        return None
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            _shared_cache = SentimentCache()
+        return _shared_cache
@@ -1,15 +1,73 @@
 """Chatbot response logic and interaction handling."""
 
+import json
+import os
 import random
-from config import BOT_NAME
+from config import BOT_NAME, INTENTS_FILE
+from src.matcher import KeywordMatcher
+from src.preprocess import as_message
+
+# Keyword rules in priority order: (phrase, response)
+KEYWORD_RULES = [
+    ('goodbye', "See you later! Feel free to come back anytime."),
+    ('bye', "Goodbye! Have a great day!"),
+    ('see you', "See you later! Feel free to come back anytime."),
+    ('hello', "Hi there! What's on your mind?"),
+    ('hi', "Hi there! What's on your mind?"),
+    ('hey', "Hi there! What's on your mind?"),
+    ('greetings', "Hi there! What's on your mind?"),
+]
+
+# Intent tags that reuse a built-in keyword response
+INTENT_RULE_RESPONSES = {
+    'greeting': "Hi there! What's on your mind?",
+    'goodbye': "Goodbye! Have a great day!",
+}
+
+# Intent tags left to the sentiment-based responses
+SENTIMENT_INTENT_TAGS = {'positive', 'negative'}
+
+
+def load_intent_rules(intents_file=INTENTS_FILE):
+    """
+    Build keyword rules from intent patterns.
+    
+    Args:
+        intents_file (str): Path to intents JSON
+        
+    Returns:
+        list: (phrase, response) pairs, greetings and farewells first
+    """
+    if not os.path.exists(intents_file):
+        return []
+    with open(intents_file, 'r') as f:
+        intents = json.load(f)['intents']
+    
+    known, extra = [], []
+    for intent in intents:
+        tag = intent['tag']
+        if tag in SENTIMENT_INTENT_TAGS or not intent.get('responses'):
+            continue
+        if tag in INTENT_RULE_RESPONSES:
+            known.extend((pattern, INTENT_RULE_RESPONSES[tag]) for pattern in intent['patterns'])
+        else:
+            extra.extend((pattern, intent['responses'][0]) for pattern in intent['patterns'])
+    return known + extra
 
 
 class Chatbot:
     """Handles chatbot responses based on user input."""
     
-    def __init__(self):
-        """Initialize chatbot with response templates."""
+    def __init__(self, intents_file=INTENTS_FILE):
+        """
+        Initialize chatbot with response templates.
+        
+        Args:
+            intents_file (str): Intents JSON whose patterns extend the keyword rules
+        """
         self.name = BOT_NAME
+        self.intents_file = intents_file
+        self._matcher = None
         self.responses = {
             'greeting': [
                 "Hello! How can I help you today?",
@@ -44,30 +102,32 @@ class Chatbot:
             ]
         }
     
+    @property
+    def matcher(self):
+        """Keyword matcher, built from the rules and intents on first use."""
+        if self._matcher is None:
+            self._matcher = KeywordMatcher(KEYWORD_RULES + load_intent_rules(self.intents_file))
+        return self._matcher
+    
+    def warmup(self):
+        """Build the keyword matcher now instead of on the first message."""
+        self.matcher
+    
     def generate_response(self, user_input, sentiment_label=None):
         """
         Generate appropriate response based on input and sentiment.
         
         Args:
-            user_input (str): User's message
+            user_input (str or PreprocessedMessage): User's message
             sentiment_label (str, optional): Sentiment of user's message
             
         Returns:
             str: Bot's response
         """
-        user_input_lower = user_input.lower()
-        
-        # Check for farewells (specific responses)
-        if 'goodbye' in user_input_lower:
-            return "See you later! Feel free to come back anytime."
-        if 'bye' in user_input_lower and 'goodbye' not in user_input_lower:
-            return "Goodbye! Have a great day!"
-        if 'see you' in user_input_lower:
-            return "See you later! Feel free to come back anytime."
-        
-        # Check for greetings (always return same response)
-        if any(word in user_input_lower for word in ['hello', 'hi', 'hey', 'greetings']):
-            return "Hi there! What's on your mind?"
+        # Farewells, greetings and intent keywords in one pass over the words
+        keyword_response = self.matcher.match(as_message(user_input).tokens)
+        if keyword_response is not None:
+            return keyword_response
         
         # Sentiment-based responses (specific responses)
         if sentiment_label:
@@ -2,15 +2,38 @@
 
 from datetime import datetime
 import json
+import logging
+from src.aggregates import RunningSentiment, get_rollup
+from src.message_store import CompactMessageLog
+from config import CONVERSATION_COMPACT_STORAGE
+
+logger = logging.getLogger(__name__)
 
 
 class ConversationManager:
     """Handles storage and retrieval of conversation history."""
     
-    def __init__(self):
-        """Initialize conversation manager."""
-        self.messages = []
+    def __init__(self, journal=None, compact=CONVERSATION_COMPACT_STORAGE, rollup=None):
+        """
+        Initialize conversation manager.
+        
+        Args:
+            journal (ConversationJournal, optional): Journal that records
+                every message as it is added
+            compact (bool): Store messages in typed columns instead of
+                dicts; dicts are built only when requested
+            rollup (SentimentRollup, optional): Cross-session aggregate fed
+                every new scored user message, defaults to the shared one
+                when ROLLUP_ENABLED
+        """
+        self.compact = compact
+        self.messages = self._new_store()
         self.start_time = datetime.now()
+        self.sentiment_summary = RunningSentiment()
+        self.journal = journal
+        self.rollup = rollup if rollup is not None else get_rollup()
+        if journal is not None:
+            journal.start(self.start_time)
     
     def add_message(self, sender, text, sentiment=None):
         """
@@ -21,20 +44,60 @@ class ConversationManager:
             text (str): Message content
             sentiment (dict, optional): Sentiment analysis results
         """
+        now = datetime.now()
+        if self.rollup is not None and sender == 'user' and sentiment:
+            self.rollup.add(sentiment['score'], sentiment['label'], now.timestamp())
+        if self.compact and self.journal is None:
+            self.messages.append(sender, text, now.timestamp(), sentiment)
+            self._track_sentiment(sender, sentiment)
+            return
+        
         message = {
             'sender': sender,
             'text': text,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': now.isoformat(),
             'sentiment': sentiment
         }
-        self.messages.append(message)
+        self.restore_message(message)
+        if self.journal is not None:
+            self.journal.append(message)
+    
+    def restore_message(self, message):
+        """
+        Append an existing message dict, keeping its timestamp.
+        
+        Args:
+            message (dict): Message as stored by add_message
+        """
+        if self.compact:
+            self.messages.append_dict(message)
+        else:
+            self.messages.append(message)
+        self._track_sentiment(message['sender'], message['sentiment'])
+    
+    def _new_store(self):
+        """Create an empty message store for the configured mode."""
+        return CompactMessageLog() if self.compact else []
+    
+    def _track_sentiment(self, sender, sentiment):
+        """Feed a user message score into the running summary."""
+        if sender == 'user' and sentiment:
+            self.sentiment_summary.add(sentiment['score'])
     
     def get_user_messages(self):
         """Get only user messages."""
+        if self.compact:
+            return self.messages.texts_from('user')
         return [msg['text'] for msg in self.messages if msg['sender'] == 'user']
     
+    def get_sentiment_summary(self):
+        """Get overall user sentiment so far without re-analyzing messages."""
+        return self.sentiment_summary.summary()
+    
     def get_all_messages(self):
         """Get all messages in conversation."""
+        if self.compact:
+            return self.messages.to_dicts()
         return self.messages
     
     def get_conversation_duration(self):
@@ -43,21 +106,52 @@ class ConversationManager:
             return 0
         return (datetime.now() - self.start_time).total_seconds()
     
-    def save_to_file(self, filename='data/conversation_history.json'):
-        """Save conversation to JSON file."""
+    def save_to_file(self, filename='data/conversation_history.json', duration=None):
+        """
+        Save conversation to JSON file.
+        
+        Args:
+            filename (str): Output path
+            duration (float, optional): Duration to record, defaults to now
+        """
+        if duration is None:
+            duration = self.get_conversation_duration()
         try:
             with open(filename, 'w') as f:
                 json.dump({
-                    'messages': self.messages,
+                    'messages': self.get_all_messages(),
                     'start_time': self.start_time.isoformat(),
-                    'duration_seconds': self.get_conversation_duration()
+                    'duration_seconds': duration
                 }, f, indent=2)
             return True
         except Exception as e:
-            print(f"Error saving conversation: {e}")
+            logger.error("Error saving conversation to %s: %s", filename, e)
             return False
     
+    @classmethod
+    def load_from_file(cls, filename='data/conversation_history.json', **kwargs):
+        """
+        Load a conversation saved by save_to_file.
+        
+        Args:
+            filename (str): Saved conversation JSON
+            **kwargs: Passed to the constructor
+            
+        Returns:
+            ConversationManager: The restored conversation
+        """
+        with open(filename, 'r') as f:
+            data = json.load(f)
+        conversation = cls(**kwargs)
+        conversation.start_time = datetime.fromisoformat(data['start_time'])
+        for message in data['messages']:
+            conversation.restore_message(message)
+        return conversation
+    
     def clear(self):
         """Clear conversation history."""
-        self.messages = []
+        self.messages = self._new_store()
         self.start_time = datetime.now()
+        self.sentiment_summary.reset()
+        if self.journal is not None:
+            self.journal.start(self.start_time)
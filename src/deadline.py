@@ -0,0 +1,168 @@
+"""Per-turn latency budgets and stage cost estimates.
+
+Each turn gets a Deadline of TURN_LATENCY_BUDGET_MS. Before an expensive
+stage runs, LatencyBudget projects its cost from recent observations and,
+if it would not fit in the time left, the caller takes a cheaper path.
+
+Estimates are per unit of work (per call, or per character for sentiment
+scoring) so long messages project as more expensive. An estimate jumps up
+at once on a slow observation and decays by the smoothing factor on fast
+ones, so one stall is enough to start degrading. Each time a stage is
+skipped its estimate decays too, which lets it be retried after a while
+instead of staying disabled for good.
+
+Fallbacks and overruns are counted per turn and mirrored to the metrics
+registry as fallback_<stage>, deadline_exceeded and turns counters.
+"""
+
+import math
+import threading
+import time
+from src.metrics import get_metrics
+from config import TURN_LATENCY_BUDGET_MS, DEADLINE_EWMA_ALPHA
+
+
+class Deadline:
+    """Time left in one turn's budget."""
+
+    __slots__ = ('budget', 'start')
+
+    def __init__(self, budget):
+        """
+        Start the clock.
+
+        Args:
+            budget (float or None): Seconds allowed, None for no deadline
+        """
+        self.budget = budget
+        self.start = time.perf_counter()
+
+    def elapsed(self):
+        """Seconds since the turn started."""
+        return time.perf_counter() - self.start
+
+    def remaining(self):
+        """Seconds left, negative once overrun, infinite without a budget."""
+        if self.budget is None:
+            return math.inf
+        return self.budget - self.elapsed()
+
+    def timeout(self):
+        """Seconds left for a blocking wait, or None without a budget."""
+        if self.budget is None:
+            return None
+        return max(self.remaining(), 0.0)
+
+    def exceeded(self):
+        """Whether the turn has used up its budget."""
+        return self.remaining() < 0
+
+
+class LatencyBudget:
+    """Projects stage costs against per-turn deadlines and counts fallbacks."""
+
+    def __init__(self, budget_ms=TURN_LATENCY_BUDGET_MS, alpha=DEADLINE_EWMA_ALPHA):
+        """
+        Initialize the budget.
+
+        Args:
+            budget_ms (float or None): Latency budget per turn, None to
+                never degrade
+            alpha (float): Weight of a new fast observation in a stage estimate
+        """
+        self.budget = budget_ms / 1000.0 if budget_ms else None
+        self.alpha = alpha
+        self._rates = {}
+        self._warm = set()
+        self._turns = 0
+        self._exceeded = 0
+        self._fallbacks = {}
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start a turn's deadline."""
+        return Deadline(self.budget)
+
+    def project(self, stage, size=1):
+        """
+        Projected seconds for a stage.
+
+        Args:
+            stage (str): Stage name, e.g. 'intent_predict' or 'sentiment.textblob'
+            size (int): Units of work, e.g. characters to score
+
+        Returns:
+            float: Estimate, 0 for stages not yet observed
+        """
+        rate = self._rates.get(stage)
+        return rate * size if rate is not None else 0.0
+
+    def fits(self, deadline, stage, size=1):
+        """
+        Check whether a stage is projected to finish within the deadline.
+
+        A stage that does not fit has its estimate decayed, as if it had
+        been observed running fast, so it is tried again eventually.
+        """
+        if self.budget is None or self.project(stage, size) <= deadline.remaining():
+            return True
+        with self._lock:
+            if stage in self._rates:
+                self._rates[stage] *= 1 - self.alpha
+        return False
+
+    def observe(self, stage, seconds, size=1):
+        """
+        Record how long a stage took.
+
+        The first observation of each stage is discarded, since it usually
+        includes loading the stage's resources.
+        """
+        rate = seconds / max(size, 1)
+        with self._lock:
+            if stage not in self._warm:
+                self._warm.add(stage)
+                return
+            current = self._rates.get(stage)
+            if current is None or rate > current:
+                self._rates[stage] = rate
+            else:
+                self._rates[stage] = current + self.alpha * (rate - current)
+
+    def record(self, fallbacks, exceeded):
+        """
+        Count one finished turn.
+
+        Args:
+            fallbacks (list): Stages that took a cheaper path this turn
+            exceeded (bool): Whether the turn overran its budget
+        """
+        metrics = get_metrics()
+        with self._lock:
+            self._turns += 1
+            self._exceeded += exceeded
+            for stage in fallbacks:
+                self._fallbacks[stage] = self._fallbacks.get(stage, 0) + 1
+        metrics.increment('turns')
+        if exceeded:
+            metrics.increment('deadline_exceeded')
+        for stage in fallbacks:
+            metrics.increment(f'fallback_{stage}')
+
+    def stats(self):
+        """
+        Get fallback statistics.
+
+        Returns:
+            dict: Turns, budget overruns, fallback counts and rates per
+            stage, and current per-unit stage estimates in milliseconds
+        """
+        with self._lock:
+            turns = self._turns
+            return {
+                'turns': turns,
+                'deadline_exceeded': self._exceeded,
+                'fallbacks': dict(self._fallbacks),
+                'fallback_rates': {stage: count / turns for stage, count in self._fallbacks.items()},
+                'estimates_ms': {stage: rate * 1000 for stage, rate in self._rates.items()}
+            }
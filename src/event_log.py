@@ -0,0 +1,316 @@
+"""Non-blocking structured event log.
+
+Callers put events on a bounded in-process queue and return at once; a
+background thread drains the queue, formats whatever has accumulated with
+LOG_FORMAT and writes it to LOG_FILE in one write, rotating the file when
+it outgrows LOG_MAX_BYTES. When the writer falls behind and the queue is
+full, new events are dropped and counted rather than blocking the turn.
+
+Turn events carry the session, sentiment, intent, the path that produced
+the response and per-stage timings, as JSON in the log message:
+
+    timings = StageTimings()
+    with timings.stage('sentiment'):
+        ...
+    log_turn(session, timings, sentiment=result, path='rules')
+
+Once the log is enabled, standard library logging records (for example
+errors logged with logger.exception) go through the same queue.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from config import (
+    LOG_ENABLED, LOG_FILE, LOG_LEVEL, LOG_FORMAT,
+    LOG_QUEUE_SIZE, LOG_BATCH_SIZE, LOG_MAX_BYTES, LOG_BACKUP_COUNT
+)
+
+
+class EventLog:
+    """Queues log events and writes them to a rotating file from a background thread."""
+
+    def __init__(self, path=LOG_FILE, level=LOG_LEVEL, fmt=LOG_FORMAT, queue_size=LOG_QUEUE_SIZE,
+                 batch_size=LOG_BATCH_SIZE, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT,
+                 name='chatbot'):
+        """
+        Initialize the log and start its writer thread.
+
+        Args:
+            path (str): Log file
+            level (int): Least severe level written
+            fmt (str): logging.Formatter format for each line
+            queue_size (int): Events buffered before new ones are dropped
+            batch_size (int): Most events per file write
+            max_bytes (int): Rotate once the file would grow past this, 0 to never rotate
+            backup_count (int): Rotated files kept as path.1 ... path.N
+            name (str): Logger name shown on event lines
+        """
+        self.path = path
+        self.level = level
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.name = name
+        self._formatter = logging.Formatter(fmt)
+        self._queue = queue.Queue(queue_size)
+        self._lock = threading.Lock()
+        self._file = None
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.rotations = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='event-log', daemon=True)
+        self._thread.start()
+
+    def _put(self, entry):
+        """Queue an entry, counting it as dropped if the queue is full."""
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        return True
+
+    def event(self, name, level=logging.INFO, **fields):
+        """
+        Queue a structured event without blocking.
+
+        Args:
+            name (str): Event type, e.g. 'turn'
+            level (int): Logging level of the event
+            **fields: JSON-serializable event fields
+
+        Returns:
+            bool: True if queued, False if filtered out or dropped
+        """
+        if level < self.level:
+            return False
+        return self._put((time.time(), level, name, fields))
+
+    def record(self, record):
+        """
+        Queue a standard library LogRecord without blocking.
+
+        As logging.handlers.QueueHandler.prepare does, the message is merged
+        with its args and any traceback rendered to text now, on the calling
+        thread, so the queued copy holds no references to caller objects or
+        frames until the writer gets to it.
+        """
+        if record.levelno < self.level:
+            return False
+        prepared = copy.copy(record)
+        prepared.msg = record.getMessage()
+        prepared.args = None
+        if record.exc_info:
+            prepared.exc_text = record.exc_text or self._formatter.formatException(record.exc_info)
+        prepared.exc_info = None
+        return self._put(prepared)
+
+    def _format(self, entry):
+        """Format one queued entry as a log line."""
+        if isinstance(entry, logging.LogRecord):
+            return self._formatter.format(entry) + '\n'
+        created, level, name, fields = entry
+        message = json.dumps({'event': name, **fields}, default=str)
+        record = logging.LogRecord(self.name, level, '', 0, message, None, None)
+        record.created = created
+        record.msecs = (created - int(created)) * 1000
+        return self._formatter.format(record) + '\n'
+
+    def _rotate(self):
+        """Shift path -> path.1 -> ... -> path.N, dropping the oldest."""
+        self._file.close()
+        self._file = None
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+        self.rotations += 1
+
+    def _write(self, batch):
+        """Write a batch of entries in one file write."""
+        data = ''.join(self._format(entry) for entry in batch).encode('utf-8')
+        try:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, 'ab')
+            if self.max_bytes and self._file.tell() and self._file.tell() + len(data) > self.max_bytes:
+                self._rotate()
+                self._file = open(self.path, 'ab')
+            self._file.write(data)
+            self._file.flush()
+        except OSError:
+            # Logging must never take the chatbot down; count the loss instead
+            with self._lock:
+                self.dropped += len(batch)
+            return
+        with self._lock:
+            self.written += len(batch)
+            self.batches += 1
+
+    def _run(self):
+        """Writer loop: block for one entry, drain what else is queued, write."""
+        stopping = False
+        while not stopping:
+            entry = self._queue.get()
+            if entry is None:
+                break
+            batch = [entry]
+            while len(batch) < self.batch_size:
+                try:
+                    entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stopping = True
+                    break
+                batch.append(entry)
+            self._write(batch)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def stats(self):
+        """
+        Get writer statistics.
+
+        Returns:
+            dict: Events written and dropped, file writes, rotations and
+            current queue depth
+        """
+        with self._lock:
+            return {
+                'written': self.written,
+                'dropped': self.dropped,
+                'batches': self.batches,
+                'rotations': self.rotations,
+                'queued': self._queue.qsize()
+            }
+
+    def close(self):
+        """Write everything queued, then stop the writer thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+
+class EventLogHandler(logging.Handler):
+    """Routes standard library log records onto an EventLog's queue."""
+
+    def __init__(self, event_log):
+        super().__init__()
+        self.event_log = event_log
+
+    def emit(self, record):
+        self.event_log.record(record)
+
+
+class _Stage:
+    """Context manager that adds the elapsed time of a block to one stage."""
+
+    __slots__ = ('_timings', '_name', '_start')
+
+    def __init__(self, timings, name):
+        self._timings = timings
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        ms = self._timings.ms
+        ms[self._name] = ms.get(self._name, 0.0) + (time.perf_counter() - self._start) * 1000
+        return False
+
+
+class StageTimings:
+    """Per-turn stage durations in milliseconds."""
+
+    def __init__(self):
+        self.ms = {}
+        self._start = time.perf_counter()
+
+    def stage(self, name):
+        """Time a block, adding to the stage's total if it repeats."""
+        return _Stage(self, name)
+
+    def total(self):
+        """Milliseconds since the turn started."""
+        return (time.perf_counter() - self._start) * 1000
+
+
+_event_log = None
+_event_log_lock = threading.Lock()
+
+
+def get_event_log():
+    """
+    Get the process-wide event log, starting it on first use.
+
+    The first call also routes standard library logging through it and
+    registers a flush at interpreter exit.
+
+    Returns:
+        EventLog or None: The log, or None when LOG_ENABLED is False
+    """
+    global _event_log
+    if not LOG_ENABLED:
+        return None
+    if _event_log is None:
+        with _event_log_lock:
+            if _event_log is None:
+                event_log = EventLog()
+                root = logging.getLogger()
+                root.addHandler(EventLogHandler(event_log))
+                root.setLevel(LOG_LEVEL)
+                atexit.register(event_log.close)
+                _event_log = event_log
+    return _event_log
+
+
+def log_turn(session, timings, sentiment=None, intent=None, path=None, fallbacks=None):
+    """
+    Log one turn of the pipeline if the event log is enabled.
+
+    Args:
+        session (str): Session identifier
+        timings (StageTimings): Stage durations of the turn
+        sentiment (dict, optional): analyze_message result
+        intent (str, optional): Predicted intent tag
+        path (str, optional): What produced the response, e.g. 'model' or 'rules'
+        fallbacks (list, optional): Stages that took a cheaper path to meet
+            the latency budget
+    """
+    event_log = get_event_log()
+    if event_log is None:
+        return
+    timings_ms = {stage: round(ms, 3) for stage, ms in timings.ms.items()}
+    timings_ms['total'] = round(timings.total(), 3)
+    event_log.event(
+        'turn',
+        session=session,
+        sentiment=sentiment['label'] if sentiment else None,
+        score=sentiment['score'] if sentiment else None,
+        intent=intent,
+        path=path,
+        fallbacks=fallbacks or [],
+        timings_ms=timings_ms
+    )
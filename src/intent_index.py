@@ -0,0 +1,139 @@
+"""TF-IDF inverted index over intent patterns.
+
+Every pattern in intents.json is one document. Its word tokens are weighted
+by term frequency times smoothed inverse document frequency, and the vector
+is L2-normalized, so a dot product is the cosine similarity. Each term maps
+to a postings list of (pattern, weight) sorted by weight, and a query walks
+only the postings of its own terms: lookup cost follows how common the
+message's words are, not how many patterns there are. Postings of very
+common terms are cut to their max_postings heaviest entries, which bounds
+the worst case at a small cost in recall for patterns that share only
+filler words with the message.
+
+Message words that appear in no pattern still count towards the query's
+length, at the highest idf, so "hello, is my refund through yet" scores
+lower against "hello" than a bare "hello" does.
+
+An intent scores the best cosine of any of its patterns.
+"""
+
+from array import array
+import collections
+import heapq
+import json
+import math
+from operator import itemgetter
+from src.matcher import tokenize
+from src.preprocess import as_message
+from config import INTENTS_FILE, INTENT_INDEX_THRESHOLD, INTENT_INDEX_TOP_K, INTENT_INDEX_MAX_POSTINGS
+
+
+class IntentIndex:
+    """Finds the intents whose patterns are most similar to a message."""
+
+    def __init__(self, intents, max_postings=INTENT_INDEX_MAX_POSTINGS):
+        """
+        Build the index.
+
+        Args:
+            intents (list): Intent dicts with 'tag' and 'patterns', as in intents.json
+            max_postings (int): Heaviest postings kept per term, 0 to keep all
+        """
+        self.tags = []
+        documents = []
+        pattern_tags = array('i')
+        document_frequency = collections.Counter()
+        for intent in intents:
+            tag_index = len(self.tags)
+            self.tags.append(intent['tag'])
+            for pattern in intent.get('patterns', []):
+                counts = collections.Counter(tokenize(pattern))
+                if counts:
+                    documents.append(counts)
+                    pattern_tags.append(tag_index)
+                    document_frequency.update(counts.keys())
+
+        count = len(documents)
+        # Smoothed idf, as scikit-learn's TfidfVectorizer computes it
+        self.idf = {term: math.log((1 + count) / (1 + frequency)) + 1
+                    for term, frequency in document_frequency.items()}
+        self.unknown_idf = math.log(1 + count) + 1
+        self.patterns = count
+
+        postings = {}
+        for document, counts in enumerate(documents):
+            weights = {term: tf * self.idf[term] for term, tf in counts.items()}
+            norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+            for term, weight in weights.items():
+                postings.setdefault(term, []).append((document, weight / norm))
+
+        self._postings = {}
+        for term, entries in postings.items():
+            entries.sort(key=itemgetter(1), reverse=True)
+            if max_postings:
+                entries = entries[:max_postings]
+            self._postings[term] = (array('i', [document for document, _ in entries]),
+                                    array('d', [weight for _, weight in entries]))
+        self._pattern_tags = pattern_tags
+
+    @classmethod
+    def from_file(cls, intents_file=INTENTS_FILE, **kwargs):
+        """Build an index from an intents JSON file."""
+        with open(intents_file, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)['intents'], **kwargs)
+
+    def search(self, text, k=INTENT_INDEX_TOP_K):
+        """
+        Rank intents by cosine similarity to a message.
+
+        Args:
+            text (str or PreprocessedMessage): The message
+            k (int): Most intents to return
+
+        Returns:
+            list: (tag, similarity) pairs, most similar first; intents
+            sharing no word with the message are left out
+        """
+        counts = collections.Counter(as_message(text).tokens)
+        query = {}
+        length = 0.0
+        for term, tf in counts.items():
+            idf = self.idf.get(term)
+            weight = tf * (idf if idf is not None else self.unknown_idf)
+            length += weight * weight
+            if idf is not None:
+                query[term] = weight
+        if not query:
+            return []
+
+        length = math.sqrt(length)
+        scores = {}
+        for term, weight in query.items():
+            weight /= length
+            documents, weights = self._postings[term]
+            for document, document_weight in zip(documents, weights):
+                scores[document] = scores.get(document, 0.0) + weight * document_weight
+
+        best = {}
+        pattern_tags = self._pattern_tags
+        for document, score in scores.items():
+            tag = pattern_tags[document]
+            if score > best.get(tag, 0.0):
+                best[tag] = score
+        return [(self.tags[tag], score) for tag, score in heapq.nlargest(k, best.items(), key=itemgetter(1))]
+
+    def match(self, text, threshold=INTENT_INDEX_THRESHOLD):
+        """
+        Get the most similar intent if it is similar enough.
+
+        Args:
+            text (str or PreprocessedMessage): The message
+            threshold (float): Lowest cosine similarity accepted
+
+        Returns:
+            tuple or None: (tag, similarity), or None to fall back to rules
+        """
+        top = self.search(text, 1)
+        if top and top[0][1] >= threshold:
+            return top[0]
+        return None
@@ -0,0 +1,379 @@
+"""Flat, memory-mappable intent model format.
+
+A trained vectorizer vocabulary and linear classifier weights are written
+into one file of fixed-width arrays. Loading maps the file read-only, so
+forked or pre-spawned workers share one physical copy of the weights and
+nothing is unpickled at startup.
+
+File layout (native byte order, every section 8-byte aligned):
+
+    magic b'SBIM' | header length (uint32) | JSON header | sections...
+
+Models trained by src.intent_training use a hashing featurizer instead of
+a vocabulary: the header says 'featurizer': 'hash' and terms map to
+crc32(term) % n_features, so the file stores no terms at all.
+
+Export a pickled scikit-learn model:
+    python -m src.intent_model chatbot_model.pkl vectorizer.pkl intent_model.bin
+"""
+
+from array import array
+import json
+import math
+import mmap
+import re
+import struct
+import sys
+import zlib
+from src.preprocess import PreprocessedMessage
+
+MAGIC = b'SBIM'
+FORMAT_VERSION = 1
+_ALIGN = 8
+
+
+def hash_feature(term, n_features):
+    """
+    Feature index of a term under the hashing featurizer.
+
+    crc32 is stable across processes and runs, unlike hash().
+    """
+    return zlib.crc32(term.encode('utf-8')) % n_features
+
+
+def extract_terms(text, token_pattern, ngram_range, stop_words=frozenset()):
+    """
+    Split text into word n-grams; case is left as given.
+
+    Args:
+        text (str): Text to split
+        token_pattern (Pattern): Compiled token regex
+        ngram_range (tuple): (min_n, max_n) n-gram lengths
+        stop_words (frozenset): Tokens to drop before forming n-grams
+
+    Returns:
+        list: Terms, unigrams first, as scikit-learn's word analyzer orders them
+    """
+    tokens = token_pattern.findall(text)
+    if stop_words:
+        tokens = [token for token in tokens if token not in stop_words]
+    min_n, max_n = ngram_range
+    if max_n == 1:
+        return tokens
+    terms = []
+    for n in range(min_n, max_n + 1):
+        terms.extend(' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+    return terms
+
+
+def _pad(length):
+    """Bytes needed to pad length up to the section alignment."""
+    return -length % _ALIGN
+
+
+def _vectorizer_settings(vectorizer):
+    """Read the tokenization and weighting settings of a fitted vectorizer."""
+    if getattr(vectorizer, 'analyzer', 'word') != 'word':
+        raise ValueError("Only word analyzers can be exported")
+    if getattr(vectorizer, 'tokenizer', None) or getattr(vectorizer, 'preprocessor', None):
+        raise ValueError("Custom tokenizers and preprocessors cannot be exported")
+    if getattr(vectorizer, 'strip_accents', None):
+        raise ValueError("strip_accents cannot be exported")
+
+    stop_words = vectorizer.get_stop_words() if hasattr(vectorizer, 'get_stop_words') else None
+    idf = getattr(vectorizer, 'idf_', None) if getattr(vectorizer, 'use_idf', False) else None
+    return {
+        'lowercase': bool(getattr(vectorizer, 'lowercase', True)),
+        'token_pattern': vectorizer.token_pattern,
+        'ngram_range': list(getattr(vectorizer, 'ngram_range', (1, 1))),
+        'stop_words': sorted(stop_words) if stop_words else [],
+        'binary': bool(getattr(vectorizer, 'binary', False)),
+        'sublinear_tf': bool(getattr(vectorizer, 'sublinear_tf', False)),
+        'norm': getattr(vectorizer, 'norm', None),
+        'use_idf': idf is not None
+    }, idf
+
+
+def _classifier_weights(model):
+    """Return (classes, weight rows, intercepts) of a fitted linear classifier."""
+    if hasattr(model, 'coef_'):
+        coef, intercept = model.coef_, model.intercept_
+    elif hasattr(model, 'feature_log_prob_'):
+        # Naive Bayes decisions are linear in the counts too
+        coef, intercept = model.feature_log_prob_, model.class_log_prior_
+    else:
+        raise ValueError(f"Cannot export classifier of type {type(model).__name__}")
+    rows = coef.toarray().tolist() if hasattr(coef, 'toarray') else [list(row) for row in coef]
+    return [str(label) for label in model.classes_], rows, [float(value) for value in intercept]
+
+
+def write_model(path, settings, classes, terms, coef_rows, intercepts, idf=None, extra=None):
+    """
+    Write a model file from plain Python data.
+
+    Args:
+        path (str): Output file
+        settings (dict): Tokenization and weighting settings
+        classes (list): Class labels
+        terms (dict): Term -> feature index
+        coef_rows (list): One weight row per decision function
+        intercepts (list): One intercept per decision function
+        idf (list, optional): Per-feature inverse document frequencies
+        extra (dict, optional): Additional sections by name, as arrays
+            or lists of floats, such as the training counts incremental
+            updates start from
+
+    Returns:
+        int: Size of the written file in bytes
+    """
+    n_features = len(coef_rows[0]) if coef_rows else 0
+    encoded = sorted((term.encode('utf-8'), index) for term, index in terms.items())
+
+    blob = b''.join(term for term, _ in encoded)
+    offsets = array('q', [0])
+    for term, _ in encoded:
+        offsets.append(offsets[-1] + len(term))
+    sections = [
+        ('term_offsets', offsets.tobytes(), 'q'),
+        ('term_index', array('q', [index for _, index in encoded]).tobytes(), 'q'),
+        ('term_blob', blob, 'B'),
+        ('coef', array('d', [float(w) for row in coef_rows for w in row]).tobytes(), 'd'),
+        ('intercept', array('d', intercepts).tobytes(), 'd'),
+    ]
+    if idf is not None:
+        sections.append(('idf', array('d', [float(value) for value in idf]).tobytes(), 'd'))
+    for name, values in sorted((extra or {}).items()):
+        if not isinstance(values, array):
+            values = array('d', values)
+        sections.append((name, values.tobytes(), values.typecode))
+
+    header = dict(settings)
+    header.update({
+        'version': FORMAT_VERSION,
+        'byteorder': sys.byteorder,
+        'classes': classes,
+        'n_features': n_features,
+        'n_terms': len(encoded),
+        'sections': {}
+    })
+
+    # Section offsets depend on the header size, so iterate until it settles
+    header_bytes = b''
+    while True:
+        position = len(MAGIC) + 4 + len(header_bytes)
+        position += _pad(position)
+        for name, data, typecode in sections:
+            header['sections'][name] = [position, len(data), typecode]
+            position += len(data) + _pad(len(data))
+        encoded_header = json.dumps(header, sort_keys=True).encode('utf-8')
+        if len(encoded_header) == len(header_bytes):
+            header_bytes = encoded_header
+            break
+        header_bytes = encoded_header
+
+    with open(path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('=I', len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b'\0' * _pad(f.tell()))
+        for name, data, _ in sections:
+            assert f.tell() == header['sections'][name][0]
+            f.write(data)
+            f.write(b'\0' * _pad(len(data)))
+        return f.tell()
+
+
+def export_model(model, vectorizer, path):
+    """
+    Export a fitted scikit-learn vectorizer and linear classifier.
+
+    Args:
+        model: Classifier with coef_/intercept_ or feature_log_prob_
+        vectorizer: Fitted CountVectorizer or TfidfVectorizer
+        path (str): Output file
+
+    Returns:
+        int: Size of the written file in bytes
+    """
+    settings, idf = _vectorizer_settings(vectorizer)
+    classes, coef_rows, intercepts = _classifier_weights(model)
+    terms = {str(term): int(index) for term, index in vectorizer.vocabulary_.items()}
+    return write_model(path, settings, classes, terms, coef_rows, intercepts,
+                       idf=idf.tolist() if idf is not None else None)
+
+
+class MappedIntentModel:
+    """Read-only intent classifier backed by a memory-mapped model file."""
+
+    def __init__(self, path):
+        """
+        Map a model file.
+
+        Args:
+            path (str): File written by export_model or write_model
+        """
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not an intent model file")
+
+        header_length, = struct.unpack_from('=I', self._mmap, len(MAGIC))
+        start = len(MAGIC) + 4
+        header = json.loads(self._mmap[start:start + header_length].decode('utf-8'))
+        if header['version'] != FORMAT_VERSION or header['byteorder'] != sys.byteorder:
+            self._mmap.close()
+            raise ValueError(f"{path} was written for a different format or byte order")
+
+        self.header = header
+        self.classes = header['classes']
+        self.n_features = header['n_features']
+        self._n_terms = header['n_terms']
+        self._hashed = header.get('featurizer') == 'hash'
+        self._token_pattern = re.compile(header['token_pattern'])
+        self._stop_words = frozenset(header['stop_words'])
+
+        self._view = memoryview(self._mmap)
+        self._sections = {}
+        for name, (offset, length, typecode) in header['sections'].items():
+            self._sections[name] = self._view[offset:offset + length].cast(typecode)
+        self._term_offsets = self._sections['term_offsets']
+        self._term_index = self._sections['term_index']
+        self._term_blob = self._sections['term_blob']
+        self._coef = self._sections['coef']
+        self._intercept = self._sections['intercept']
+        self._idf = self._sections.get('idf')
+
+    def close(self):
+        """Release the mapping."""
+        for section in self._sections.values():
+            section.release()
+        self._sections = {}
+        self._view.release()
+        self._mmap.close()
+
+    def _term(self, position):
+        """Term bytes stored at a sorted position."""
+        return self._term_blob[self._term_offsets[position]:self._term_offsets[position + 1]].tobytes()
+
+    def section(self, name):
+        """Get a mapped section by name, or None if the file has none."""
+        return self._sections.get(name)
+
+    def feature_index(self, term):
+        """
+        Look up a term's feature index by binary search over the mapped terms.
+
+        Hashed models have no terms; every term maps to its hash bucket.
+
+        Returns:
+            int or None: Feature index, or None for unknown terms
+        """
+        if self._hashed:
+            return hash_feature(term, self.n_features)
+        key = term.encode('utf-8')
+        low, high = 0, self._n_terms
+        while low < high:
+            mid = (low + high) // 2
+            if self._term(mid) < key:
+                low = mid + 1
+            else:
+                high = mid
+        if low < self._n_terms and self._term(low) == key:
+            return self._term_index[low]
+        return None
+
+    def _terms(self, text):
+        """Split text into word n-grams the way the exported vectorizer did."""
+        # A PreprocessedMessage already holds the lowercased text
+        if isinstance(text, PreprocessedMessage):
+            text = text.lower if self.header['lowercase'] else text.raw
+        elif self.header['lowercase']:
+            text = text.lower()
+        return extract_terms(text, self._token_pattern, self.header['ngram_range'], self._stop_words)
+
+    def features(self, text):
+        """
+        Vectorize text into sparse weighted features.
+
+        Returns:
+            dict: Feature index -> weight
+        """
+        counts = {}
+        for term in self._terms(text):
+            index = self.feature_index(term)
+            if index is not None:
+                counts[index] = counts.get(index, 0) + 1
+
+        header = self.header
+        for index, count in counts.items():
+            if header['binary']:
+                count = 1
+            elif header['sublinear_tf']:
+                count = 1 + math.log(count)
+            if self._idf is not None:
+                count *= self._idf[index]
+            counts[index] = float(count)
+
+        if header['norm'] == 'l2':
+            length = math.sqrt(sum(value * value for value in counts.values()))
+        elif header['norm'] == 'l1':
+            length = sum(abs(value) for value in counts.values())
+        else:
+            length = 0
+        if length:
+            counts = {index: value / length for index, value in counts.items()}
+        return counts
+
+    def decision_function(self, text):
+        """Get one score per decision row for text."""
+        features = self.features(text)
+        coef = self._coef
+        n_features = self.n_features
+        scores = []
+        for row, intercept in enumerate(self._intercept):
+            base = row * n_features
+            scores.append(intercept + sum(coef[base + index] * value for index, value in features.items()))
+        return scores
+
+    def predict_one(self, text):
+        """
+        Predict the intent tag of one message.
+
+        Args:
+            text (str or PreprocessedMessage): User message
+
+        Returns:
+            str: Predicted tag
+        """
+        scores = self.decision_function(text)
+        if len(scores) == 1:
+            return self.classes[1] if scores[0] > 0 else self.classes[0]
+        return self.classes[max(range(len(scores)), key=scores.__getitem__)]
+
+    def predict(self, texts):
+        """Predict intent tags for a list of messages."""
+        return [self.predict_one(text) for text in texts]
+
+
+def main(argv=None):
+    """Export pickled model and vectorizer files to the mapped format."""
+    import argparse
+    import pickle
+
+    parser = argparse.ArgumentParser(description="Export a pickled intent model to the mapped format.")
+    parser.add_argument('model', help='pickled classifier, e.g. chatbot_model.pkl')
+    parser.add_argument('vectorizer', help='pickled vectorizer, e.g. vectorizer.pkl')
+    parser.add_argument('output', help='model file to write, e.g. intent_model.bin')
+    args = parser.parse_args(argv)
+
+    with open(args.model, 'rb') as f:
+        model = pickle.load(f)
+    with open(args.vectorizer, 'rb') as f:
+        vectorizer = pickle.load(f)
+    size = export_model(model, vectorizer, args.output)
+    print(f"Wrote {args.output} ({size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""Intent model training with hashed features and incremental updates.
+
+IntentTrainer fits a multinomial Naive Bayes classifier over hashed word
+n-gram counts. Terms map straight to crc32(term) % n_features, so neither
+training nor prediction keeps a vocabulary in memory, and the model size
+is fixed by n_features and the number of intents.
+
+Naive Bayes only needs per-intent term counts, so the counts are stored in
+the model file next to the weights: an update loads them, adds the new
+examples and rewrites the weights, giving exactly the model a full retrain
+on all the data would.
+"""
+
+from array import array
+import json
+import math
+import os
+import re
+import time
+from src.intent_model import MappedIntentModel, extract_terms, hash_feature, write_model
+from config import INTENT_HASH_FEATURES, INTENT_HISTORY_THRESHOLD
+
+# Same tokenization as scikit-learn's default word analyzer
+TOKEN_PATTERN = r"(?u)\b\w\w+\b"
+
+
+class IntentTrainer:
+    """Accumulates hashed term counts per intent and derives Naive Bayes weights."""
+
+    def __init__(self, n_features=INTENT_HASH_FEATURES, ngram_range=(1, 2), alpha=1.0):
+        """
+        Initialize an empty trainer.
+
+        Args:
+            n_features (int): Hash buckets, the length of each weight row
+            ngram_range (tuple): (min_n, max_n) word n-gram lengths
+            alpha (float): Additive smoothing for unseen terms
+        """
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.alpha = alpha
+        self.classes = []
+        self.class_counts = []
+        # One dense count row per intent
+        self.feature_counts = []
+        self._token_pattern = re.compile(TOKEN_PATTERN)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Resume from a model file written by save().
+
+        Raises:
+            ValueError: If the file holds no training counts, e.g. one
+                exported from scikit-learn
+        """
+        model = MappedIntentModel(path)
+        try:
+            header = model.header
+            keys, values = model.section('count_keys'), model.section('count_values')
+            if header.get('featurizer') != 'hash' or keys is None or values is None:
+                raise ValueError(f"{path} has no training counts; train a new model instead")
+            trainer = cls(model.n_features, header['ngram_range'], header['alpha'])
+            trainer.classes = list(model.classes)
+            trainer.class_counts = list(model.section('class_counts'))
+            trainer.feature_counts = [array('d', bytes(8 * trainer.n_features)) for _ in trainer.classes]
+            for key, value in zip(keys, values):
+                row, index = divmod(key, trainer.n_features)
+                trainer.feature_counts[row][index] = value
+        finally:
+            model.close()
+        return trainer
+
+    @property
+    def examples(self):
+        """Number of examples trained on so far."""
+        return int(sum(self.class_counts))
+
+    def _class_row(self, label):
+        """Row index for an intent, adding the intent if it is new."""
+        if label not in self.classes:
+            self.classes.append(label)
+            self.class_counts.append(0.0)
+            self.feature_counts.append(array('d', bytes(8 * self.n_features)))
+        return self.classes.index(label)
+
+    def partial_fit(self, examples):
+        """
+        Add labeled examples to the counts.
+
+        Args:
+            examples (iterable): (text, intent tag) pairs
+
+        Returns:
+            int: Number of examples added
+        """
+        added = 0
+        rows = {}
+        for text, label in examples:
+            row = rows.get(label)
+            if row is None:
+                row = rows[label] = self._class_row(label)
+            self.class_counts[row] += 1
+            counts = self.feature_counts[row]
+            for term in extract_terms(text.lower(), self._token_pattern, self.ngram_range):
+                counts[hash_feature(term, self.n_features)] += 1
+            added += 1
+        return added
+
+    def weights(self):
+        """
+        Derive the classifier weights from the counts.
+
+        Returns:
+            tuple: (coef_rows, intercepts) of log term probabilities and
+            log class priors, one per intent
+        """
+        if len(self.classes) < 2:
+            raise ValueError("Training needs examples of at least two intents")
+        total = sum(self.class_counts)
+        smoothing = self.alpha * self.n_features
+        coef_rows, intercepts = [], []
+        for class_count, counts in zip(self.class_counts, self.feature_counts):
+            log_total = math.log(sum(counts) + smoothing)
+            coef_rows.append(array('d', [math.log(count + self.alpha) - log_total for count in counts]))
+            intercepts.append(math.log(class_count / total))
+        return coef_rows, intercepts
+
+    def save(self, path):
+        """
+        Write the model and its counts, replacing path atomically.
+
+        Processes that already mapped the old file keep reading it until
+        they reload.
+
+        Returns:
+            int: Size of the written file in bytes
+        """
+        coef_rows, intercepts = self.weights()
+        keys, values = array('q'), array('d')
+        for row, counts in enumerate(self.feature_counts):
+            base = row * self.n_features
+            for index, count in enumerate(counts):
+                if count:
+                    keys.append(base + index)
+                    values.append(count)
+        settings = {
+            'featurizer': 'hash',
+            'lowercase': True,
+            'token_pattern': TOKEN_PATTERN,
+            'ngram_range': list(self.ngram_range),
+            'stop_words': [],
+            'binary': False,
+            'sublinear_tf': False,
+            'norm': None,
+            'use_idf': False,
+            'alpha': self.alpha
+        }
+        extra = {'class_counts': self.class_counts, 'count_keys': keys, 'count_values': values}
+        tmp_path = path + '.tmp'
+        size = write_model(tmp_path, settings, self.classes, {}, coef_rows, intercepts, extra=extra)
+        os.replace(tmp_path, path)
+        return size
+
+
+def intent_examples(intents_file):
+    """
+    Read (pattern, tag) examples from an intents file.
+
+    Returns:
+        list: One example per pattern
+    """
+    with open(intents_file, 'r', encoding='utf-8') as f:
+        intents = json.load(f)
+    return [(pattern, intent['tag']) for intent in intents['intents'] for pattern in intent['patterns']]
+
+
+def history_examples(history_file, tags, index=None, threshold=INTENT_HISTORY_THRESHOLD):
+    """
+    Read labeled user messages from a saved conversation.
+
+    Saved conversations carry no intent labels of their own. A message
+    with an 'intent' field naming a known tag uses it; any other message is
+    labeled with the index's best intent when that intent's patterns are
+    similar enough, and skipped otherwise. Sentiment labels are never used
+    as intents.
+
+    Args:
+        history_file (str): File written by ConversationManager.save_to_file
+        tags (set): Intent tags the model may learn
+        index (IntentIndex, optional): Labels unlabeled messages; without
+            it only explicitly labeled messages are used
+        threshold (float): Lowest cosine similarity accepted as a label
+
+    Returns:
+        list: (text, tag) examples
+    """
+    with open(history_file, 'r', encoding='utf-8') as f:
+        conversation = json.load(f)
+    examples = []
+    for message in conversation.get('messages', []):
+        if message.get('sender') != 'user' or not message.get('text'):
+            continue
+        tag = message.get('intent')
+        if tag is None and index is not None:
+            match = index.match(message['text'], threshold)
+            tag = match[0] if match else None
+        if tag in tags:
+            examples.append((message['text'], tag))
+    return examples
+
+
+def labeled_examples(path):
+    """
+    Read examples from a JSONL file of {"text": ..., "intent": ...} records.
+
+    Returns:
+        list: (text, tag) examples
+    """
+    examples = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                examples.append((record['text'], record['intent']))
+    return examples
+
+
+def evaluate(path, examples):
+    """
+    Measure a model file's accuracy and per-message prediction latency.
+
+    Args:
+        path (str): Model file
+        examples (list): (text, tag) pairs to predict
+
+    Returns:
+        dict: load_ms, accuracy and mean latency_us per message
+    """
+    start = time.perf_counter()
+    model = MappedIntentModel(path)
+    load_ms = (time.perf_counter() - start) * 1000
+    try:
+        correct = 0
+        start = time.perf_counter()
+        for text, tag in examples:
+            correct += model.predict_one(text) == tag
+        elapsed = time.perf_counter() - start
+    finally:
+        model.close()
+    count = len(examples) or 1
+    return {
+        'load_ms': load_ms,
+        'accuracy': correct / count,
+        'latency_us': elapsed / count * 1e6
+    }
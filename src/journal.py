@@ -0,0 +1,176 @@
+"""Append-only JSONL journal for conversation persistence.
+
+Every add_message appends one record, so the cost of persisting a turn
+does not grow with the conversation. Compaction turns a journal into the
+summary format written by ConversationManager.save_to_file.
+
+Record types:
+    {"type": "start", "start_time": "<iso>"}   begins (or restarts) a conversation
+    {"type": "message", "message": {...}}      one message dict
+
+Compact a journal from the command line:
+    python -m src.journal data/journals/<session>.jsonl data/conversation_history.json
+"""
+
+from datetime import datetime
+import json
+import os
+from config import JOURNAL_FLUSH_EVERY, JOURNAL_FSYNC_EVERY
+
+
+def _drop_torn_tail(path, chunk_size=4096):
+    """
+    Truncate a journal back to its last complete line.
+    
+    A crash mid-write leaves a partial last record with no newline;
+    appending after it would merge the next record into that line and
+    hide every record after it from load_conversation.
+    """
+    try:
+        f = open(path, 'r+b')
+    except FileNotFoundError:
+        return
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(position - chunk_size, 0)
+            f.seek(start)
+            chunk = f.read(position - start)
+            newline = chunk.rfind(b'\n')
+            if newline != -1:
+                keep = start + newline + 1
+                break
+            position = start
+        else:
+            keep = 0
+        if keep < end:
+            f.truncate(keep)
+
+
+class ConversationJournal:
+    """Buffered append-only writer for conversation records."""
+    
+    def __init__(self, path, flush_every=JOURNAL_FLUSH_EVERY, fsync_every=JOURNAL_FSYNC_EVERY):
+        """
+        Open a journal for appending.
+        
+        Args:
+            path (str): Journal file, created if missing
+            flush_every (int): Hand buffered records to the OS every N records
+                so they survive a process crash; 0 flushes only on close
+            fsync_every (int): Also fsync every N records so they survive
+                a machine crash; 0 never fsyncs
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.flush_every = flush_every
+        self.fsync_every = fsync_every
+        self.records_written = 0
+        _drop_torn_tail(path)
+        self._file = open(path, 'a', encoding='utf-8')
+    
+    def _write(self, record):
+        """Append one record and apply the flush and fsync batching."""
+        self._file.write(json.dumps(record) + '\n')
+        self.records_written += 1
+        if self.fsync_every and self.records_written % self.fsync_every == 0:
+            self.flush(sync=True)
+        elif self.flush_every and self.records_written % self.flush_every == 0:
+            self._file.flush()
+    
+    def start(self, start_time):
+        """Record the start of a conversation."""
+        self._write({'type': 'start', 'start_time': start_time.isoformat()})
+    
+    def append(self, message):
+        """Record one message dict."""
+        self._write({'type': 'message', 'message': message})
+    
+    def flush(self, sync=False):
+        """Flush buffered records, and fsync them if sync is set."""
+        self._file.flush()
+        if sync:
+            os.fsync(self._file.fileno())
+    
+    def close(self):
+        """Flush, fsync and close the journal."""
+        if not self._file.closed:
+            self.flush(sync=True)
+            self._file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def load_conversation(path, journal=None):
+    """
+    Rebuild a ConversationManager by replaying a journal.
+    
+    A truncated final line, as left by a crash mid-write, is ignored.
+    
+    Args:
+        path (str): Journal file
+        journal (ConversationJournal, optional): Journal the rebuilt
+            conversation appends new messages to
+            
+    Returns:
+        ConversationManager: The last conversation in the journal
+    """
+    from src.conversation_manager import ConversationManager
+    
+    conversation = ConversationManager()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if record['type'] == 'start':
+                conversation.clear()
+                conversation.start_time = datetime.fromisoformat(record['start_time'])
+            elif record['type'] == 'message':
+                conversation.restore_message(record['message'])
+    conversation.journal = journal
+    return conversation
+
+
+def compact(path, filename='data/conversation_history.json'):
+    """
+    Write a journal out in the save_to_file summary format.
+    
+    The duration runs to the last journaled message rather than to now.
+    
+    Args:
+        path (str): Journal file
+        filename (str): Summary JSON to write
+        
+    Returns:
+        bool: True if the summary was written
+    """
+    conversation = load_conversation(path)
+    messages = conversation.get_all_messages()
+    end_time = datetime.fromisoformat(messages[-1]['timestamp']) if messages else conversation.start_time
+    return conversation.save_to_file(filename, duration=(end_time - conversation.start_time).total_seconds())
+
+
+def main():
+    """Compact a journal into a conversation summary file."""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Compact a conversation journal.")
+    parser.add_argument('journal', help='journal file to read')
+    parser.add_argument('output', nargs='?', default='data/conversation_history.json')
+    args = parser.parse_args()
+    
+    if compact(args.journal, args.output):
+        print(f"Compacted {args.journal} into {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""Sentence-chunked parallel scoring for very long messages.
+
+A long message is split on sentence boundaries, the sentences are grouped
+into one contiguous chunk per worker and the chunks are scored on a
+process pool, so latency grows with text length divided by core count.
+The result has the usual score/label/detailed_scores keys, aggregated over
+sentences weighted by word count, plus a 'sentences' list with each
+sentence's own result.
+"""
+
+import os
+import re
+import threading
+from src import workers
+from src.sentiment_analyzer import label_for_score
+from config import LONG_TEXT_WORKERS, LONG_TEXT_MIN_CHUNK
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def split_sentences(text):
+    """
+    Split text after sentence-ending punctuation and at line breaks.
+
+    Returns:
+        list: Non-empty, stripped sentences in order
+    """
+    return [sentence.strip() for sentence in _SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+
+def worker_count():
+    """Number of processes in the long-text pool."""
+    return LONG_TEXT_WORKERS or os.cpu_count() or 1
+
+
+def get_executor():
+    """Get the process pool for long texts, starting it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = workers.create_executor('process', worker_count())
+    return _executor
+
+
+def chunk_sentences(sentences, chunks, min_chunk=LONG_TEXT_MIN_CHUNK):
+    """
+    Group sentences into contiguous chunks of roughly equal length.
+
+    Args:
+        sentences (list): Sentences in order
+        chunks (int): Most chunks to produce
+        min_chunk (int): Fewest characters worth shipping to a worker
+
+    Returns:
+        list: Lists of sentences, concatenating back to the input
+    """
+    total = sum(len(sentence) for sentence in sentences)
+    chunks = max(1, min(chunks, len(sentences), total // max(min_chunk, 1)))
+    target = total / chunks
+    groups, current, size = [], [], 0
+    for sentence in sentences:
+        current.append(sentence)
+        size += len(sentence)
+        if size >= target * (len(groups) + 1) and len(groups) < chunks - 1:
+            groups.append(current)
+            current = []
+    if current:
+        groups.append(current)
+    return groups
+
+
+def aggregate(sentences, results):
+    """
+    Combine per-sentence results into one message result.
+
+    Args:
+        sentences (list): Sentence texts
+        results (list): analyze_message-style result per sentence
+
+    Returns:
+        dict: score, label and detailed_scores averaged by sentence word
+        count, plus 'sentences' with each sentence's text and result
+    """
+    weights = [max(len(sentence.split()), 1) for sentence in sentences]
+    total = float(sum(weights)) or 1.0
+    score = sum(weight * result['score'] for weight, result in zip(weights, results)) / total
+    detailed = {}
+    for weight, result in zip(weights, results):
+        for key, value in result['detailed_scores'].items():
+            detailed[key] = detailed.get(key, 0.0) + weight * value
+    return {
+        'score': score,
+        'label': label_for_score(score),
+        'detailed_scores': {key: value / total for key, value in detailed.items()},
+        'sentences': [dict(result, text=sentence) for sentence, result in zip(sentences, results)]
+    }
+
+
+def score_long_text(text, analyzer, executor=None, chunks=None):
+    """
+    Score a long message sentence by sentence across a worker pool.
+
+    Args:
+        text (str): The message to score
+        analyzer (SentimentAnalyzer): Scores in-process when only one
+            chunk is worth making; its method and scorer settings are
+            used by the workers
+        executor (Executor, optional): Pool to use, defaults to the
+            shared long-text process pool
+        chunks (int, optional): Most chunks, defaults to the pool size
+
+    Returns:
+        dict: Aggregated result with per-sentence results
+    """
+    sentences = split_sentences(text) or [text]
+    groups = chunk_sentences(sentences, chunks or worker_count())
+    if len(groups) == 1:
+        # A single sentence may itself be over the threshold; don't split it again
+        results = analyzer.analyze_batch(sentences, long_text=False)
+    else:
+        executor = executor or get_executor()
+        # Workers score with the caller's settings, which its cache key promises
+        futures = [executor.submit(workers.analyze_batch, group, method=analyzer.method,
+                                   fast_textblob=analyzer.fast_textblob,
+                                   neutral_prefilter=analyzer.neutral_prefilter)
+                   for group in groups]
+        results = [result for future in futures for result in future.result()]
+    return aggregate(sentences, results)
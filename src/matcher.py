@@ -0,0 +1,99 @@
+"""Word-boundary aware multi-pattern keyword matching."""
+
+import re
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+(?:'[a-z0-9]+)*")
+
+
+def tokenize(text):
+    """Split text into lowercase word tokens."""
+    return WORD_PATTERN.findall(text.lower())
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over word tokens.
+
+    Phrases only match on whole words, so 'hi' does not fire inside
+    'this'. All phrases are found in a single pass over the input and the
+    match with the highest priority (earliest added) wins.
+    """
+
+    def __init__(self, rules):
+        """
+        Build the automaton.
+
+        Args:
+            rules (list): (phrase, value) pairs in priority order
+        """
+        # Per node: word transitions, failure link and best (priority, value)
+        self._goto = [{}]
+        self._fail = [0]
+        self._best = [None]
+
+        for priority, (phrase, value) in enumerate(rules):
+            self._add(tokenize(phrase), priority, value)
+        self._link()
+
+    def __len__(self):
+        """Number of states in the automaton."""
+        return len(self._goto)
+
+    def _add(self, words, priority, value):
+        """Insert one phrase; an earlier phrase with the same words wins."""
+        if not words:
+            return
+        node = 0
+        for word in words:
+            next_node = self._goto[node].get(word)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._best.append(None)
+                self._goto[node][word] = next_node
+            node = next_node
+        if self._best[node] is None:
+            self._best[node] = (priority, value)
+
+    def _link(self):
+        """Compute failure links and fold suffix matches into each state."""
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for word, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and word not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(word, 0)
+                self._fail[child] = target if target != child else 0
+
+                inherited = self._best[self._fail[child]]
+                if inherited is not None and (self._best[child] is None or inherited[0] < self._best[child][0]):
+                    self._best[child] = inherited
+                queue.append(child)
+
+    def match(self, text):
+        """
+        Find the highest-priority phrase occurring in text.
+
+        Args:
+            text (str or list): Raw text or pre-tokenized words
+
+        Returns:
+            The value of the winning rule, or None if nothing matched
+        """
+        words = tokenize(text) if isinstance(text, str) else text
+        goto = self._goto
+        fail = self._fail
+        best = None
+        node = 0
+        for word in words:
+            while node and word not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(word, 0)
+            found = self._best[node]
+            if found is not None and (best is None or found[0] < best[0]):
+                best = found
+                if best[0] == 0:
+                    break
+        return best[1] if best is not None else None
@@ -0,0 +1,146 @@
+"""Compact columnar storage for conversation messages.
+
+Instead of one dict (plus a nested sentiment dict and detailed_scores
+dict) per message, CompactMessageLog keeps one typed array per field:
+sender and label as small interned codes, timestamps as float epochs and
+scores as floats. Message dicts are only built when asked for.
+"""
+
+from array import array
+from datetime import datetime
+
+_NO_SENTIMENT = -1
+
+
+class CompactMessageLog:
+    """Append-only message log stored as parallel arrays."""
+
+    def __init__(self):
+        """Initialize an empty log."""
+        self._senders = array('b')
+        self._texts = []
+        self._timestamps = array('d')
+        self._labels = array('b')
+        self._scores = array('d')
+        self._schemas = array('b')
+        self._detail_offsets = array('L', [0])
+        self._detail_values = array('d')
+        # Interned sender names, labels and detailed_scores key tuples
+        self._sender_names = ['user', 'bot']
+        self._label_names = ['Positive', 'Negative', 'Neutral']
+        self._schema_keys = [('positive', 'negative', 'neutral'), ('polarity', 'subjectivity')]
+        # Messages whose sentiment or timestamp does not fit the columns
+        self._extras = {}
+
+    def __len__(self):
+        return len(self._texts)
+
+    def __iter__(self):
+        return (self.message_at(index) for index in range(len(self._texts)))
+
+    @staticmethod
+    def _intern(names, name):
+        """Get the code of name in an interning list, adding it if new."""
+        try:
+            return names.index(name)
+        except ValueError:
+            names.append(name)
+            return len(names) - 1
+
+    def _append_sentiment(self, sentiment):
+        """Store sentiment columns; return False if it needs the dict kept."""
+        if sentiment is None:
+            self._labels.append(_NO_SENTIMENT)
+            self._scores.append(0.0)
+            self._schemas.append(_NO_SENTIMENT)
+            self._detail_offsets.append(self._detail_offsets[-1])
+            return True
+
+        detailed = sentiment.get('detailed_scores')
+        if (sentiment.keys() != {'score', 'label', 'detailed_scores'} or not isinstance(detailed, dict)
+                or not all(type(value) is float for value in detailed.values())
+                or type(sentiment['score']) is not float):
+            return False
+
+        self._labels.append(self._intern(self._label_names, sentiment['label']))
+        self._scores.append(sentiment['score'])
+        self._schemas.append(self._intern(self._schema_keys, tuple(detailed)))
+        self._detail_values.extend(detailed.values())
+        self._detail_offsets.append(len(self._detail_values))
+        return True
+
+    def append(self, sender, text, timestamp, sentiment=None):
+        """
+        Add a message.
+
+        Args:
+            sender (str): 'user' or 'bot'
+            text (str): Message content
+            timestamp (float): Seconds since the epoch
+            sentiment (dict, optional): Sentiment analysis results
+        """
+        index = len(self._texts)
+        self._senders.append(self._intern(self._sender_names, sender))
+        self._texts.append(text)
+        self._timestamps.append(timestamp)
+        if not self._append_sentiment(sentiment):
+            self._append_sentiment(None)
+            self._extras[index] = {'sentiment': sentiment}
+
+    def append_dict(self, message):
+        """
+        Add a message dict as stored by ConversationManager.
+
+        Timestamps that do not survive a float round trip are kept as given.
+        """
+        timestamp = datetime.fromisoformat(message['timestamp'])
+        index = len(self._texts)
+        self.append(message['sender'], message['text'], timestamp.timestamp(), message['sentiment'])
+        if timestamp.tzinfo is not None or self._format_timestamp(index) != message['timestamp']:
+            self._extras.setdefault(index, {})['timestamp'] = message['timestamp']
+
+    def _format_timestamp(self, index):
+        """ISO timestamp string of a stored message."""
+        return datetime.fromtimestamp(self._timestamps[index]).isoformat()
+
+    def sender_at(self, index):
+        """Sender of a stored message."""
+        return self._sender_names[self._senders[index]]
+
+    def message_at(self, index):
+        """
+        Materialize one message dict.
+
+        Returns:
+            dict: Same shape as ConversationManager stores in dict mode
+        """
+        extra = self._extras.get(index, {})
+        if 'sentiment' in extra:
+            sentiment = extra['sentiment']
+        elif self._labels[index] == _NO_SENTIMENT:
+            sentiment = None
+        else:
+            keys = self._schema_keys[self._schemas[index]]
+            values = self._detail_values[self._detail_offsets[index]:self._detail_offsets[index + 1]]
+            sentiment = {
+                'score': self._scores[index],
+                'label': self._label_names[self._labels[index]],
+                'detailed_scores': dict(zip(keys, values))
+            }
+        return {
+            'sender': self.sender_at(index),
+            'text': self._texts[index],
+            'timestamp': extra.get('timestamp') or self._format_timestamp(index),
+            'sentiment': sentiment
+        }
+
+    def to_dicts(self):
+        """Materialize every message as a dict."""
+        return list(self)
+
+    def texts_from(self, sender):
+        """Texts of every message from one sender, without building dicts."""
+        if sender not in self._sender_names:
+            return []
+        code = self._sender_names.index(sender)
+        return [text for text, sender_code in zip(self._texts, self._senders) if sender_code == code]
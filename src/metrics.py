@@ -0,0 +1,185 @@
+"""Per-stage latency instrumentation with Prometheus and JSON export.
+
+Stages are timed with::
+
+    with get_metrics().timer('sentiment'):
+        ...
+
+When metrics are disabled, timer() returns a shared no-op context manager,
+so instrumented code pays one attribute check per stage.
+"""
+
+from bisect import bisect_left
+import json
+import math
+import threading
+import time
+from config import METRICS_ENABLED
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class _NullTimer:
+    """Context manager that records nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer:
+    """Context manager that records the elapsed time of one stage."""
+
+    __slots__ = ('_metrics', '_stage', '_start')
+
+    def __init__(self, metrics, stage):
+        self._metrics = metrics
+        self._stage = stage
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._metrics.observe(self._stage, time.perf_counter() - self._start)
+        return False
+
+
+class _Histogram:
+    """Latency histogram for one stage."""
+
+    __slots__ = ('counts', 'total', 'count')
+
+    def __init__(self, size):
+        self.counts = [0] * size
+        self.total = 0.0
+        self.count = 0
+
+
+class MetricsRegistry:
+    """Collects per-stage latency histograms, call counts and counters."""
+
+    def __init__(self, enabled=METRICS_ENABLED, buckets=DEFAULT_BUCKETS, prefix='chatbot'):
+        """
+        Initialize the registry.
+
+        Args:
+            enabled (bool): Record observations; when False every call is a no-op
+            buckets (tuple): Histogram upper bounds in seconds
+            prefix (str): Metric name prefix for Prometheus export
+        """
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.prefix = prefix
+        self._stages = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def timer(self, stage):
+        """
+        Time a block of code as one stage.
+
+        Args:
+            stage (str): Stage name, e.g. 'sentiment'
+
+        Returns:
+            Context manager that records the block's duration
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, stage)
+
+    def observe(self, stage, seconds):
+        """Record one stage duration."""
+        if not self.enabled:
+            return
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self._stages.get(stage)
+            if histogram is None:
+                histogram = self._stages[stage] = _Histogram(len(self.buckets) + 1)
+            histogram.counts[index] += 1
+            histogram.total += seconds
+            histogram.count += 1
+
+    def increment(self, counter, amount=1):
+        """Add to a named counter."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    def reset(self):
+        """Drop every observation."""
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+    def snapshot(self):
+        """
+        Get a copy of the current metrics.
+
+        Returns:
+            dict: 'stages' with count, sum, mean and cumulative buckets per
+            stage, and 'counters'
+        """
+        with self._lock:
+            stages = {}
+            for stage, histogram in self._stages.items():
+                cumulative, running = [], 0
+                for bound, count in zip(self.buckets + (math.inf,), histogram.counts):
+                    running += count
+                    cumulative.append(['+Inf' if bound == math.inf else bound, running])
+                stages[stage] = {
+                    'count': histogram.count,
+                    'sum_seconds': histogram.total,
+                    'mean_seconds': histogram.total / histogram.count if histogram.count else 0.0,
+                    'buckets': cumulative
+                }
+            return {'stages': stages, 'counters': dict(self._counters)}
+
+    def to_json(self):
+        """Export the snapshot as JSON text."""
+        return json.dumps(self.snapshot(), indent=2, sort_keys=True)
+
+    def to_prometheus(self):
+        """Export the snapshot in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        name = f"{self.prefix}_stage_latency_seconds"
+        lines = [
+            f"# HELP {name} Latency of each pipeline stage.",
+            f"# TYPE {name} histogram"
+        ]
+        for stage, stats in sorted(snapshot['stages'].items()):
+            for bound, count in stats['buckets']:
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {count}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {stats["sum_seconds"]}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {stats["count"]}')
+        for counter, value in sorted(snapshot['counters'].items()):
+            counter_name = f"{self.prefix}_{counter}_total"
+            lines.append(f"# TYPE {counter_name} counter")
+            lines.append(f"{counter_name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, prometheus_file=None, json_file=None):
+        """Write the Prometheus and/or JSON exports to files."""
+        if prometheus_file:
+            with open(prometheus_file, 'w') as f:
+                f.write(self.to_prometheus())
+        if json_file:
+            with open(json_file, 'w') as f:
+                f.write(self.to_json())
+
+
+_metrics = MetricsRegistry()
+
+
+def get_metrics():
+    """Get the process-wide metrics registry."""
+    return _metrics
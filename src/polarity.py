@@ -0,0 +1,262 @@
+"""Fast polarity/subjectivity scoring over TextBlob's pattern lexicon.
+
+TextBlob(text).sentiment builds a blob object, runs pattern's general
+purpose tokenizer and then walks the lexicon through a lazily loaded
+dict of dicts. PatternPolarityScorer loads the same en-sentiment.xml once
+into a flat word -> (polarity, subjectivity, intensity, is_modifier)
+lookup and reproduces pattern's assessment rules (modifiers, negation,
+exclamation marks, sarcasm marks and emoticons) directly, without
+importing textblob or nltk.
+"""
+
+import importlib.util
+import os
+import re
+import threading
+from xml.etree import ElementTree
+
+# Constants below mirror textblob._text so scores match TextBlob's
+PUNCTUATION = ".,;:!?()[]{}`''\"@#$^&*+-|=~_"
+_SPLIT_PUNCTUATION = tuple(PUNCTUATION.replace(".", ""))
+_TRAILING_PUNCTUATION = _SPLIT_PUNCTUATION + (".",)
+
+_ABBREVIATIONS = {
+    "a.", "adj.", "adv.", "al.", "a.m.", "c.", "cf.", "comp.", "conf.", "def.",
+    "ed.", "e.g.", "esp.", "etc.", "ex.", "f.", "fig.", "gen.", "id.", "i.e.",
+    "int.", "l.", "m.", "Med.", "Mil.", "Mr.", "n.", "n.q.", "orig.", "pl.",
+    "pred.", "pres.", "p.m.", "ref.", "v.", "vs.", "w/"
+}
+_RE_ABBR1 = re.compile(r"^[A-Za-z]\.$")
+_RE_ABBR2 = re.compile(r"^([A-Za-z]\.)+$")
+_RE_ABBR3 = re.compile("^[A-Z][" + "|".join("bcdfghjklmnpqrstvwxz") + "]+.$")
+
+_EMOTICONS = (
+    (+1.00, ("<3", "♥")),
+    (+1.00, (">:D", ":-D", ":D", "=-D", "=D", "X-D", "x-D", "XD", "xD", "8-D")),
+    (+0.75, (">:P", ":-P", ":P", ":-p", ":p", ":-b", ":b", ":c)", ":o)", ":^)")),
+    (+0.50, (">:)", ":-)", ":)", "=)", "=]", ":]", ":}", ":>", ":3", "8)", "8-)")),
+    (+0.25, (">;]", ";-)", ";)", ";-]", ";]", ";D", ";^)", "*-)", "*)")),
+    (+0.05, (">:o", ":-O", ":O", ":o", ":-o", "o_O", "o.O", "°O°", "°o°")),
+    (-0.25, (">:/", ":-/", ":/", ":\\", ">:\\", ":-.", ":-s", ":s", ":S", ":-S", ">.>")),
+    (-0.75, (">:[", ":-(", ":(", "=(", ":-[", ":[", ":{", ":-<", ":c", ":-c", "=/")),
+    (-1.00, (":'(", ":'''(", ";'(")),
+)
+# Lowercased emoticon -> polarity; the first group listing it wins
+_EMOTICON_POLARITY = {}
+for _polarity, _faces in _EMOTICONS:
+    for _face in _faces:
+        _EMOTICON_POLARITY.setdefault(_face.lower(), _polarity)
+
+# Rejoins emoticons the tokenizer split apart (": )" -> ":)")
+_RE_EMOTICONS = re.compile(r"(%s)($|\s)" % "|".join(
+    r" ?".join(re.escape(char) for char in face)
+    for face in sorted((face for _, faces in _EMOTICONS for face in faces), key=len, reverse=True)
+))
+_RE_SARCASM = re.compile(r"\( ?\! ?\)")
+_RE_CONTRACTIONS = re.compile(r"(n't|'(?:ll|re|ve|d|m|s))")
+_RE_WHITESPACE = re.compile(r"\s+")
+_QUOTES = str.maketrans({quote: f" {quote} " for quote in "“”‘’'\""})
+
+_NEGATIONS = ("no", "not", "n't", "never")
+_SARCASM = "(!)"
+
+
+def default_lexicon_path():
+    """
+    Locate the en-sentiment.xml lexicon bundled with TextBlob.
+
+    The package is found without being imported, so loading the lexicon
+    does not pull in textblob or nltk.
+
+    Raises:
+        ImportError: If TextBlob is not installed
+    """
+    spec = importlib.util.find_spec('textblob')
+    if spec is None or not spec.submodule_search_locations:
+        raise ImportError("TextBlob is required for the 'textblob' sentiment method")
+    return os.path.join(list(spec.submodule_search_locations)[0], 'en', 'en-sentiment.xml')
+
+
+def _mean(values):
+    return sum(values) / float(len(values) or 1)
+
+
+def load_lexicon(path):
+    """
+    Load a pattern sentiment lexicon into a flat lookup.
+
+    Word senses are averaged per part-of-speech tag and then across tags,
+    and adverbs are derived from adjectives ("terrible" -> "terribly"),
+    as pattern does when scoring untagged text.
+
+    Args:
+        path (str): en-sentiment.xml file
+
+    Returns:
+        dict: word -> (polarity, subjectivity, intensity, is_modifier)
+    """
+    words = {}
+    for node in ElementTree.parse(path).getroot().iter('word'):
+        form = node.get('form')
+        if form:
+            scores = (float(node.get('polarity', 0.0)), float(node.get('subjectivity', 0.0)),
+                      float(node.get('intensity', 1.0)))
+            words.setdefault(form, {}).setdefault(node.get('pos'), []).append(scores)
+
+    for word, senses in words.items():
+        by_pos = {pos: [_mean(column) for column in zip(*scores)] for pos, scores in senses.items()}
+        by_pos[None] = [_mean(column) for column in zip(*by_pos.values())]
+        words[word] = by_pos
+
+    for word, by_pos in list(words.items()):
+        if 'JJ' in by_pos:
+            if word.endswith('y'):
+                word = word[:-1] + 'i'
+            if word.endswith('le'):
+                word = word[:-2]
+            adverb = words.setdefault(word + 'ly', {})
+            adverb['RB'] = adverb[None] = tuple(by_pos['JJ'])
+
+    return {
+        word: (by_pos[None][0], by_pos[None][1], by_pos[None][2], 'RB' in by_pos)
+        for word, by_pos in words.items()
+    }
+
+
+def _split_token(token, out):
+    """Split leading and trailing punctuation off one token, as pattern does."""
+    while token.startswith(_SPLIT_PUNCTUATION):
+        out.append(token[0])
+        token = token[1:]
+    tail = []
+    while token.endswith(_TRAILING_PUNCTUATION):
+        if token.endswith(_SPLIT_PUNCTUATION):
+            tail.append(token[-1])
+            token = token[:-1]
+        if token.endswith("..."):
+            tail.append("...")
+            token = token[:-3].rstrip(".")
+        if token.endswith("."):
+            if (token in _ABBREVIATIONS or _RE_ABBR1.match(token) or _RE_ABBR2.match(token)
+                    or _RE_ABBR3.match(token)):
+                break
+            tail.append(token[-1])
+            token = token[:-1]
+    if token:
+        out.append(token)
+    out.extend(reversed(tail))
+
+
+def tokenize(text):
+    """
+    Split text into lowercased tokens the way pattern's find_tokens does.
+
+    Returns:
+        list: Tokens, with punctuation, contractions, the sarcasm mark
+        "(!)" and emoticons as tokens of their own
+    """
+    text = _RE_CONTRACTIONS.sub(r" \1", text).translate(_QUOTES)
+    tokens = []
+    for token in _RE_WHITESPACE.split(text):
+        if token.isalnum():
+            tokens.append(token)
+        elif token:
+            _split_token(token, tokens)
+    joined = _RE_SARCASM.sub(_SARCASM, " ".join(tokens))
+    joined = _RE_EMOTICONS.sub(lambda m: m.group(1).replace(" ", "") + m.group(2), joined)
+    return joined.lower().split()
+
+
+class PatternPolarityScorer:
+    """Scores polarity and subjectivity like TextBlob's PatternAnalyzer."""
+
+    def __init__(self, lexicon_path=None):
+        """
+        Initialize the scorer; the lexicon loads on first use.
+
+        Args:
+            lexicon_path (str, optional): Sentiment lexicon, defaults to
+                the one bundled with TextBlob
+        """
+        self.lexicon_path = lexicon_path
+        self._lexicon = None
+        self._lock = threading.Lock()
+
+    @property
+    def lexicon(self):
+        """Flat word lookup, loaded on first use."""
+        if self._lexicon is None:
+            with self._lock:
+                if self._lexicon is None:
+                    self._lexicon = load_lexicon(self.lexicon_path or default_lexicon_path())
+        return self._lexicon
+
+    def score(self, text):
+        """
+        Score one message.
+
+        Args:
+            text (str): The message to score
+
+        Returns:
+            tuple: (polarity, subjectivity), as TextBlob(text).sentiment
+        """
+        lexicon = self.lexicon
+        # Each assessment is [polarity, subjectivity, intensity, negated]
+        assessments = []
+        modifier = None
+        negation = None
+        for word in tokenize(text):
+            entry = lexicon.get(word)
+            if entry is not None:
+                polarity, subjectivity, intensity, is_modifier = entry
+                if modifier is None:
+                    assessments.append([polarity, subjectivity, intensity, False])
+                else:
+                    last = assessments[-1]
+                    last[0] = max(-1.0, min(polarity * last[2], 1.0))
+                    last[1] = max(-1.0, min(subjectivity * last[2], 1.0))
+                    last[2] = intensity
+                if negation is not None:
+                    assessments[-1][2] = 1.0 / assessments[-1][2]
+                    assessments[-1][3] = True
+                modifier = word if is_modifier else None
+                negation = word if word in _NEGATIONS else None
+                continue
+
+            if word in _NEGATIONS:
+                negation = word
+            elif negation and len(word.strip("'")) > 1:
+                negation = None
+            if negation is not None and modifier is not None and modifier.endswith('ly'):
+                assessments[-1][3] = True
+                negation = None
+            elif modifier and len(word) > 2:
+                modifier = None
+            if word == "!" and assessments:
+                assessments[-1][0] = max(-1.0, min(assessments[-1][0] * 1.25, 1.0))
+            if word == _SARCASM:
+                assessments.append([0.0, 1.0, 1.0, False])
+            if not word.isalpha() and len(word) <= 5 and word not in PUNCTUATION:
+                polarity = _EMOTICON_POLARITY.get(word)
+                if polarity is not None:
+                    assessments.append([polarity, 1.0, 1.0, False])
+
+        if not assessments:
+            return 0.0, 0.0
+        count = float(len(assessments))
+        # "not good" is slightly bad, "not bad" slightly good
+        polarity = sum(a[0] * -0.5 if a[3] else a[0] for a in assessments) / count
+        subjectivity = sum(a[1] for a in assessments) / count
+        return polarity, subjectivity
+
+
+_shared_scorer = None
+
+
+def get_polarity_scorer():
+    """Get the process-wide scorer, so the lexicon is loaded only once."""
+    global _shared_scorer
+    if _shared_scorer is None:
+        _shared_scorer = PatternPolarityScorer()
+    return _shared_scorer
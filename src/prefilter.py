@@ -0,0 +1,80 @@
+"""Neutral short-circuit for VADER scoring.
+
+VADER only assigns valence to tokens found in its lexicon (emoji are first
+replaced by their lexicon descriptions); boosters, negations and idioms
+just adjust that valence. A message with no lexicon hit therefore always
+scores neutral, and NeutralPrefilter answers it without a VADER pass.
+"""
+
+import string
+import threading
+from src.preprocess import as_message
+
+
+class NeutralPrefilter:
+    """Detects messages VADER would score neutral without scoring them."""
+
+    def __init__(self, analyzer):
+        """
+        Build the trigger set from a VADER analyzer's tables.
+
+        Args:
+            analyzer (SentimentIntensityAnalyzer): Analyzer whose lexicon
+                and emoji table decide what counts as a hit
+        """
+        from vaderSentiment.vaderSentiment import (
+            BOOSTER_DICT, NEGATE, SENTIMENT_LADEN_IDIOMS, SPECIAL_CASES
+        )
+        triggers = set(analyzer.lexicon)
+        triggers.update(BOOSTER_DICT, NEGATE)
+        for phrase in list(BOOSTER_DICT) + list(SENTIMENT_LADEN_IDIOMS) + list(SPECIAL_CASES):
+            triggers.update(phrase.split())
+        self.triggers = frozenset(triggers)
+        # VADER replaces emoji character by character
+        self.emoji_chars = frozenset(emoji for emoji in analyzer.emojis if len(emoji) == 1)
+        self.skipped = 0
+        self.passed = 0
+        self._lock = threading.Lock()
+
+    def _has_trigger(self, message):
+        """Check whether any token of a PreprocessedMessage could carry sentiment."""
+        if not self.emoji_chars.isdisjoint(message.raw):
+            return True
+        triggers = self.triggers
+        for token in message.words:
+            # Same punctuation stripping as VADER's SentiText
+            stripped = token.strip(string.punctuation)
+            if (stripped if len(stripped) > 2 else token).lower() in triggers:
+                return True
+        return False
+
+    def neutral_scores(self, text):
+        """
+        Get VADER's scores for text if it has no sentiment-bearing token.
+
+        Args:
+            text (str or PreprocessedMessage): The message to check
+
+        Returns:
+            dict or None: VADER polarity scores for a neutral message, or
+            None if the message needs a full VADER pass
+        """
+        message = as_message(text)
+        if self._has_trigger(message):
+            with self._lock:
+                self.passed += 1
+            return None
+        with self._lock:
+            self.skipped += 1
+        # VADER reports neu 1.0 for neutral tokens and all zeros for no tokens
+        return {'neg': 0.0, 'neu': 1.0 if message.words else 0.0, 'pos': 0.0, 'compound': 0.0}
+
+    def stats(self):
+        """Get skip counters."""
+        with self._lock:
+            checked = self.skipped + self.passed
+            return {
+                'skipped': self.skipped,
+                'passed': self.passed,
+                'skip_rate': self.skipped / checked if checked else 0.0
+            }
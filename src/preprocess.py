@@ -0,0 +1,82 @@
+"""Per-turn text preprocessing shared by every pipeline stage.
+
+A PreprocessedMessage is built once per user turn and handed to the
+sentiment cache, the neutral pre-filter, the keyword matcher and the
+intent model. Each derived form is computed on first use and kept, so no
+stage repeats a string pass another stage already made.
+"""
+
+import hashlib
+from src.matcher import WORD_PATTERN
+
+
+class PreprocessedMessage:
+    """One user message with its normalized forms, tokens and content hash."""
+
+    __slots__ = ('raw', '_normalized', '_lower', '_words', '_tokens', '_digest')
+
+    def __init__(self, text):
+        """
+        Wrap a message; derived forms are computed lazily.
+
+        Args:
+            text (str): The message as the user typed it
+        """
+        self.raw = text
+        self._normalized = None
+        self._lower = None
+        self._words = None
+        self._tokens = None
+        self._digest = None
+
+    def __repr__(self):
+        return f"PreprocessedMessage({self.raw!r})"
+
+    def __len__(self):
+        return len(self.raw)
+
+    @property
+    def normalized(self):
+        """Text with whitespace collapsed; case and punctuation are kept."""
+        if self._normalized is None:
+            self._normalized = ' '.join(self.words)
+        return self._normalized
+
+    @property
+    def lower(self):
+        """Lowercased normalized text, as the intent model vectorizes it."""
+        if self._lower is None:
+            self._lower = self.normalized.lower()
+        return self._lower
+
+    @property
+    def words(self):
+        """Whitespace-separated tokens, as VADER splits text."""
+        if self._words is None:
+            self._words = self.raw.split()
+        return self._words
+
+    @property
+    def tokens(self):
+        """Lowercase word tokens, as the keyword matcher reads text."""
+        if self._tokens is None:
+            self._tokens = WORD_PATTERN.findall(self.lower)
+        return self._tokens
+
+    @property
+    def digest(self):
+        """
+        Content hash of the normalized text.
+
+        Stable across processes and runs, so it can key shared caches.
+        """
+        if self._digest is None:
+            self._digest = hashlib.blake2b(self.normalized.encode('utf-8'), digest_size=16).digest()
+        return self._digest
+
+
+def as_message(text):
+    """Get a PreprocessedMessage for text, reusing one if text already is."""
+    if isinstance(text, PreprocessedMessage):
+        return text
+    return PreprocessedMessage(text)
@@ -1,83 +1,261 @@
-"""Sentiment analysis module using VADER and TextBlob."""
+"""Sentiment analysis module using VADER and TextBlob.
 
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from textblob import TextBlob
-from config import POSITIVE_THRESHOLD, NEGATIVE_THRESHOLD
+Both backends are imported on first use so that importing this module
+stays cheap; call SentimentAnalyzer.warmup() to load eagerly.
+"""
+
+from config import (
+    POSITIVE_THRESHOLD, NEGATIVE_THRESHOLD, NEUTRAL_PREFILTER_ENABLED, TEXTBLOB_FAST_SCORER,
+    LONG_TEXT_ENABLED, LONG_TEXT_THRESHOLD
+)
+from src.cache import copy_result
+from src.preprocess import as_message
+
+
+def label_for_score(score):
+    """Map a sentiment score to its label."""
+    if score >= POSITIVE_THRESHOLD:
+        return 'Positive'
+    elif score <= NEGATIVE_THRESHOLD:
+        return 'Negative'
+    return 'Neutral'
+
+
+def _vader_result(scores):
+    """Build a result dict from VADER polarity scores."""
+    compound = scores['compound']
+    return {
+        'score': compound,
+        'label': label_for_score(compound),
+        'detailed_scores': {
+            'positive': scores['pos'],
+            'negative': scores['neg'],
+            'neutral': scores['neu']
+        }
+    }
+
+
+def _textblob_result(sentiment):
+    """Build a result dict from a (polarity, subjectivity) sentiment tuple."""
+    polarity, subjectivity = sentiment
+    return {
+        'score': polarity,
+        'label': label_for_score(polarity),
+        'detailed_scores': {
+            'polarity': polarity,
+            'subjectivity': subjectivity
+        }
+    }
+
+
+def trend_from_halves(first_half_avg, second_half_avg):
+    """Classify the trend between first-half and second-half averages."""
+    diff = second_half_avg - first_half_avg
+    
+    if diff > 0.1:
+        return 'improving'
+    elif diff < -0.1:
+        return 'declining'
+    else:
+        return 'stable'
+
+
+def summarize_conversation(avg_score, message_count, trend):
+    """Build the overall conversation result from aggregated scores."""
+    if avg_score >= POSITIVE_THRESHOLD:
+        label = 'Positive'
+        description = 'general satisfaction'
+    elif avg_score <= NEGATIVE_THRESHOLD:
+        label = 'Negative'
+        description = 'general dissatisfaction'
+    else:
+        label = 'Neutral'
+        description = 'balanced sentiment'
+    
+    return {
+        'score': avg_score,
+        'label': label,
+        'description': description,
+        'message_count': message_count,
+        'trend': trend
+    }
 
 
 class SentimentAnalyzer:
     """Handles sentiment analysis for text messages."""
     
-    def __init__(self, method='vader'):
+    def __init__(self, method='vader', cache=None, fast_textblob=TEXTBLOB_FAST_SCORER,
+                 neutral_prefilter=NEUTRAL_PREFILTER_ENABLED, long_text=LONG_TEXT_ENABLED):
         """
         Initialize sentiment analyzer.
         
         Args:
             method (str): 'vader' or 'textblob'
+            cache (SentimentCache, optional): Result cache to consult first
+            fast_textblob (bool): Score 'textblob' with PatternPolarityScorer
+                instead of building TextBlob objects
+            neutral_prefilter (bool): Skip VADER for messages with no
+                lexicon hit
+            long_text (bool): Score messages over LONG_TEXT_THRESHOLD
+                characters sentence by sentence in parallel
         """
         self.method = method
-        if method == 'vader':
-            self.analyzer = SentimentIntensityAnalyzer()
+        self.cache = cache
+        self.fast_textblob = fast_textblob
+        self.neutral_prefilter = neutral_prefilter
+        self.long_text = long_text
+        self._analyzer = None
+        self._textblob = None
+        self._polarity_scorer = None
+        self._prefilter = None
+    
+    @property
+    def cache_key(self):
+        """Method and settings that change results, keying this analyzer's cache entries."""
+        return (self.method, self.fast_textblob, self.neutral_prefilter, self.long_text)
+    
+    @property
+    def analyzer(self):
+        """VADER analyzer, created on first use."""
+        if self._analyzer is None:
+            from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+            self._analyzer = SentimentIntensityAnalyzer()
+        return self._analyzer
+    
+    @property
+    def textblob(self):
+        """TextBlob class, imported on first use."""
+        if self._textblob is None:
+            from textblob import TextBlob
+            self._textblob = TextBlob
+        return self._textblob
+    
+    @property
+    def prefilter(self):
+        """NeutralPrefilter over the VADER lexicon, built on first use."""
+        if self._prefilter is None:
+            from src.prefilter import NeutralPrefilter
+            self._prefilter = NeutralPrefilter(self.analyzer)
+        return self._prefilter
+    
+    @property
+    def polarity_scorer(self):
+        """Shared pattern lexicon scorer, loaded on first use."""
+        if self._polarity_scorer is None:
+            from src.polarity import get_polarity_scorer
+            self._polarity_scorer = get_polarity_scorer()
+        return self._polarity_scorer
+    
+    def warmup(self):
+        """Load the backend for the configured method now instead of on first message."""
+        if self.method == 'vader':
+            if self.neutral_prefilter:
+                self.prefilter
+            self.analyzer
+        elif self.fast_textblob:
+            self.polarity_scorer.lexicon
+        else:
+            # TextBlob also loads its pattern lexicon on the first score
+            self.textblob('warmup').sentiment
     
     def analyze_message(self, text):
         """
         Analyze sentiment of a single message.
         
         Args:
-            text (str): The message to analyze
+            text (str or PreprocessedMessage): The message to analyze
             
         Returns:
             dict: Contains score, label, and detailed scores
         """
-        if self.method == 'vader':
-            return self._analyze_vader(text)
-        else:
-            return self._analyze_textblob(text)
-    
-    def _analyze_vader(self, text):
-        """Analyze using VADER sentiment."""
-        scores = self.analyzer.polarity_scores(text)
-        compound = scores['compound']
+        message = as_message(text)
+        if self.cache is not None:
+            result = self.cache.get(self.cache_key, message)
+            if result is not None:
+                return result
         
-        # Determine sentiment label
-        if compound >= POSITIVE_THRESHOLD:
-            label = 'Positive'
-        elif compound <= NEGATIVE_THRESHOLD:
-            label = 'Negative'
-        else:
-            label = 'Neutral'
+        result = self._analyze(message)
         
-        return {
-            'score': compound,
-            'label': label,
-            'detailed_scores': {
-                'positive': scores['pos'],
-                'negative': scores['neg'],
-                'neutral': scores['neu']
-            }
-        }
+        if self.cache is not None:
+            self.cache.put(self.cache_key, message, result)
+        return result
     
-    def _analyze_textblob(self, text):
-        """Analyze using TextBlob sentiment."""
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity
+    def analyze_batch(self, texts, long_text=True):
+        """
+        Analyze sentiment of many messages in one call.
         
-        # Determine sentiment label
-        if polarity >= POSITIVE_THRESHOLD:
-            label = 'Positive'
-        elif polarity <= NEGATIVE_THRESHOLD:
-            label = 'Negative'
-        else:
-            label = 'Neutral'
+        Identical messages in the batch are scored only once; each is
+        scored as analyze_message would score it.
         
-        return {
-            'score': polarity,
-            'label': label,
-            'detailed_scores': {
-                'polarity': polarity,
-                'subjectivity': blob.sentiment.subjectivity
-            }
-        }
+        Distinct messages still get one VADER or TextBlob pass each. Both
+        score a word from the words around it (negations, boosters, "but"),
+        so there is no lexicon work to share across messages, and a batch
+        of unique messages is no faster than a loop. The savings come from
+        duplicates and cache hits.
+        
+        Args:
+            texts (list): Messages to analyze
+            long_text (bool): Allow the long-text path; False when the
+                texts are already sentences of a long message
+            
+        Returns:
+            list: One result dict per message, in input order
+        """
+        # Without the long-text path, long messages get results their cache key doesn't promise
+        cache = self.cache if long_text or not self.long_text else None
+        by_text = dict.fromkeys(texts)
+        messages = {text: as_message(text) for text in by_text}
+        if cache is not None:
+            for text in by_text:
+                by_text[text] = cache.get(self.cache_key, messages[text])
+        
+        for text, result in by_text.items():
+            if result is None:
+                result = by_text[text] = self._analyze(messages[text], long_text)
+                if cache is not None:
+                    cache.put(self.cache_key, messages[text], result)
+        
+        return [copy_result(by_text[text]) for text in texts]
+    
+    def analyze_long_text(self, text, executor=None, chunks=None):
+        """
+        Analyze a long message sentence by sentence across a process pool.
+        
+        Args:
+            text (str): The message to analyze
+            executor (Executor, optional): Pool to score chunks on,
+                defaults to the shared long-text pool
+            chunks (int, optional): Most chunks, defaults to one per
+                long-text worker
+            
+        Returns:
+            dict: score, label and detailed_scores aggregated over the
+            sentences, plus 'sentences' with each sentence's result
+        """
+        from src.long_text import score_long_text
+        return score_long_text(text, self, executor=executor, chunks=chunks)
+    
+    def _analyze(self, message, long_text=True):
+        """Score a PreprocessedMessage on the path its length and the settings call for."""
+        if long_text and self.long_text and len(message) > LONG_TEXT_THRESHOLD:
+            return self.analyze_long_text(message.raw)
+        if self.method == 'vader':
+            return self._analyze_vader(message)
+        return self._analyze_textblob(message)
+    
+    def _analyze_vader(self, message):
+        """Analyze a PreprocessedMessage using VADER sentiment."""
+        if self.neutral_prefilter:
+            scores = self.prefilter.neutral_scores(message)
+            if scores is not None:
+                return _vader_result(scores)
+        return _vader_result(self.analyzer.polarity_scores(message.raw))
+    
+    def _analyze_textblob(self, message):
+        """Analyze a PreprocessedMessage using TextBlob sentiment."""
+        if self.fast_textblob:
+            return _textblob_result(self.polarity_scorer.score(message.raw))
+        return _textblob_result(self.textblob(message.raw).sentiment)
     
     def analyze_conversation(self, messages):
         """
@@ -92,27 +270,9 @@ class SentimentAnalyzer:
         if not messages:
             return {'score': 0, 'label': 'Neutral', 'message_count': 0, 'description': 'No messages', 'trend': 'stable'}
         
-        scores = [self.analyze_message(msg)['score'] for msg in messages]
+        scores = [result['score'] for result in self.analyze_batch(messages)]
         avg_score = sum(scores) / len(scores)
-        
-        # Determine overall label
-        if avg_score >= POSITIVE_THRESHOLD:
-            label = 'Positive'
-            description = 'general satisfaction'
-        elif avg_score <= NEGATIVE_THRESHOLD:
-            label = 'Negative'
-            description = 'general dissatisfaction'
-        else:
-            label = 'Neutral'
-            description = 'balanced sentiment'
-        
-        return {
-            'score': avg_score,
-            'label': label,
-            'description': description,
-            'message_count': len(messages),
-            'trend': self._calculate_trend(scores)
-        }
+        return summarize_conversation(avg_score, len(messages), self._calculate_trend(scores))
     
     def _calculate_trend(self, scores):
         """Calculate sentiment trend across conversation."""
@@ -123,12 +283,4 @@ class SentimentAnalyzer:
         mid = len(scores) // 2
         first_half_avg = sum(scores[:mid]) / mid
         second_half_avg = sum(scores[mid:]) / (len(scores) - mid)
-        
-        diff = second_half_avg - first_half_avg
-        
-        if diff > 0.1:
-            return 'improving'
-        elif diff < -0.1:
-            return 'declining'
-        else:
-            return 'stable'
+        return trend_from_halves(first_half_avg, second_half_avg)
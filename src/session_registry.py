@@ -0,0 +1,207 @@
+"""Registry of live conversations with idle eviction and spill-to-disk."""
+
+from collections import OrderedDict
+import os
+import threading
+import time
+from urllib.parse import quote
+from src.conversation_manager import ConversationManager
+from config import (
+    SESSION_MAX_RESIDENT,
+    SESSION_MAX_MESSAGES,
+    SESSION_IDLE_TTL,
+    SESSION_SPILL_DIR
+)
+
+
+class SessionRegistry:
+    """
+    Keeps ConversationManager instances by session ID within a budget.
+    
+    Sessions are created on demand. Budgets are checked on every access:
+    when the resident count or message budget is exceeded, or a session sits idle past the TTL, the least
+    recently used sessions are saved to the spill directory and dropped
+    from memory. The next access restores them transparently.
+    """
+    
+    def __init__(self, spill_dir=SESSION_SPILL_DIR, max_sessions=SESSION_MAX_RESIDENT,
+                 max_messages=SESSION_MAX_MESSAGES, idle_ttl=SESSION_IDLE_TTL, **manager_kwargs):
+        """
+        Initialize the registry.
+        
+        Args:
+            spill_dir (str): Directory for evicted sessions
+            max_sessions (int): Resident session limit, None for no limit
+            max_messages (int): Resident message limit, None for no limit
+            idle_ttl (float): Seconds before an idle session is evicted,
+                None to evict only under budget pressure
+            **manager_kwargs: Passed to each ConversationManager, e.g. compact
+        """
+        self.spill_dir = spill_dir
+        self.max_sessions = max_sessions
+        self.max_messages = max_messages
+        self.idle_ttl = idle_ttl
+        self.manager_kwargs = manager_kwargs
+        self._sessions = OrderedDict()  # session ID -> (manager, last access)
+        # Message count of each resident session as of its last access, and their total
+        self._sizes = {}
+        self._resident_message_count = 0
+        self._lock = threading.RLock()
+        self.created = 0
+        self.evictions = 0
+        self.restores = 0
+        self.restore_seconds = 0.0
+        self.max_restore_seconds = 0.0
+    
+    def __len__(self):
+        return len(self._sessions)
+    
+    def __contains__(self, session_id):
+        return session_id in self._sessions or os.path.exists(self._spill_path(session_id))
+    
+    def _spill_path(self, session_id):
+        """File an evicted session is spilled to."""
+        return os.path.join(self.spill_dir, quote(session_id, safe='') + '.json')
+    
+    def get(self, session_id):
+        """
+        Get a session's conversation, restoring or creating it as needed.
+        
+        Args:
+            session_id (str): Session ID
+            
+        Returns:
+            ConversationManager: The session's conversation
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                conversation = entry[0]
+                self._sessions.move_to_end(session_id)
+            else:
+                conversation = self._restore(session_id)
+                if conversation is None:
+                    conversation = ConversationManager(**self.manager_kwargs)
+                    self.created += 1
+            self._sessions[session_id] = (conversation, now)
+            self._recount(session_id, conversation)
+            self._enforce_budget(now, keep=session_id)
+            return conversation
+    
+    def add_message(self, session_id, sender, text, sentiment=None):
+        """Add a message to a session, restoring or creating it as needed."""
+        with self._lock:
+            conversation = self.get(session_id)
+            conversation.add_message(sender, text, sentiment)
+            self._recount(session_id, conversation)
+    
+    def _recount(self, session_id, conversation):
+        """
+        Bring one session's share of the resident message count up to date.
+        
+        Callers may add messages to a conversation they got from get(), so
+        each session is recounted whenever it is accessed rather than
+        summing every session on every access.
+        """
+        size = len(conversation.messages)
+        self._resident_message_count += size - self._sizes.get(session_id, 0)
+        self._sizes[session_id] = size
+    
+    def _forget(self, session_id):
+        """Drop a session that left memory from the resident message count."""
+        self._resident_message_count -= self._sizes.pop(session_id, 0)
+    
+    def _restore(self, session_id):
+        """Load a spilled session, or return None if there is none."""
+        path = self._spill_path(session_id)
+        if not os.path.exists(path):
+            return None
+        start = time.perf_counter()
+        conversation = ConversationManager.load_from_file(path, **self.manager_kwargs)
+        os.remove(path)
+        elapsed = time.perf_counter() - start
+        self.restores += 1
+        self.restore_seconds += elapsed
+        self.max_restore_seconds = max(self.max_restore_seconds, elapsed)
+        return conversation
+    
+    def _spill(self, session_id):
+        """Save a resident session to disk and drop it from memory."""
+        conversation, _ = self._sessions[session_id]
+        os.makedirs(self.spill_dir, exist_ok=True)
+        if not conversation.save_to_file(self._spill_path(session_id)):
+            # Keep the session resident rather than lose it, as old as it was,
+            # so it stays first in line for the next eviction attempt
+            self._sessions.move_to_end(session_id, last=False)
+            return False
+        del self._sessions[session_id]
+        self._forget(session_id)
+        self.evictions += 1
+        return True
+    
+    def _enforce_budget(self, now, keep=None):
+        """Evict idle sessions, then least recently used ones until within budget."""
+        self.evict_idle(now)
+        for session_id in list(self._sessions):
+            over_sessions = self.max_sessions is not None and len(self._sessions) > self.max_sessions
+            over_messages = self.max_messages is not None and self._resident_message_count > self.max_messages
+            if not (over_sessions or over_messages):
+                break
+            if session_id != keep:
+                # A session that fails to save stays resident; try the next one
+                self._spill(session_id)
+    
+    def evict_idle(self, now=None):
+        """
+        Spill every session idle for longer than the TTL.
+        
+        Returns:
+            int: Sessions evicted
+        """
+        if self.idle_ttl is None:
+            return 0
+        now = time.monotonic() if now is None else now
+        evicted = 0
+        with self._lock:
+            # Sessions are kept in access order, so stop at the first fresh one
+            for session_id, (_, last_access) in list(self._sessions.items()):
+                if now - last_access <= self.idle_ttl:
+                    break
+                evicted += self._spill(session_id)
+        return evicted
+    
+    def end_session(self, session_id):
+        """
+        Remove a session for good, including any spilled copy.
+        
+        Returns:
+            ConversationManager or None: The session's conversation
+        """
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+            if entry is not None:
+                self._forget(session_id)
+                conversation = entry[0]
+            else:
+                conversation = self._restore(session_id)
+        return conversation
+    
+    def spill_all(self):
+        """Save every resident session to disk, e.g. before shutdown."""
+        with self._lock:
+            for session_id in list(self._sessions):
+                self._spill(session_id)
+    
+    def stats(self):
+        """Get resident session, eviction and restore counters."""
+        with self._lock:
+            return {
+                'resident_sessions': len(self._sessions),
+                'resident_messages': self._resident_message_count,
+                'created': self.created,
+                'evictions': self.evictions,
+                'restores': self.restores,
+                'avg_restore_ms': self.restore_seconds / self.restores * 1000 if self.restores else 0.0,
+                'max_restore_ms': self.max_restore_seconds * 1000
+            }
@@ -0,0 +1,219 @@
+"""SQLite storage backend for conversations with indexed analytics queries."""
+
+from datetime import datetime
+import json
+import sqlite3
+from src.conversation_manager import ConversationManager
+from config import SQLITE_DB_FILE
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    start_time REAL NOT NULL,
+    saved_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    sender TEXT NOT NULL,
+    text TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    label TEXT,
+    score REAL,
+    sentiment TEXT,
+    PRIMARY KEY (session_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_messages_timestamp ON messages (timestamp);
+CREATE INDEX IF NOT EXISTS idx_messages_label_timestamp ON messages (label, timestamp);
+"""
+
+
+def _epoch(value):
+    """Convert a datetime, ISO string or epoch number to epoch seconds."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.timestamp()
+
+
+class SQLiteConversationStore:
+    """Stores conversations in SQLite and answers aggregate queries in SQL."""
+
+    def __init__(self, path=SQLITE_DB_FILE, check_same_thread=True):
+        """
+        Open (and create if needed) a conversation database.
+
+        Args:
+            path (str): Database file
+            check_same_thread (bool): Passed to sqlite3.connect
+        """
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        """Close the database."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def save_conversation(self, conversation, session_id):
+        """
+        Save a conversation, inserting only messages not stored yet.
+
+        All new messages go in one batched insert inside a transaction, so
+        saving after every turn costs only the new rows.
+
+        Args:
+            conversation (ConversationManager): Conversation to save
+            session_id (str): Session the messages belong to
+
+        Returns:
+            int: Number of messages inserted
+        """
+        with self.conn:
+            stored = self.conn.execute(
+                "SELECT COUNT(*) FROM messages WHERE session_id = ?", (session_id,)
+            ).fetchone()[0]
+            messages = conversation.get_all_messages()[stored:]
+            rows = [
+                (
+                    session_id,
+                    seq,
+                    msg['sender'],
+                    msg['text'],
+                    _epoch(msg['timestamp']),
+                    msg['sentiment']['label'] if msg['sentiment'] else None,
+                    msg['sentiment']['score'] if msg['sentiment'] else None,
+                    json.dumps(msg['sentiment']) if msg['sentiment'] else None
+                )
+                for seq, msg in enumerate(messages, stored)
+            ]
+            self.conn.executemany("INSERT INTO messages VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.conn.execute(
+                "INSERT INTO sessions VALUES (?, ?, ?) "
+                "ON CONFLICT (session_id) DO UPDATE SET start_time = excluded.start_time, saved_at = excluded.saved_at",
+                (session_id, conversation.start_time.timestamp(), datetime.now().timestamp())
+            )
+        return len(rows)
+
+    def load_conversation(self, session_id, **kwargs):
+        """
+        Rebuild a saved conversation.
+
+        Args:
+            session_id (str): Session to load
+            **kwargs: Passed to the ConversationManager constructor
+
+        Returns:
+            ConversationManager or None: The conversation, or None if unknown
+        """
+        row = self.conn.execute(
+            "SELECT start_time FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        conversation = ConversationManager(**kwargs)
+        conversation.start_time = datetime.fromtimestamp(row[0])
+        cursor = self.conn.execute(
+            "SELECT sender, text, timestamp, sentiment FROM messages WHERE session_id = ? ORDER BY seq",
+            (session_id,)
+        )
+        for sender, text, timestamp, sentiment in cursor:
+            conversation.restore_message({
+                'sender': sender,
+                'text': text,
+                'timestamp': datetime.fromtimestamp(timestamp).isoformat(),
+                'sentiment': json.loads(sentiment) if sentiment else None
+            })
+        return conversation
+
+    def _filters(self, start, end, session_id, sender):
+        """Build a WHERE clause over the indexed columns."""
+        clauses, params = ["label IS NOT NULL"], []
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(_epoch(start))
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(_epoch(end))
+        if session_id is not None:
+            clauses.append("session_id = ?")
+            params.append(session_id)
+        if sender is not None:
+            clauses.append("sender = ?")
+            params.append(sender)
+        return " AND ".join(clauses), params
+
+    def label_counts(self, start=None, end=None, session_id=None, sender='user'):
+        """
+        Count messages per sentiment label.
+
+        Args:
+            start, end (datetime or float, optional): Time window [start, end)
+            session_id (str, optional): Restrict to one session
+            sender (str, optional): Restrict to one sender, None for all
+
+        Returns:
+            dict: Label -> message count
+        """
+        where, params = self._filters(start, end, session_id, sender)
+        cursor = self.conn.execute(f"SELECT label, COUNT(*) FROM messages WHERE {where} GROUP BY label", params)
+        return dict(cursor.fetchall())
+
+    def score_distribution(self, start=None, end=None, bins=10, session_id=None, sender='user'):
+        """
+        Histogram of sentiment scores over [-1, 1].
+
+        Returns:
+            list: (bin_low, bin_high, count) for every bin, empty bins included
+        """
+        where, params = self._filters(start, end, session_id, sender)
+        width = 2.0 / bins
+        cursor = self.conn.execute(
+            f"SELECT MIN(MAX(CAST((score + 1.0) / ? AS INTEGER), 0), ?) AS bin, COUNT(*) "
+            f"FROM messages WHERE {where} GROUP BY bin",
+            [width, bins - 1] + params
+        )
+        counts = dict(cursor.fetchall())
+        return [(-1.0 + i * width, -1.0 + (i + 1) * width, counts.get(i, 0)) for i in range(bins)]
+
+    def window_stats(self, window_seconds, start=None, end=None, session_id=None, sender='user'):
+        """
+        Label counts and mean score per fixed time window.
+
+        Args:
+            window_seconds (float): Window length
+
+        Returns:
+            list: One dict per non-empty window, oldest first, with
+            'window_start', 'counts' and 'average_score'
+        """
+        where, params = self._filters(start, end, session_id, sender)
+        cursor = self.conn.execute(
+            f"SELECT CAST(timestamp / ? AS INTEGER) AS window, label, COUNT(*), SUM(score) "
+            f"FROM messages WHERE {where} GROUP BY window, label ORDER BY window",
+            [window_seconds] + params
+        )
+        windows = {}
+        for window, label, count, score_sum in cursor:
+            stats = windows.setdefault(window, {'counts': {}, 'score_sum': 0.0, 'total': 0})
+            stats['counts'][label] = count
+            stats['score_sum'] += score_sum
+            stats['total'] += count
+        return [
+            {
+                'window_start': datetime.fromtimestamp(window * window_seconds),
+                'counts': stats['counts'],
+                'average_score': stats['score_sum'] / stats['total']
+            }
+            for window, stats in windows.items()
+        ]
@@ -0,0 +1,59 @@
+"""Executors for offloading CPU-bound sentiment scoring.
+
+The module-level analyze_* functions are picklable, so they run the same
+way on a thread pool or a process pool. Each worker keeps one analyzer
+per method and scorer settings.
+"""
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from src.sentiment_analyzer import SentimentAnalyzer
+from src.cache import get_shared_cache
+from config import TEXTBLOB_FAST_SCORER, NEUTRAL_PREFILTER_ENABLED
+
+_worker_analyzers = {}
+
+
+def create_executor(kind='thread', workers=None):
+    """
+    Create an executor for sentiment scoring.
+    
+    Args:
+        kind (str): 'thread' or 'process'
+        workers (int, optional): Pool size, defaults to the executor's own
+        
+    Returns:
+        Executor: The new pool
+    """
+    if kind == 'thread':
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix='sentiment')
+    if kind == 'process':
+        return ProcessPoolExecutor(max_workers=workers)
+    raise ValueError(f"Unknown executor kind: {kind}")
+
+
+def _get_analyzer(method, fast_textblob=TEXTBLOB_FAST_SCORER, neutral_prefilter=NEUTRAL_PREFILTER_ENABLED):
+    """Get this worker's analyzer for a method and scorer settings."""
+    key = (method, fast_textblob, neutral_prefilter)
+    analyzer = _worker_analyzers.get(key)
+    if analyzer is None:
+        # Workers are already the parallel layer; never fan out again
+        analyzer = SentimentAnalyzer(method=method, cache=get_shared_cache(), fast_textblob=fast_textblob,
+                                     neutral_prefilter=neutral_prefilter, long_text=False)
+        _worker_analyzers[key] = analyzer
+    return analyzer
+
+
+def analyze_message(text, method='vader'):
+    """Analyze one message in a worker."""
+    return _get_analyzer(method).analyze_message(text)
+
+
+def analyze_batch(texts, method='vader', fast_textblob=TEXTBLOB_FAST_SCORER,
+                  neutral_prefilter=NEUTRAL_PREFILTER_ENABLED):
+    """Analyze a batch of messages in a worker, with the given scorer settings."""
+    return _get_analyzer(method, fast_textblob, neutral_prefilter).analyze_batch(texts)
+
+
+def analyze_conversation(messages, method='vader'):
+    """Analyze overall conversation sentiment in a worker."""
+    return _get_analyzer(method).analyze_conversation(messages)
@@ -0,0 +1,69 @@
+"""Train the intent model from intents.json and saved conversations.
+
+Builds a hashed-feature Naive Bayes model (see src.intent_training) and
+writes it in the mapped format the chatbot loads from INTENT_MODEL_FILE.
+With --update, the existing model's counts are extended with only the new
+examples instead of retraining from scratch. User messages from --history
+files are labeled by their similarity to the intents.json patterns, and
+used only when it is at least INTENT_HISTORY_THRESHOLD.
+
+Usage:
+    python train_model.py
+    python train_model.py --history data/conversation_history.json
+    python train_model.py --update --labeled new_examples.jsonl
+"""
+
+import argparse
+import time
+from src.intent_index import IntentIndex
+from src.intent_training import (
+    IntentTrainer, intent_examples, history_examples, labeled_examples, evaluate
+)
+from config import INTENTS_FILE, INTENT_MODEL_FILE, INTENT_HASH_FEATURES, INTENT_HISTORY_THRESHOLD
+
+
+def main():
+    """Run the training CLI."""
+    parser = argparse.ArgumentParser(description="Train the intent model.")
+    parser.add_argument('--intents', default=INTENTS_FILE, help='intents file with tagged patterns')
+    parser.add_argument('--history', nargs='*', default=[],
+                        help='saved conversations to take user messages from')
+    parser.add_argument('--history-threshold', type=float, default=INTENT_HISTORY_THRESHOLD,
+                        help='lowest pattern similarity for labeling a history message')
+    parser.add_argument('--labeled', nargs='*', default=[],
+                        help='JSONL files of {"text": ..., "intent": ...} records')
+    parser.add_argument('--output', default=INTENT_MODEL_FILE)
+    parser.add_argument('--features', type=int, default=INTENT_HASH_FEATURES, help='hash buckets per intent')
+    parser.add_argument('--update', action='store_true',
+                        help='add the history and labeled examples to the existing model')
+    args = parser.parse_args()
+
+    patterns = intent_examples(args.intents)
+    if args.update:
+        trainer = IntentTrainer.load(args.output)
+        examples = []
+    else:
+        trainer = IntentTrainer(n_features=args.features)
+        examples = list(patterns)
+    tags = {tag for _, tag in patterns} | set(trainer.classes)
+    index = IntentIndex.from_file(args.intents) if args.history else None
+    for path in args.history:
+        examples.extend(history_examples(path, tags, index, args.history_threshold))
+    for path in args.labeled:
+        examples.extend(labeled_examples(path))
+
+    start = time.perf_counter()
+    added = trainer.partial_fit(examples)
+    size = trainer.save(args.output)
+    elapsed = time.perf_counter() - start
+
+    stats = evaluate(args.output, patterns + examples if args.update else examples)
+    print(f"{'Updated' if args.update else 'Trained'} on {added} examples "
+          f"({trainer.examples} total, {len(trainer.classes)} intents) in {elapsed * 1000:.1f} ms")
+    print(f"Wrote {args.output} ({size} bytes, {trainer.n_features} features)")
+    print(f"Prediction: {stats['latency_us']:.1f} us/message, load {stats['load_ms']:.2f} ms, "
+          f"training accuracy {stats['accuracy']:.1%}")
+
+
+if __name__ == "__main__":
+    main()